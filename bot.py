@@ -13,6 +13,8 @@ import config
 from handlers.user import start, catalog, order
 from handlers.admin import panel, products, categories, broadcast
 from middlewares.admin_check import AdminCheckMiddleware
+from database import create_backend
+from database.async_db import AsyncDatabase
 from utils.schedular import setup_scheduler
 
 # Logging sozlamalari
@@ -45,10 +47,13 @@ async def on_startup(bot: Bot):
     logger.info("Bot muvaffaqiyatli ishga tushdi!")
 
 
-async def on_shutdown(bot: Bot):
+async def on_shutdown(bot: Bot, db: AsyncDatabase):
     """Bot to'xtaganda"""
     logger.info("Bot to'xtatilmoqda...")
 
+    # Write-behind navbatidagi o'zgarishlarni diskka tushirish
+    await db.flush()
+
     # Adminga xabar
     for admin_id in config.ADMINS:
         try:
@@ -71,6 +76,10 @@ async def main():
     )
     dp = Dispatcher()
 
+    # Baza backendi (config.DB_BACKEND) - handlerlarga `db` argumenti sifatida uzatiladi
+    db = AsyncDatabase(create_backend(config.DB_BACKEND))
+    dp["db"] = db
+
     # Middlewares qo'shish
     dp.message.middleware(AdminCheckMiddleware())
     dp.callback_query.middleware(AdminCheckMiddleware())
@@ -92,7 +101,7 @@ async def main():
     dp.shutdown.register(on_shutdown)
 
     # Scheduler ishga tushirish
-    scheduler = setup_scheduler(bot)
+    scheduler = setup_scheduler(bot, db)
     scheduler.start()
     logger.info("Scheduler ishga tushdi")
 
@@ -102,6 +111,7 @@ async def main():
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
         scheduler.shutdown()
+        await db.close()
         await bot.session.close()
 
 
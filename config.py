@@ -23,9 +23,83 @@ GROUP_ID = -5045327244    # Guruh ID
 # JSON fayllar yo'llari
 DATA_DIR = "data"
 PRODUCTS_FILE = f"{DATA_DIR}/products.json"
+# Eski yagona buyurtmalar fayli - birinchi ishga tushishda segmentlarga bo'linadi
 ORDERS_FILE = f"{DATA_DIR}/orders.json"
+# Buyurtmalar oylik segmentlarda (data/orders/YYYY-MM.json) va manifestda
+ORDERS_DIR = f"{DATA_DIR}/orders"
+ORDERS_MANIFEST_FILE = f"{ORDERS_DIR}/manifest.json"
 USERS_FILE = f"{DATA_DIR}/users.json"
 CATEGORIES_FILE = f"{DATA_DIR}/categories.json"
+# Metama'lumotlar: har bir kolleksiya uchun oxirgi berilgan ID (sequence)
+META_FILE = f"{DATA_DIR}/meta.json"
+# Bir nechta faylni atomik yozish uchun intent-log (odatda mavjud bo'lmaydi)
+TXN_FILE = f"{DATA_DIR}/txn.json"
+
+# Data fayllarining diskdagi formati: "pretty" (chiroyli JSON, qo'lda o'qish
+# oson), "compact" (bo'sh joysiz JSON, ~2x kichik) yoki "msgpack" (binar,
+# msgpack o'rnatilgan bo'lsa). O'qishda format avtomatik aniqlanadi.
+# Mavjud fayllarni o'girish: python -m database.convert compact
+DATA_FORMAT = "pretty"
+# orjson o'rnatilgan bo'lsa JSON'ni u orqali yozish/o'qish (tezroq)
+USE_ORJSON = True
+
+# Baza turi: "json" (data/*.json fayllar), "sqlite" (bitta SQLite fayli)
+# yoki "memory" (faqat xotirada, yuklama testlari uchun).
+# JSON'dan o'tish uchun: python -m database.import_json
+DB_BACKEND = "json"
+SQLITE_FILE = f"{DATA_DIR}/shop.db"
+
+# Buyurtmalar jurnali: har bir yangi buyurtma va status o'zgarishi segment
+# faylini qayta yozmasdan jurnalga bitta qator bo'lib qo'shiladi
+ORDERS_JOURNAL_ENABLED = True
+ORDERS_JOURNAL_FILE = f"{DATA_DIR}/orders.journal"
+# Jurnalni segmentlarga yig'ish (compaction) oralig'i, daqiqalarda
+ORDERS_JOURNAL_COMPACT_INTERVAL = 10
+# Doim xotirada turadigan oxirgi oylar soni; eskiroq segmentlar faqat
+# kerak bo'lganda (masalan, eski mijozning buyurtmalar tarixi) yuklanadi
+ORDERS_HOT_MONTHS = 2
+
+# Arxiv: yopilgan (ORDERS_ARCHIVE_STATUSES) va ORDERS_ARCHIVE_AFTER_DAYS
+# kundan eski buyurtmalar har kuni ORDERS_ARCHIVE_TIME da siqilgan arxiv
+# segmentlariga (data/orders/archive/YYYY-MM.json.gz) ko'chiriladi. Ular
+# faqat kerak bo'lganda (buyurtmalar tarixi, ID bo'yicha qidirish) o'qiladi
+ORDERS_ARCHIVE_ENABLED = True
+ORDERS_ARCHIVE_DIR = f"{ORDERS_DIR}/archive"
+ORDERS_ARCHIVE_STATUSES = ("yetkazildi", "bekor")
+ORDERS_ARCHIVE_AFTER_DAYS = 30
+ORDERS_ARCHIVE_TIME = "04:00"
+
+# Group commit: bitta event-loop tsiklida bo'lgan yozuvlar birgalikda,
+# bitta fsync bilan diskka tushiriladi
+GROUP_COMMIT = True
+
+# Write-behind: o'zgargan kolleksiyalar (users, products, ...) darhol emas,
+# oxirgi o'zgarishdan WRITE_BEHIND_INTERVAL_MS o'tgach yoziladi, lekin
+# birinchi o'zgarishdan WRITE_BEHIND_MAX_DIRTY_MS dan kechiktirilmaydi.
+# Buyurtmalar jurnali bu kutishga tushmaydi. Bot to'xtaganda hammasi yoziladi
+WRITE_BEHIND_ENABLED = True
+WRITE_BEHIND_INTERVAL_MS = 500
+WRITE_BEHIND_MAX_DIRTY_MS = 5000
+
+# Foydalanuvchining last_seen maydoni har /start da xotirada yangilanadi,
+# lekin diskka shu oraliqda (soniya) bir martadan ko'p yozilmaydi
+LAST_SEEN_FLUSH_INTERVAL = 300
+
+# Baza chaqiruvlari bajariladigan oqimlar soni (event loop bloklanmasligi uchun)
+DB_EXECUTOR_WORKERS = 4
+
+# Kesh sozlamalari: fayl o'zgargan-o'zgarmaganini (mtime/size) tekshirish
+# oralig'i, soniyalarda. Shu vaqt ichida o'qishlar faqat xotiradan bo'ladi
+CACHE_CHECK_INTERVAL = 1.0
+
+# Bir nechta jarayon bitta data papkasi bilan ishlasa (masalan, ikkita bot
+# nusxasi yoki bot va admin skripti) - True. Har bir o'zgartirish fcntl
+# qulfi ostida bajariladi va darhol diskka yoziladi (group commit va
+# write-behind o'chadi). Keshni tekshirish har safar qulf faylidagi
+# generation hisoblagichi bilan bo'ladi: fayllar faqat boshqa jarayon
+# haqiqatan yozganda qayta o'qiladi. Windows'da ishlamaydi (fcntl yo'q)
+DATA_LOCK_ENABLED = False
+DATA_LOCK_FILE = f"{DATA_DIR}/.lock"
 
 # Avtomatik post vaqtlari (24-soatlik format)
 AUTO_POST_TIMES = [
@@ -37,6 +111,11 @@ AUTO_POST_TIMES = [
 # Kuniga post qilinadigan tovarlar soni
 DAILY_POSTS_COUNT = 3
 
+# Koloda rejimi: True bo'lsa tovarlar takrorlanmasdan navbat bilan post
+# qilinadi - butun katalog bir marta chiqmaguncha hech bir tovar qaytarilmaydi.
+# Navbat holati meta.json da saqlanadi va qayta ishga tushganda davom etadi
+AUTO_POST_DECK_MODE = False
+
 # FAQ javoblari
 FAQ_ANSWERS = {
     "yetkazish": """🚚 Siz ikki usulni tanlashingiz mumkin:
@@ -0,0 +1,15 @@
+"""
+Ma'lumotlar bazasi paketi
+
+Backendlar shu yerda import qilinadi va ro'yxatdan o'tadi. Ishlatiladigan
+backend ishga tushishda config.DB_BACKEND bo'yicha tanlanadi:
+
+    backend = create_backend(config.DB_BACKEND)
+"""
+
+from database.base import StorageBackend, available_backends, create_backend, register_backend
+from database.events import Event, EventBus
+from database.json_db import JSONDatabase
+from database.models import Order, Product, User
+from database.memory_db import MemoryDatabase
+from database.sqlite_db import SQLiteDatabase
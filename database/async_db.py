@@ -0,0 +1,152 @@
+"""
+Ma'lumotlar bazasi uchun asinxron qobiq
+
+Handlerlar bazaga shu qobiq orqali murojaat qiladi (u bot.py da yaratilib,
+handlerlarga aiogram orqali `db` argumenti sifatida uzatiladi): har bir chaqiruv
+alohida executor oqimida bajariladi, shuning uchun fayl o'qish/parse
+qilish va diskka yozish event loopni (va boshqa foydalanuvchilarni)
+to'xtatib qo'ymaydi.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from typing import Any, Dict, Optional, Tuple
+import config
+import logging
+
+from database.base import StorageBackend
+from database.events import EventBus
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabase:
+    """
+    Sinxron bazani asinxron qiluvchi qobiq
+
+    Bazaning har bir ochiq metodi shu yerda `await` qilinadigan metod
+    sifatida mavjud: `await db.get_product(5)`.
+
+    Bir kolleksiyaga yozuvchi metodlar asyncio qulfi bilan navbatga
+    qo'yiladi (bir vaqtda bitta), o'quvchi metodlar esa qulfsiz ishlaydi.
+    """
+
+    # Metod -> u yozadigan kolleksiyalar
+    WRITES: Dict[str, Tuple[str, ...]] = {
+        'add_category': ('categories',),
+        'delete_category': ('categories', 'products'),
+        'update_category': ('categories', 'products'),
+        'add_product': ('products',),
+        'update_product': ('products',),
+        'delete_product': ('products',),
+        'toggle_product_availability': ('products',),
+        'add_products_bulk': ('products',),
+        'update_products_bulk': ('products',),
+        'delete_products_bulk': ('products',),
+        # Koloda rejimida navbat holati yoziladi
+        'get_random_products': ('products',),
+        'create_order': ('orders',),
+        'update_order_status': ('orders',),
+        'update_orders_status_bulk': ('orders',),
+        'compact_orders': ('orders',),
+        'archive_orders': ('orders',),
+        'add_user': ('users',),
+    }
+
+    def __init__(self, backend: StorageBackend, workers: int = None):
+        """
+        Args:
+            backend: Sinxron baza (masalan, JSONDatabase)
+            workers: Baza chaqiruvlari uchun oqimlar soni
+        """
+        self.backend = backend
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or config.DB_EXECUTOR_WORKERS,
+            thread_name_prefix="db"
+        )
+        # Diskka yozish (flush) uchun alohida, bitta oqimli executor -
+        # yozuvlar navbat bilan va tartibi buzilmasdan bajariladi
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._bound = False
+
+    def _bind(self):
+        """
+        Bazani joriy event loopga ulash (birinchi chaqiruvda)
+        """
+        if not self._bound:
+            loop = asyncio.get_running_loop()
+            if hasattr(self.backend, 'bind_loop'):
+                self.backend.bind_loop(loop, self._writer)
+            if self.events is not None:
+                self.events.bind_loop(loop)
+        self._bound = True
+
+    @property
+    def events(self) -> Optional[EventBus]:
+        """
+        Bazaning event busi (obuna bo'lish uchun: db.events.subscribe(...))
+        """
+        return getattr(self.backend, 'events', None)
+
+    async def _call(self, name: str, *args, **kwargs) -> Any:
+        """
+        Baza metodini executorda bajarish
+
+        Args:
+            name: Metod nomi
+            *args, **kwargs: Metod argumentlari
+
+        Returns:
+            Any: Metod natijasi
+        """
+        self._bind()
+        loop = asyncio.get_running_loop()
+        call = functools.partial(getattr(self.backend, name), *args, **kwargs)
+
+        collections = self.WRITES.get(name)
+        if not collections:
+            return await loop.run_in_executor(self._executor, call)
+
+        # Deadlock bo'lmasligi uchun qulflar doim bir xil tartibda olinadi
+        async with AsyncExitStack() as stack:
+            for collection in sorted(collections):
+                lock = self._locks.setdefault(collection, asyncio.Lock())
+                await stack.enter_async_context(lock)
+            return await loop.run_in_executor(self._executor, call)
+
+    def __getattr__(self, name: str):
+        """
+        Bazaning ochiq metodlarini asinxron metod sifatida qaytarish
+        """
+        if name.startswith('_') or not callable(getattr(self.backend, name, None)):
+            raise AttributeError(name)
+
+        async def method(*args, **kwargs):
+            return await self._call(name, *args, **kwargs)
+
+        method.__name__ = name
+        # Keyingi murojaatlar __getattr__ ga tushmasligi uchun saqlab qo'yamiz
+        setattr(self, name, method)
+        return method
+
+    async def flush(self):
+        """
+        Navbatdagi (dirty) yozuvlarni darhol diskka tushirish
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self.backend.flush)
+
+    async def close(self):
+        """
+        Navbatdagi yozuvlarni diskka tushirish va executorlarni to'xtatish
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self.backend.flush)
+        if self._bound and hasattr(self.backend, 'bind_loop'):
+            self.backend.bind_loop(None, None)
+        self._executor.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        logger.info("✅ Baza yopildi")
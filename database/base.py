@@ -0,0 +1,206 @@
+"""
+Baza backendlari uchun umumiy protokol va registr
+
+Har bir backend (json, sqlite, memory, ...) StorageBackend protokolini
+amalga oshiradi va @register_backend("nom") bilan ro'yxatdan o'tadi.
+Ishga tushishda backend config.DB_BACKEND bo'yicha tanlanadi.
+"""
+
+import functools
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple, runtime_checkable
+import logging
+
+from database.events import EventBus
+
+logger = logging.getLogger(__name__)
+
+
+# Yangi bazada yaratiladigan kategoriyalar (barcha backendlar uchun umumiy)
+DEFAULT_CATEGORIES = [
+    "👕 Kiyimlar",
+    "👟 Poyabzal",
+    "🎒 Sumkalar",
+    "⌚ Aksessuarlar",
+    "📱 Elektronika",
+    "🏠 Uy-ro'zg'or"
+]
+
+
+def synchronized(method):
+    """
+    Metodni backendning ichki qulfi (self._lock) ostida bajarish
+
+    Metodlar executor oqimlaridan parallel chaqirilishi mumkin, shuning
+    uchun kesh, indekslar va ulanishga kirish shu qulf bilan himoyalanadi.
+    JSONDatabase da faqat o'qiydigan metodlar uchun - diskka yozishi mumkin
+    bo'lgan metodlar @exclusive bilan belgilanadi.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """
+    Sinxron baza backendi protokoli
+
+    Barcha metodlar executor oqimlaridan parallel chaqirilishi mumkin,
+    shuning uchun backend o'zi thread-safe bo'lishi kerak.
+    """
+
+    # O'zgarishlar haqida xabar beruvchi event bus (database.events)
+    events: EventBus
+
+    def flush(self) -> None:
+        """Navbatdagi o'zgarishlarni darhol saqlash"""
+
+    # ==================== CATEGORIES ====================
+
+    def get_categories(self) -> List[str]: ...
+
+    def add_category(self, category: str) -> bool: ...
+
+    def delete_category(self, category: str) -> bool: ...
+
+    def update_category(self, old_name: str, new_name: str) -> bool: ...
+
+    # ==================== PRODUCTS ====================
+
+    def add_product(self, category: str, name: str, description: str,
+                    price: float, size: str = None, photo_id: str = None) -> Dict: ...
+
+    def get_product(self, product_id: int) -> Optional[Dict]: ...
+
+    def get_products(self, product_ids: List[int]) -> Dict[int, Dict]: ...
+
+    def get_products_by_category(self, category: str) -> List[Dict]: ...
+
+    def get_all_products(self) -> List[Dict]: ...
+
+    def get_available_products(self) -> List[Dict]: ...
+
+    def get_products_page(self, offset: int = 0, limit: int = 10) -> Tuple[List[Dict], int]: ...
+
+    def get_random_products(self, count: int = 3) -> List[Dict]: ...
+
+    def update_product(self, product_id: int, **kwargs) -> bool: ...
+
+    def delete_product(self, product_id: int) -> bool: ...
+
+    def toggle_product_availability(self, product_id: int) -> bool: ...
+
+    def add_products_bulk(self, items: List[Dict]) -> List[Dict]: ...
+
+    def update_products_bulk(self, product_ids: List[int], **kwargs) -> int: ...
+
+    def delete_products_bulk(self, product_ids: List[int]) -> int: ...
+
+    # ==================== ORDERS ====================
+
+    def create_order(self, user_id: int, username: str, product_id: int,
+                     customer_name: str, phone: str, address: str,
+                     quantity: int = 1) -> Dict: ...
+
+    def get_order(self, order_id: int) -> Optional[Dict]: ...
+
+    def get_orders(self, order_ids: List[int]) -> Dict[int, Dict]: ...
+
+    def get_user_orders(self, user_id: int) -> List[Dict]: ...
+
+    def get_all_orders(self, include_archived: bool = True) -> List[Dict]: ...
+
+    def get_orders_by_status(self, status: str) -> List[Dict]: ...
+
+    def count_orders_by_status(self, status: str) -> int: ...
+
+    def get_orders_count(self) -> int: ...
+
+    def get_orders_page(self, offset: int = 0, limit: int = 20,
+                        status: str = None) -> Tuple[List[Dict], int]: ...
+
+    def count_archived_orders(self, status: str = None) -> int: ...
+
+    def get_archived_orders_page(self, offset: int = 0, limit: int = 20,
+                                 status: str = None) -> Tuple[List[Dict], int]: ...
+
+    def get_order_analytics(self, days: int = 7) -> Dict[str, Any]: ...
+
+    def get_statistics(self) -> Dict[str, Any]: ...
+
+    def update_order_status(self, order_id: int, status: str) -> bool: ...
+
+    def update_orders_status_bulk(self, order_ids: List[int], status: str) -> int: ...
+
+    def compact_orders(self) -> bool: ...
+
+    def archive_orders(self, older_than_days: int = None) -> int: ...
+
+    # ==================== USERS ====================
+
+    def add_user(self, user_id: int, username: str = None,
+                 first_name: str = None, last_name: str = None) -> Dict: ...
+
+    def get_all_users(self) -> List[Dict]: ...
+
+    def get_users_count(self) -> int: ...
+
+
+# Backend nomi -> backend klassi (yoki fabrika funksiyasi)
+_BACKENDS: Dict[str, Callable[..., StorageBackend]] = {}
+
+
+def register_backend(name: str):
+    """
+    Backendni nom bilan ro'yxatdan o'tkazish (dekorator)
+
+    Args:
+        name: config.DB_BACKEND da ishlatiladigan nom
+
+    Returns:
+        Callable: Klassni o'zgartirmasdan qaytaruvchi dekorator
+    """
+    def decorator(factory):
+        if name in _BACKENDS and _BACKENDS[name] is not factory:
+            logger.warning(f"⚠️ Backend qayta ro'yxatdan o'tkazildi: {name}")
+        _BACKENDS[name] = factory
+        return factory
+    return decorator
+
+
+def available_backends() -> List[str]:
+    """
+    Ro'yxatdan o'tgan backend nomlari
+
+    Returns:
+        List[str]: Backend nomlari
+    """
+    return sorted(_BACKENDS)
+
+
+def create_backend(name: str, **kwargs) -> StorageBackend:
+    """
+    Backendni nomi bo'yicha yaratish
+
+    Args:
+        name: Backend nomi (masalan, "json", "sqlite", "memory")
+        **kwargs: Backend konstruktoriga uzatiladigan argumentlar
+
+    Returns:
+        StorageBackend: Yaratilgan backend
+
+    Raises:
+        ValueError: Bunday nomli backend ro'yxatda bo'lmasa
+    """
+    try:
+        factory = _BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Noma'lum DB_BACKEND: {name} (mavjudlari: {', '.join(available_backends())})"
+        ) from None
+
+    backend = factory(**kwargs)
+    logger.info(f"✅ Baza backendi tanlandi: {name}")
+    return backend
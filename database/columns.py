@@ -0,0 +1,242 @@
+"""
+Buyurtmalarning ustunli (columnar) nusxasi - statistika uchun
+
+Har bir maydon alohida array'da saqlanadi (id, user_id, product_id,
+quantity, status kodi, yaratilgan vaqt) va bitta buyurtma xotirada ~40
+bayt joy oladi. Ustunlar bilan birga statuslar, kunlar va tovarlar
+bo'yicha yig'indilar ham yuritiladi: create_order va update_order_status
+ularni o'zgartirib boradi, hisobotlar esa buyurtmalarni aylanib chiqmasdan
+shu yig'indilardan olinadi (kunlar soni va tovarlar soniga proporsional).
+
+Yuklanmagan segmentlar va arxiv fayllari o'qilmaydi - ularning yig'indilari
+manifestdan qo'shiladi (merge), buyurtmalari esa ustunlarga tushmaydi.
+"""
+
+import calendar
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Ma'lum statuslar (kodlari doimiy); yangilari avtomatik qo'shiladi
+STATUSES = ('yangi', 'tasdiqlandi', 'yetkazilmoqda', 'yetkazildi', 'bekor')
+
+DAY = 86400
+
+
+def created_epoch(created_at: Any) -> int:
+    """
+    'YYYY-MM-DD HH:MM:SS' ni soniyalarga aylantirish
+
+    Vaqt mahalliy (naive) bo'lgani uchun UTC deb hisoblanadi - kun
+    chegaralari shunda created_at dagi sana bilan bir xil bo'ladi.
+
+    Args:
+        created_at: Buyurtma yaratilgan vaqt
+
+    Returns:
+        int: Soniyalar (noto'g'ri qiymat uchun 0)
+    """
+    try:
+        s = created_at
+        return calendar.timegm((int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                                int(s[11:13] or 0), int(s[14:16] or 0), int(s[17:19] or 0)))
+    except (TypeError, ValueError):
+        return 0
+
+
+class OrderColumns:
+    """
+    Buyurtmalar ustunlari va yig'indilari
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.user_ids = array('q')
+        self.product_ids = array('q')
+        self.quantities = array('q')
+        self.statuses = array('B')
+        self.created = array('q')
+        # Buyurtma ID -> qator raqami
+        self._rows: Dict[int, int] = {}
+        self._status_names: List[str] = list(STATUSES)
+        self._status_codes: Dict[str, int] = {name: code for code, name in enumerate(STATUSES)}
+        # Yig'indilar: status kodi -> soni, kun (epoch // DAY) -> [soni, donalar],
+        # (tovar ID, status kodi) -> donalar
+        self._status_totals: Dict[int, int] = {}
+        self._day_totals: Dict[int, List[int]] = {}
+        self._product_totals: Dict[Tuple[int, int], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _code(self, status: str) -> int:
+        """Status kodi (yangi status bo'lsa ro'yxatga qo'shiladi)"""
+        code = self._status_codes.get(status)
+        if code is None:
+            code = len(self._status_names)
+            self._status_names.append(status)
+            self._status_codes[status] = code
+        return code
+
+    def _count(self, product_id: int, quantity: int, code: int, created: int, sign: int = 1):
+        """
+        Bitta buyurtmani yig'indilarga qo'shish (sign=-1 bo'lsa ayirish)
+
+        Args:
+            product_id: Tovar ID
+            quantity: Donalar
+            code: Status kodi
+            created: Yaratilgan vaqt (soniyalar)
+            sign: 1 yoki -1
+        """
+        self._status_totals[code] = self._status_totals.get(code, 0) + sign
+        day = self._day_totals.setdefault(created // DAY, [0, 0])
+        day[0] += sign
+        day[1] += sign * quantity
+        key = (product_id, code)
+        self._product_totals[key] = self._product_totals.get(key, 0) + sign * quantity
+
+    def append(self, order: Any):
+        """
+        Buyurtmani qo'shish (mavjud bo'lsa, qatori yangilanadi)
+
+        Args:
+            order: Buyurtma (yozuv yoki dict)
+        """
+        order_id = order.get('id') or 0
+        values = (
+            order.get('user_id') or 0,
+            order.get('product_id') or 0,
+            order.get('quantity') or 0,
+            self._code(order.get('status') or 'yangi'),
+            created_epoch(order.get('created_at')),
+        )
+
+        row = self._rows.get(order_id)
+        if row is None:
+            self._rows[order_id] = len(self.ids)
+            self.ids.append(order_id)
+            self.user_ids.append(values[0])
+            self.product_ids.append(values[1])
+            self.quantities.append(values[2])
+            self.statuses.append(values[3])
+            self.created.append(values[4])
+        else:
+            self._count(self.product_ids[row], self.quantities[row], self.statuses[row],
+                        self.created[row], sign=-1)
+            (self.user_ids[row], self.product_ids[row], self.quantities[row],
+             self.statuses[row], self.created[row]) = values
+        self._count(*values[1:])
+
+    def extend(self, orders: Iterable[Any]):
+        """
+        Bir nechta buyurtmani qo'shish
+
+        Args:
+            orders: Buyurtmalar
+        """
+        for order in orders:
+            self.append(order)
+
+    def merge(self, info: Dict) -> bool:
+        """
+        Segment yig'indilarini manifestdan qo'shish (buyurtmalar ustunlarga tushmaydi)
+
+        Args:
+            info: Segmentning manifestdagi ma'lumoti (OrderManifest.update)
+
+        Returns:
+            bool: Yig'indilar bo'lsa True (eski manifestda bo'lmasa False -
+            unda segmentni o'qib extend qilish kerak)
+        """
+        if 'days' not in info or 'products' not in info:
+            return False
+
+        for status, count in info.get('statuses', {}).items():
+            code = self._code(status)
+            self._status_totals[code] = self._status_totals.get(code, 0) + count
+        for day, (count, quantity) in info['days'].items():
+            totals = self._day_totals.setdefault(created_epoch(day) // DAY, [0, 0])
+            totals[0] += count
+            totals[1] += quantity
+        for product_id, by_status in info['products'].items():
+            for status, quantity in by_status.items():
+                key = (int(product_id), self._code(status))
+                self._product_totals[key] = self._product_totals.get(key, 0) + quantity
+        return True
+
+    def set_status(self, order: Any, old_status: str) -> bool:
+        """
+        Buyurtma statusini yangilash
+
+        Buyurtma ustunlarda bo'lmasa ham (manifestdan qo'shilgan segmentda)
+        yig'indilar uning maydonlari va eski statusi bo'yicha to'g'rilanadi.
+
+        Args:
+            order: Buyurtma (yangi statusi bilan)
+            old_status: Oldingi status
+
+        Returns:
+            bool: Buyurtma ustunlarda bo'lsa True
+        """
+        code = self._code(order.get('status') or 'yangi')
+        row = self._rows.get(order.get('id') or 0)
+        if row is None:
+            values = (order.get('product_id') or 0, order.get('quantity') or 0,
+                      self._code(old_status or 'yangi'), created_epoch(order.get('created_at')))
+        else:
+            values = (self.product_ids[row], self.quantities[row], self.statuses[row], self.created[row])
+            self.statuses[row] = code
+
+        self._count(*values, sign=-1)
+        self._count(values[0], values[1], code, values[3])
+        return row is not None
+
+    def status_counts(self) -> Dict[str, int]:
+        """
+        Statuslar bo'yicha buyurtmalar soni
+
+        Returns:
+            Dict[str, int]: Status -> soni (ma'lum statuslar doim bor)
+        """
+        counts = {name: self._status_totals.get(code, 0) for code, name in enumerate(self._status_names)}
+        return {name: count for name, count in counts.items() if count or name in STATUSES}
+
+    def daily_totals(self, days: int, today: datetime = None) -> Dict[str, Dict[str, int]]:
+        """
+        Oxirgi kunlar bo'yicha buyurtmalar va tovar donalari soni
+
+        Args:
+            days: Kunlar soni (bugun ham kiradi)
+            today: Joriy sana (test uchun)
+
+        Returns:
+            Dict[str, Dict[str, int]]: 'YYYY-MM-DD' -> {'orders': ..., 'quantity': ...}
+        """
+        today = today or datetime.now()
+        days = max(days, 1)
+        first = today.date() - timedelta(days=days - 1)
+        first_day = calendar.timegm(first.timetuple()) // DAY
+
+        totals = {}
+        for i in range(days):
+            orders, quantity = self._day_totals.get(first_day + i, (0, 0))
+            totals[(first + timedelta(days=i)).strftime('%Y-%m-%d')] = {'orders': orders, 'quantity': quantity}
+        return totals
+
+    def product_quantities(self, exclude: Iterable[str] = ()) -> Dict[int, int]:
+        """
+        Har bir tovar bo'yicha buyurtma qilingan donalar
+
+        Args:
+            exclude: Hisobga olinmaydigan statuslar (masalan, 'bekor')
+
+        Returns:
+            Dict[int, int]: Tovar ID -> donalar soni
+        """
+        skip = {self._status_codes[name] for name in exclude if name in self._status_codes}
+        totals: Dict[int, int] = {}
+        for (product_id, code), quantity in self._product_totals.items():
+            if code not in skip and quantity:
+                totals[product_id] = totals.get(product_id, 0) + quantity
+        return totals
@@ -0,0 +1,60 @@
+"""
+Data fayllarini boshqa formatga o'girish
+
+Ishlatish (bot to'xtatilgan holda):
+    python -m database.convert compact
+    python -m database.convert msgpack
+    python -m database.convert pretty
+
+So'ng config.py da DATA_FORMAT ham shu qiymatga o'rnatiladi. O'qish
+formatni avtomatik aniqlagani uchun bu majburiy emas, lekin aks holda
+keyingi yozuvlar yana eski formatda bo'ladi.
+"""
+
+import argparse
+import os
+import config
+import logging
+
+from database import formats
+from database.json_db import JSONDatabase
+from database.segments import archive_path, segment_path
+
+
+def main():
+    """
+    Buyruq qatori argumentlarini o'qib, fayllarni o'girish
+    """
+    parser = argparse.ArgumentParser(description="Data fayllarini boshqa formatga o'girish")
+    parser.add_argument("format", choices=formats.FORMATS,
+                        help="Yangi format")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    config.DATA_FORMAT = args.format
+    target = formats.resolve_format()
+
+    database = JSONDatabase()
+    # Jurnaldagi buyurtmalarni avval segmentlarga yig'ish
+    database.compact_orders()
+
+    # Manifestni yuklash (segmentlar ro'yxati uchun)
+    database.get_orders_count()
+    segment_files = [segment_path(month) for month in database._manifest.months()]
+    # Arxiv segmentlari ichidagi format ham o'giriladi (gzip siqish saqlanadi)
+    segment_files += [archive_path(month) for month in database._archive_manifest.months()]
+
+    for filepath in (config.PRODUCTS_FILE, config.USERS_FILE, config.CATEGORIES_FILE,
+                     config.META_FILE, config.ORDERS_MANIFEST_FILE, *segment_files):
+        size_before = os.path.getsize(filepath)
+        data = database._load_json(filepath)
+        if not database._commit_files({filepath: data}):
+            print(f"❌ {filepath}: yozib bo'lmadi")
+            continue
+        size_after = os.path.getsize(filepath)
+        print(f"✅ {filepath}: {size_before:,} -> {size_after:,} bayt ({target})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Bazadagi o'zgarishlar haqida xabar beruvchi event bus (jarayon ichida)
+
+Baza har bir o'zgarishdan keyin tipli event e'lon qiladi (masalan,
+product_added yoki order_status_changed). Klaviatura keshlari, qidiruv
+indekslari, hisoblagichlar va bildirishnomalar shu eventlarga obuna
+bo'lib, ma'lumotni qayta so'ramasdan yoki qayta qurmasdan yangilanadi:
+
+    @db.events.on(events.PRODUCT_UPDATED, events.PRODUCT_DELETED)
+    async def drop_caption(event):
+        captions.pop(event.data['product_id'], None)
+
+Baza metodlari executor oqimlarida ishlaydi, shuning uchun event darhol
+emas, bog'langan event loopda (bazaning qulfi bo'shagandan keyin)
+tarqatiladi. Loop bog'lanmagan bo'lsa (skriptlar, testlar) sinxron
+obunachilar shu zahoti chaqiriladi.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Event turlari
+PRODUCT_ADDED = 'product_added'
+PRODUCT_UPDATED = 'product_updated'
+PRODUCT_DELETED = 'product_deleted'
+CATEGORY_ADDED = 'category_added'
+CATEGORY_RENAMED = 'category_renamed'
+CATEGORY_DELETED = 'category_deleted'
+ORDER_CREATED = 'order_created'
+ORDER_STATUS_CHANGED = 'order_status_changed'
+USER_ADDED = 'user_added'
+
+EVENT_TYPES = (
+    PRODUCT_ADDED, PRODUCT_UPDATED, PRODUCT_DELETED,
+    CATEGORY_ADDED, CATEGORY_RENAMED, CATEGORY_DELETED,
+    ORDER_CREATED, ORDER_STATUS_CHANGED, USER_ADDED,
+)
+
+
+class Event:
+    """
+    Bitta o'zgarish
+
+    Attributes:
+        type: Event turi (EVENT_TYPES dan biri)
+        data: Tafsilotlar, masalan {'product_id': 5, 'fields': {'price': 1000.0}}
+    """
+
+    __slots__ = ('type', 'data')
+
+    def __init__(self, event_type: str, data: Dict[str, Any]):
+        self.type = event_type
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"Event({self.type!r}, {self.data!r})"
+
+
+Handler = Callable[[Event], Union[None, Awaitable[None]]]
+
+
+class EventBus:
+    """
+    Obunachilar ro'yxati va eventlarni tarqatish
+    """
+
+    def __init__(self):
+        # Event turi (None - barcha eventlar) -> obunachilar
+        self._handlers: Dict[Optional[str], Tuple[Handler, ...]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Tugallanmagan async obunachilar (GC yig'ib olmasligi uchun)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """
+        Eventlarni shu event loopda tarqatish
+
+        Args:
+            loop: Bot ishlayotgan event loop
+        """
+        self._loop = loop
+
+    def subscribe(self, handler: Handler, *event_types: str) -> Handler:
+        """
+        Obuna bo'lish
+
+        Args:
+            handler: Sinxron yoki async funksiya (Event qabul qiladi)
+            *event_types: Qaysi eventlar (berilmasa - barchasi)
+
+        Returns:
+            Handler: Shu handlerning o'zi
+
+        Raises:
+            ValueError: Noma'lum event turi berilsa
+        """
+        unknown = set(event_types) - set(EVENT_TYPES)
+        if unknown:
+            raise ValueError(f"Noma'lum event turi: {', '.join(sorted(unknown))}")
+
+        # Ro'yxat almashtiriladi (joyida o'zgartirilmaydi) - tarqatish paytida
+        # boshqa oqimdan obuna bo'lish xavfsiz
+        for event_type in event_types or (None,):
+            self._handlers[event_type] = self._handlers.get(event_type, ()) + (handler,)
+        return handler
+
+    def on(self, *event_types: str) -> Callable[[Handler], Handler]:
+        """
+        subscribe() ning dekorator ko'rinishi
+
+        Args:
+            *event_types: Qaysi eventlar (berilmasa - barchasi)
+        """
+        def decorator(handler: Handler) -> Handler:
+            return self.subscribe(handler, *event_types)
+        return decorator
+
+    def unsubscribe(self, handler: Handler):
+        """
+        Handlerni barcha eventlardan olib tashlash
+
+        Args:
+            handler: Avval obuna bo'lgan handler
+        """
+        for event_type, handlers in list(self._handlers.items()):
+            self._handlers[event_type] = tuple(h for h in handlers if h is not handler)
+
+    def publish(self, event_type: str, **data: Any):
+        """
+        Event e'lon qilish (baza metodlari ichidan, istalgan oqimda)
+
+        Args:
+            event_type: Event turi
+            **data: Tafsilotlar
+        """
+        if not self._handlers.get(event_type) and not self._handlers.get(None):
+            return
+
+        event = Event(event_type, data)
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._dispatch, event)
+        else:
+            self._dispatch(event)
+
+    def _dispatch(self, event: Event):
+        """
+        Eventni obunachilarga tarqatish (bitta obunachining xatosi boshqalarga ta'sir qilmaydi)
+
+        Args:
+            event: Event
+        """
+        for handler in self._handlers.get(event.type, ()) + self._handlers.get(None, ()):
+            try:
+                result = handler(event)
+            except Exception as e:
+                logger.error(f"❌ Event obunachisida xatolik ({event.type}): {e}")
+                continue
+
+            if asyncio.iscoroutine(result):
+                self._start(result, event)
+
+    def _start(self, coro: Awaitable[None], event: Event):
+        """
+        Async obunachini task sifatida ishga tushirish
+
+        Args:
+            coro: Obunachi qaytargan coroutine
+            event: Event (xatolik xabari uchun)
+        """
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()
+            logger.warning(f"⚠️ Event loop yo'q - async obunachi chaqirilmadi ({event.type})")
+            return
+
+        self._tasks.add(task)
+
+        def done(finished: asyncio.Task):
+            self._tasks.discard(finished)
+            if not finished.cancelled() and finished.exception():
+                logger.error(f"❌ Event obunachisida xatolik ({event.type}): {finished.exception()}")
+
+        task.add_done_callback(done)
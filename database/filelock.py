@@ -0,0 +1,127 @@
+"""
+Bir nechta jarayon uchun fayl qulfi va o'zgarishlar hisoblagichi
+
+Bitta data papkasi bilan bir vaqtda bir nechta jarayon (masalan, ikkita
+bot nusxasi yoki bot va admin skripti) ishlaganda JSONDatabase har bir
+read-modify-write tsiklini shu qulf ostida bajaradi - aks holda ikki
+jarayon bir xil faylni o'qib, bir-birining o'zgarishini o'chirib yuborishi
+mumkin.
+
+Qulf fayli (config.DATA_LOCK_FILE) ning o'zida generation hisoblagichi
+saqlanadi: har bir yozuvdan keyin u bittaga oshiriladi. Boshqa jarayonlar
+keshni tekshirishda har bir faylni stat qilish o'rniga shu 8 baytni
+o'qiydi va fayllarni faqat hisoblagich o'zgargandagina tekshiradi.
+
+Qulf advisory (fcntl.flock) - faqat shu qulfni ishlatadigan jarayonlar
+bir-birini kutadi. fcntl bo'lmagan tizimlarda (Windows) qulf o'chiriladi.
+"""
+
+import os
+import threading
+from typing import Optional, Tuple
+import logging
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Hisoblagich qulf faylining boshida 8 baytli butun son sifatida saqlanadi
+GENERATION_SIZE = 8
+
+
+class FileLock:
+    """
+    Jarayonlararo eksklyuziv qulf (bitta jarayon ichida qayta kiriladigan)
+
+        with lock:
+            ...  # boshqa jarayonlar shu qulfni kutadi
+
+    Jarayon ichidagi oqimlar ichki RLock orqali navbat bilan egalik qiladi,
+    flock esa faqat eng tashqi kirishda olinadi va chiqishda bo'shatiladi.
+    """
+
+    def __init__(self, filepath: Optional[str]):
+        """
+        Args:
+            filepath: Qulf fayli yo'li (None bo'lsa qulf o'chiq)
+        """
+        if filepath and fcntl is None:
+            logger.warning("⚠️ fcntl mavjud emas - jarayonlararo fayl qulfi o'chirildi")
+            filepath = None
+
+        self.filepath = filepath
+        self._fd: Optional[int] = None
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Qulf yoqilganmi"""
+        return self.filepath is not None
+
+    def _open(self) -> int:
+        """
+        Qulf faylini ochish (birinchi murojaatda)
+
+        Returns:
+            int: Fayl deskriptori
+        """
+        if self._fd is None:
+            self._fd = os.open(self.filepath, os.O_RDWR | os.O_CREAT, 0o644)
+        return self._fd
+
+    def __enter__(self) -> 'FileLock':
+        if not self.enabled:
+            return self
+
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                fcntl.flock(self._open(), fcntl.LOCK_EX)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.enabled:
+            return
+
+        self._depth -= 1
+        try:
+            if self._depth == 0:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+
+    def generation(self) -> Optional[int]:
+        """
+        Joriy generation (qulfsiz o'qiladi - bitta pread)
+
+        Returns:
+            Optional[int]: Hisoblagich (qulf o'chiq bo'lsa None)
+        """
+        if not self.enabled:
+            return None
+        return int.from_bytes(os.pread(self._open(), GENERATION_SIZE, 0), 'little')
+
+    def bump(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Yozuvdan keyin hisoblagichni oshirish (qulf ostida chaqiriladi)
+
+        Returns:
+            Tuple[Optional[int], Optional[int]]: (oldingi, yangi) qiymat
+            (qulf o'chiq bo'lsa (None, None))
+        """
+        if not self.enabled:
+            return None, None
+
+        with self:
+            previous = self.generation()
+            current = (previous + 1) % (1 << (GENERATION_SIZE * 8))
+            os.pwrite(self._fd, current.to_bytes(GENERATION_SIZE, 'little'), 0)
+        return previous, current
@@ -0,0 +1,158 @@
+"""
+Data fayllarining diskdagi formatlari
+
+    pretty  - chiroyli JSON (indent=2), qo'lda o'qish oson (default)
+    compact - bo'sh joysiz JSON, taxminan ikki barobar kichik va tez
+    msgpack - binar format (msgpack kutubxonasi o'rnatilgan bo'lsa)
+
+JSON formatlar uchun orjson o'rnatilgan bo'lsa, u tezkor yo'l sifatida
+ishlatiladi. Binar fayllar MSGPACK_MAGIC sarlavhasi bilan boshlanadi,
+shuning uchun o'qishda format avtomatik aniqlanadi: formatni o'zgartirish
+uchun eski fayllarni qo'lda o'girish shart emas.
+
+Arxiv fayllari (*.gz) shu formatlardan biri ustidan gzip bilan siqiladi;
+gzip ham sarlavhasidan avtomatik aniqlanadi.
+"""
+
+import gzip
+import json
+from typing import Any
+import config
+import logging
+
+from database.models import to_plain
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Binar fayl belgisi (JSON fayl hech qachon shu baytlar bilan boshlanmaydi)
+MSGPACK_MAGIC = b"\x00SHOPBOT-MSGPACK\x01\n"
+
+FORMATS = ('pretty', 'compact', 'msgpack')
+
+# gzip fayl sarlavhasi
+GZIP_MAGIC = b"\x1f\x8b"
+
+_warned_fallback = False
+
+
+def resolve_format(name: str = None) -> str:
+    """
+    Yozish formatini aniqlash
+
+    Args:
+        name: Format nomi (default: config.DATA_FORMAT)
+
+    Returns:
+        str: Ishlatiladigan format (msgpack o'rnatilmagan bo'lsa 'compact')
+
+    Raises:
+        ValueError: Noma'lum format nomi
+    """
+    global _warned_fallback
+
+    name = name or getattr(config, 'DATA_FORMAT', 'pretty')
+    if name not in FORMATS:
+        raise ValueError(f"Noma'lum DATA_FORMAT: {name} (mavjudlari: {', '.join(FORMATS)})")
+
+    if name == 'msgpack' and msgpack is None:
+        if not _warned_fallback:
+            logger.warning("⚠️ msgpack o'rnatilmagan, 'compact' JSON formatida yoziladi")
+            _warned_fallback = True
+        return 'compact'
+    return name
+
+
+def _use_orjson() -> bool:
+    """orjson tezkor yo'lini ishlatish mumkinmi"""
+    return orjson is not None and getattr(config, 'USE_ORJSON', True)
+
+
+def encode(data: Any, fmt: str = None, compress: bool = False) -> bytes:
+    """
+    Ma'lumotlarni fayl baytlariga aylantirish
+
+    Args:
+        data: Ma'lumotlar
+        fmt: Format nomi (default: config.DATA_FORMAT)
+        compress: gzip bilan siqish (arxiv fayllari uchun)
+
+    Returns:
+        bytes: Faylga yoziladigan baytlar
+    """
+    if compress:
+        # mtime=0 - bir xil ma'lumot doim bir xil baytlarga aylanadi
+        return gzip.compress(encode(data, fmt), compresslevel=6, mtime=0)
+
+    fmt = resolve_format(fmt)
+
+    if fmt == 'msgpack':
+        return MSGPACK_MAGIC + msgpack.packb(data, use_bin_type=True, default=to_plain)
+
+    if _use_orjson():
+        option = orjson.OPT_NON_STR_KEYS
+        if fmt == 'pretty':
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option, default=to_plain)
+
+    if fmt == 'pretty':
+        return json.dumps(data, ensure_ascii=False, indent=2, default=to_plain).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=to_plain).encode('utf-8')
+
+
+def detect(raw: bytes) -> str:
+    """
+    Fayl formatini birinchi baytlaridan aniqlash
+
+    Args:
+        raw: Fayl baytlari
+
+    Returns:
+        str: 'gzip', 'msgpack' yoki 'json'
+    """
+    if raw.startswith(GZIP_MAGIC):
+        return 'gzip'
+    return 'msgpack' if raw.startswith(MSGPACK_MAGIC) else 'json'
+
+
+def decode(raw: bytes) -> Any:
+    """
+    Fayl baytlarini ma'lumotlarga aylantirish (format avtomatik aniqlanadi)
+
+    Args:
+        raw: Fayl baytlari
+
+    Returns:
+        Any: O'qilgan ma'lumotlar
+
+    Raises:
+        ValueError: Fayl buzilgan bo'lsa (JSONDecodeError ham ValueError)
+        RuntimeError: Fayl msgpack formatida, lekin msgpack o'rnatilmagan
+    """
+    kind = detect(raw)
+    if kind == 'gzip':
+        try:
+            return decode(gzip.decompress(raw))
+        except (OSError, EOFError) as e:
+            # Buzilgan arxiv ham oddiy buzilgan fayl kabi ko'riladi
+            raise ValueError(f"gzip faylni ochib bo'lmadi: {e}") from e
+
+    if kind == 'msgpack':
+        if msgpack is None:
+            # Faylni buzilgan deb hisoblab ustidan yozmaslik uchun ValueError emas
+            raise RuntimeError("Fayl msgpack formatida, lekin msgpack o'rnatilmagan")
+        return msgpack.unpackb(raw[len(MSGPACK_MAGIC):], raw=False, strict_map_key=False)
+
+    if _use_orjson():
+        # orjson.JSONDecodeError json.JSONDecodeError dan meros oladi
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
@@ -0,0 +1,37 @@
+"""
+JSON fayllardan SQLite bazasiga bir martalik import
+
+Ishlatish:
+    python -m database.import_json [--data-dir data] [--db data/shop.db]
+
+So'ng config.py da DB_BACKEND = "sqlite" qilib qo'yiladi.
+"""
+
+import argparse
+import config
+import logging
+
+from database.sqlite_db import SQLiteDatabase
+
+
+def main():
+    """
+    Buyruq qatori argumentlarini o'qib, importni bajarish
+    """
+    parser = argparse.ArgumentParser(description="data/*.json fayllarini SQLite bazasiga import qilish")
+    parser.add_argument("--data-dir", default=config.DATA_DIR,
+                        help="JSON fayllar papkasi")
+    parser.add_argument("--db", default=config.SQLITE_FILE,
+                        help="SQLite fayli yo'li")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    database = SQLiteDatabase(args.db)
+    counts = database.import_from_json(args.data_dir)
+    database.close()
+    print(f"Import yakunlandi: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Buyurtmalar uchun append-only jurnal
+
+Har bir buyurtma yaratilishi yoki statusi o'zgarishi segment faylini
+qayta yozish o'rniga jurnal fayliga bitta qator sifatida qo'shiladi.
+Vaqti-vaqti bilan jurnal oylik segmentlarga yig'iladi (compaction).
+"""
+
+import json
+import os
+from typing import Callable, List, Dict, Any, Optional
+import logging
+
+from database.models import Order, to_plain
+
+logger = logging.getLogger(__name__)
+
+
+class OrderJournal:
+    """
+    Buyurtmalar jurnali (JSON Lines formatida)
+
+    Yozuv turlari:
+        {"op": "create", "order": {...}}
+        {"op": "status", "id": 5, "status": "tasdiqlandi"}
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Args:
+            filepath: Jurnal fayli yo'li
+        """
+        self.filepath = filepath
+        # Jurnaldagi yozuvlar soni (compaction qarori uchun)
+        self.entries = 0
+
+    @staticmethod
+    def encode(entries: List[Dict[str, Any]]) -> str:
+        """
+        Yozuvlarni jurnal qatorlariga aylantirish
+
+        Args:
+            entries: Yozuvlar (op va ma'lumotlar)
+
+        Returns:
+            str: Har bir yozuv alohida qatorda
+        """
+        return ''.join(
+            json.dumps(entry, ensure_ascii=False, separators=(',', ':'), default=to_plain) + '\n'
+            for entry in entries
+        )
+
+    def write(self, text: str, count: int):
+        """
+        Kodlangan qatorlarni jurnalga qo'shish (hammasi uchun bitta fsync)
+
+        Args:
+            text: encode() natijasi
+            count: Qatorlardagi yozuvlar soni
+        """
+        with open(self.filepath, 'a', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries += count
+
+    def append(self, entries: List[Dict[str, Any]]):
+        """
+        Jurnalga yozuvlar qo'shish (hammasi uchun bitta fsync)
+
+        Args:
+            entries: Yozuvlar (op va ma'lumotlar)
+        """
+        self.write(self.encode(entries), len(entries))
+
+    def replay(self, orders: List[Dict],
+               resolve: Optional[Callable[[Dict], List[Dict]]] = None) -> List[Dict]:
+        """
+        Jurnalni snapshot ustiga qo'llash
+
+        Qayta qo'llash idempotent: snapshot allaqachon o'z ichiga olgan
+        yozuvlar (masalan, compaction o'rtasida to'xtab qolgan bo'lsa)
+        dublikat yaratmaydi.
+
+        Args:
+            orders: Snapshotdagi buyurtmalar (joyida o'zgartiriladi)
+            resolve: Yozuvdagi buyurtma orders da bo'lmasa chaqiriladi
+                (buyurtma yoki {'id': ...} -> qo'shimcha yuklangan buyurtmalar,
+                masalan uning eski segmenti)
+
+        Returns:
+            List[Dict]: Yangilangan buyurtmalar ro'yxati
+        """
+        self.entries = 0
+        if not os.path.exists(self.filepath):
+            return orders
+
+        by_id = {o.get('id'): o for o in orders}
+
+        with open(self.filepath, 'rb') as f:
+            raw = f.read()
+
+        # Oxirgi qator yarim yozilgan bo'lsa (yozish o'rtasida to'xtagan),
+        # keyingi yozuvlar unga yopishib qolmasligi uchun uni kesib tashlaymiz
+        if raw and not raw.endswith(b'\n'):
+            good_size = raw.rfind(b'\n') + 1
+            logger.warning(f"⚠️ Jurnal oxiridagi yarim qator kesildi ({self.filepath})")
+            with open(self.filepath, 'r+b') as f:
+                f.truncate(good_size)
+            raw = raw[:good_size]
+
+        for line_no, line in enumerate(raw.decode('utf-8').splitlines(), 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"⚠️ Jurnalda buzilgan qator o'tkazib yuborildi ({self.filepath}:{line_no})")
+                continue
+
+            self.entries += 1
+            op = entry.get('op')
+
+            if op == 'create':
+                order = Order.from_dict(entry['order'])
+                existing = self._resolve(order, orders, by_id, resolve)
+                if existing is not None:
+                    existing.update(order)
+                else:
+                    orders.append(order)
+                    by_id[order.get('id')] = order
+
+            elif op == 'status':
+                order = self._resolve({'id': entry.get('id')}, orders, by_id, resolve)
+                if order is not None:
+                    order['status'] = entry['status']
+
+            else:
+                logger.warning(f"⚠️ Jurnalda noma'lum amal: {op}")
+
+        return orders
+
+    @staticmethod
+    def _resolve(ref: Dict, orders: List[Dict], by_id: Dict[Any, Dict],
+                 resolve: Optional[Callable[[Dict], List[Dict]]]) -> Optional[Dict]:
+        """
+        Yozuvdagi buyurtmani topish, kerak bo'lsa resolve orqali yuklab
+
+        Args:
+            ref: Buyurtma yoki {'id': ...}
+            orders: Buyurtmalar ro'yxati (yuklanganlar shu yerga qo'shiladi)
+            by_id: ID -> buyurtma
+            resolve: Qo'shimcha buyurtmalarni yuklovchi funksiya
+
+        Returns:
+            Optional[Dict]: Mavjud buyurtma yoki None
+        """
+        order = by_id.get(ref.get('id'))
+        if order is None and resolve is not None:
+            for loaded in resolve(ref):
+                orders.append(loaded)
+                by_id[loaded.get('id')] = loaded
+            order = by_id.get(ref.get('id'))
+        return order
+
+    def truncate(self):
+        """
+        Jurnalni tozalash (snapshot yozilgandan keyin)
+        """
+        with open(self.filepath, 'w', encoding='utf-8') as f:
+            os.fsync(f.fileno())
+        self.entries = 0
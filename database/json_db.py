@@ -3,96 +3,1384 @@ JSON fayllar bilan ishlash moduli - To'liq versiya
 Barcha CRUD operatsiyalari bilan
 """
 
+import asyncio
+import bisect
+import copy
+import functools
 import json
 import os
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+import shutil
+import threading
+import time
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Optional, Dict, Any, Tuple
 import config
-import random
 import logging
 
+from database import events, formats
+from database.base import DEFAULT_CATEGORIES, register_backend, synchronized
+from database.columns import OrderColumns
+from database.filelock import FileLock
+from database.journal import OrderJournal
+from database.models import Order, Product, User
+from database.sampling import IdPool, ProductDeck
+from database.segments import (OrderManifest, archive_path, hot_months, order_month,
+                               segment_path, split_by_month)
+
 logger = logging.getLogger(__name__)
 
 
+def exclusive(method):
+    """
+    Ma'lumotlarni o'zgartiruvchi metodni bajarish (synchronized + yozish qulflari)
+
+    Yozuv darhol (sinxron) diskka tushishi mumkin, shuning uchun _io_lock
+    doim _lock dan oldin olinadi - flush va compaction ham shu tartibda.
+    DATA_LOCK_ENABLED bo'lsa metod boshqa jarayonlar bilan umumiy fayl
+    qulfi ostida bajariladi: o'qish, o'zgartirish va diskka yozish orasida
+    boshqa jarayon shu fayllarni o'zgartira olmaydi.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._exclusive(), self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class Transaction:
+    """
+    JSONDatabase.transaction() ichidagi o'zgarishlar to'plami
+
+    Har bir kolleksiya bir marta o'qiladi (keshdan nusxa olinadi) va
+    commit paytida bir marta yoziladi.
+    """
+
+    def __init__(self, database: 'JSONDatabase'):
+        """
+        Args:
+            database: Tranzaksiya tegishli baza
+        """
+        self._database = database
+        # Fayl yo'li -> tranzaksiya ichidagi nusxa
+        self.staged: Dict[str, Any] = {}
+        # O'zgartirilgan kolleksiyalar (yozilish tartibida)
+        self.writes: Dict[str, None] = {}
+
+    def read(self, filepath: str) -> Any:
+        """
+        Kolleksiyani tranzaksiya ichida o'qish
+
+        Args:
+            filepath: Fayl yo'li
+
+        Returns:
+            Any: Kolleksiya nusxasi (o'zgartirish mumkin)
+        """
+        if filepath not in self.staged:
+            self.staged[filepath] = copy.deepcopy(self._database._read_json(filepath))
+        return self.staged[filepath]
+
+    def write(self, filepath: str, data: Any):
+        """
+        Kolleksiyaning yangi holatini belgilash
+
+        Args:
+            filepath: Fayl yo'li
+            data: Yangi ma'lumotlar
+        """
+        self.staged[filepath] = data
+        self.writes[filepath] = None
+
+
+@register_backend("json")
 class JSONDatabase:
     """
     JSON fayllar bilan ishlash klassi
     Bu klass barcha ma'lumotlar bazasi operatsiyalarini amalga oshiradi
     """
 
-    def __init__(self):
+    def __init__(self):
+        """
+        Initsializatsiya - data papkasini va fayllarni yaratish
+        """
+        # Xotiradagi kesh: fayl yo'li -> ma'lumotlar
+        self._cache: Dict[str, Any] = {}
+        # Fayl holati (mtime_ns, size) - tashqi o'zgarishlarni aniqlash uchun
+        self._stamps: Dict[str, Any] = {}
+        # Fayl holati oxirgi marta qachon tekshirilgani (monotonic)
+        self._checked_at: Dict[str, float] = {}
+        # Fayl holati qaysi generation'da tekshirilgani (DATA_LOCK_ENABLED bo'lsa)
+        self._checked_gen: Dict[str, Optional[int]] = {}
+
+        # Birlamchi kalit indekslari: id -> yozuv (keshdagi dict bilan bir xil obyekt)
+        self._products_by_id: Dict[int, Dict] = {}
+        self._orders_by_id: Dict[int, Dict] = {}
+        self._users_by_id: Dict[int, Dict] = {}
+        # ID hisoblagichi mavjud ID'lar bilan solishtirilgan kolleksiyalar
+        self._sequences_checked: set = set()
+
+        # Ikkilamchi indekslar
+        # kategoriya -> tovar ID'lari (o'sish tartibida, SQLite dagi ORDER BY id kabi)
+        self._category_products: Dict[str, List[int]] = {}
+        # Tovar ID'lari o'sish tartibida - sahifalash uchun
+        self._product_ids: List[int] = []
+        # user_id -> buyurtma ID'lari (yaratilish tartibida)
+        self._user_orders: Dict[int, List[int]] = {}
+        # Buyurtma ID'lari (created_at, id) bo'yicha - sahifalash uchun;
+        # o'rni (rank) shu ro'yxatdagi indeks
+        self._order_sequence: List[int] = []
+        self._order_rank: Dict[int, int] = {}
+        # status -> buyurtmalar rank'lari (o'sish tartibida, bisect bilan yangilanadi)
+        self._status_ranks: Dict[str, List[int]] = {}
+
+        # Buyurtmalar oylik segmentlarda saqlanadi: manifest, xotiraga
+        # yuklangan segmentlar va keyingi yozuvda diskka tushadigan segmentlar
+        self._manifest = OrderManifest()
+        self._loaded_segments: set = set()
+        self._dirty_segments: set = set()
+        # Arxiv: manifestning "archive" bo'limi va o'qilgan arxiv segmentlari
+        # (arxivdagi buyurtmalar asosiy ro'yxat va indekslarga qo'shilmaydi)
+        self._archive_manifest = OrderManifest(section='archive')
+        self._archived: Dict[int, Dict] = {}
+        self._archive_loaded: set = set()
+        # Statistika hisoblagichlari: har bir o'zgarishda yangilanadi, kolleksiya
+        # diskdan o'qilganda esa noldan qayta hisoblanadi
+        self._order_counts: Dict[str, int] = {}
+        # Mavjud tovar ID'lari (soni statistikada, random post uchun O(k) tanlash)
+        self._available_pool = IdPool()
+
+        # Statistika uchun buyurtmalarning ustunli nusxasi (birinchi so'rovda quriladi)
+        self._columns: Optional[OrderColumns] = None
+
+        # Buyurtmalar jurnali (append-only rejim)
+        self._journal = OrderJournal(config.ORDERS_JOURNAL_FILE) if config.ORDERS_JOURNAL_ENABLED else None
+
+        # Group commit: bir event-loop tsiklidagi yozuvlar bitta fsync bilan
+        # diskka tushiriladi. Kutilayotgan fayllar va jurnal yozuvlari
+        self._pending: Dict[str, Any] = {}
+        self._pending_journal: List[Dict] = []
+        self._flush_scheduled = False
+        # Write-behind: navbatdagi flush vaqti va uning eng kech chegarasi (monotonic)
+        self._flush_deadline = 0.0
+        self._flush_not_after: Optional[float] = None
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        # Hozir diskka yozilayotgan (flush) ma'lumotlar bormi
+        self._flushing = False
+        # Foydalanuvchilarning faqat last_seen maydoni o'zgargan payt (monotonic) -
+        # bunday o'zgarishlar LAST_SEEN_FLUSH_INTERVAL da bir marta yoziladi
+        self._users_touched_at: Optional[float] = None
+
+        # Kesh va indekslar uchun qulf; diskka yozish tartibi uchun alohida qulf.
+        # Boshqa jarayonlar bilan umumiy fayl qulfi doim ulardan keyin olinadi:
+        # _io_lock -> _lock -> _file_lock
+        self._lock = threading.RLock()
+        self._io_lock = threading.RLock()
+        self._file_lock = FileLock(config.DATA_LOCK_FILE if config.DATA_LOCK_ENABLED else None)
+        # AsyncDatabase ulaganda: flush shu loop orqali shu executorda bajariladi
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[Executor] = None
+
+        # O'zgarishlar haqida xabar beruvchi event bus (keshlar, indekslar uchun)
+        self.events = events.EventBus()
+
+        # Diskdan o'qilgan dict'lar aylantiriladigan yozuv turlari
+        self._record_types = {
+            config.PRODUCTS_FILE: Product,
+            config.USERS_FILE: User,
+        }
+
+        # Kolleksiya diskdan qayta o'qilganda indekslarni qurish funksiyalari
+        self._index_builders = {
+            config.PRODUCTS_FILE: self._index_products,
+            config.ORDERS_FILE: self._index_orders,
+            config.USERS_FILE: self._index_users,
+        }
+
+        self._init_storage()
+
+        logger.info(f"✅ {type(self).__name__} initsializatsiya qilindi")
+
+    def _init_storage(self):
+        """
+        Data papkasini va fayllarni yaratish
+        """
+        if not os.path.exists(config.DATA_DIR):
+            os.makedirs(config.DATA_DIR)
+            logger.info(f"✅ Data papka yaratildi: {config.DATA_DIR}")
+
+        if not os.path.exists(config.ORDERS_DIR):
+            os.makedirs(config.ORDERS_DIR)
+
+        if not os.path.exists(config.ORDERS_ARCHIVE_DIR):
+            os.makedirs(config.ORDERS_ARCHIVE_DIR)
+
+        # Boshqa jarayon shu paytda yozayotgan tranzaksiyani "tiklab" yubormaslik uchun
+        with self._file_lock:
+            self._recover_transaction()
+            self._migrate_orders_file()
+
+            self._init_file(config.PRODUCTS_FILE, [])
+            self._init_file(config.ORDERS_MANIFEST_FILE, {'segments': {}})
+            self._init_file(config.USERS_FILE, [])
+            self._init_file(config.CATEGORIES_FILE, list(DEFAULT_CATEGORIES))
+            self._init_file(config.META_FILE, {'sequences': {}})
+
+    def _init_file(self, filepath: str, default_data: Any):
+        """
+        Agar fayl bo'lmasa, default ma'lumotlar bilan yaratish
+
+        Args:
+            filepath: Fayl yo'li
+            default_data: Default ma'lumotlar
+        """
+        if not os.path.exists(filepath):
+            self._commit_files({filepath: default_data})
+            logger.info(f"✅ Fayl yaratildi: {filepath}")
+
+    @staticmethod
+    def _file_stamp(filepath: str) -> Optional[Tuple[int, int]]:
+        """
+        Fayl holatini olish (o'zgarishni aniqlash uchun)
+
+        Args:
+            filepath: Fayl yo'li
+
+        Returns:
+            Optional[Tuple[int, int]]: (mtime_ns, size) yoki fayl bo'lmasa None
+        """
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _collection_stamp(self, filepath: str) -> Any:
+        """
+        Kolleksiya holati - buyurtmalar uchun manifest va jurnal holati
+
+        Args:
+            filepath: Fayl yo'li
+
+        Returns:
+            Any: Solishtirish uchun holat
+        """
+        if filepath == config.ORDERS_FILE:
+            stamp = self._file_stamp(config.ORDERS_MANIFEST_FILE)
+            if self._journal:
+                return stamp, self._file_stamp(self._journal.filepath)
+            return stamp
+        return self._file_stamp(filepath)
+
+    def _refresh_stamp(self, filepath: str):
+        """
+        O'zimiz yozgan faylni tashqi o'zgarish deb hisoblamaslik uchun holatini yangilash
+
+        Args:
+            filepath: Fayl yo'li
+        """
+        self._stamps[filepath] = self._collection_stamp(filepath)
+        self._checked_at[filepath] = time.monotonic()
+        if filepath == config.ORDERS_MANIFEST_FILE:
+            self._refresh_stamp(config.ORDERS_FILE)
+
+    def _bump_generation(self):
+        """
+        Yozuvdan keyin qulf faylidagi generation'ni oshirish (fayl qulfi ostida)
+
+        Oldingi generation'da tekshirilgan kolleksiyalar yangisida ham
+        tekshirilgan hisoblanadi - farq faqat o'zimizning yozuvimiz, uning
+        fayl holati esa _refresh_stamp bilan allaqachon yangilangan.
+        """
+        previous, current = self._file_lock.bump()
+        if previous is None:
+            return
+        for filepath, seen in list(self._checked_gen.items()):
+            if seen == previous:
+                self._checked_gen[filepath] = current
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """
+        Yozuvchi qulflarini olish: _io_lock va (DATA_LOCK_ENABLED bo'lsa)
+        _lock hamda boshqa jarayonlar bilan umumiy fayl qulfi
+
+        Qulflar doim bir xil tartibda olinadi (_io_lock -> _lock -> _file_lock),
+        shuning uchun sinxron yozuvlar flush/compaction bilan, _read_json
+        ichida fayl qulfini kutish esa yozuvchilar bilan deadlock bermaydi.
+        """
+        with self._io_lock:
+            if not self._file_lock.enabled:
+                yield
+                return
+
+            with self._lock, self._file_lock:
+                yield
+
+    def _load_json(self, filepath: str) -> Any:
+        """
+        Data faylni diskdan o'qish va parse qilish (format avtomatik aniqlanadi)
+
+        Args:
+            filepath: Fayl yo'li
+
+        Returns:
+            Any: O'qilgan ma'lumotlar
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                return formats.decode(f.read())
+        except (FileNotFoundError, ValueError) as e:
+            logger.error(f"❌ Faylni o'qishda xatolik ({filepath}): {e}")
+
+            # Buzilgan faylni keyingi yozuv o'chirib yubormasligi uchun nusxasini saqlash
+            if isinstance(e, ValueError):
+                backup = f"{filepath}.corrupt-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+                try:
+                    shutil.copy2(filepath, backup)
+                    logger.error(f"⚠️ Buzilgan fayl nusxasi saqlandi: {backup}")
+                except OSError as copy_error:
+                    logger.error(f"❌ Buzilgan fayl nusxasini saqlab bo'lmadi: {copy_error}")
+
+            # Default qiymat qaytarish
+            if filepath in (config.META_FILE, config.ORDERS_MANIFEST_FILE):
+                return {}
+            return []
+
+    def _read_json(self, filepath: str) -> Any:
+        """
+        Kolleksiyani o'qish (xotiradagi keshdan)
+
+        Fayl faqat birinchi marta yoki boshqa jarayon uni o'zgartirgan
+        bo'lsa (mtime/size o'zgargan) qayta o'qiladi. Fayl holati ham
+        CACHE_CHECK_INTERVAL soniyada bir martadan ko'p tekshirilmaydi.
+        DATA_LOCK_ENABLED bo'lsa esa u har safar, lekin faqat qulf
+        faylidagi generation o'zgarganda (boshqa jarayon yozganda) tekshiriladi.
+
+        Args:
+            filepath: Fayl yo'li
+
+        Returns:
+            Any: Keshdagi ma'lumotlar (o'zgartirilsa, _write_json chaqirilishi kerak)
+        """
+        now = time.monotonic()
+        generation = self._file_lock.generation()
+        if filepath in self._cache:
+            if generation is None:
+                if now - self._checked_at.get(filepath, 0.0) < config.CACHE_CHECK_INTERVAL:
+                    return self._cache[filepath]
+            elif self._checked_gen.get(filepath) == generation:
+                return self._cache[filepath]
+            # Diskka hali tushmagan o'zgarishlar bo'lsa, kesh yagona haqiqiy manba
+            if self._flushing or filepath in self._pending or (
+                    filepath == config.ORDERS_FILE and (
+                        self._pending_journal or config.ORDERS_MANIFEST_FILE in self._pending)):
+                return self._cache[filepath]
+
+        stamp = self._collection_stamp(filepath)
+        self._checked_at[filepath] = now
+        self._checked_gen[filepath] = generation
+
+        if filepath in self._cache and stamp == self._stamps.get(filepath):
+            return self._cache[filepath]
+
+        if filepath in self._cache:
+            logger.info(f"🔄 Fayl tashqaridan o'zgargan, qayta o'qilmoqda: {filepath}")
+
+        # Boshqa jarayonning bir nechta faylli tranzaksiyasi yarmida o'qimaslik uchun
+        with self._file_lock:
+            stamp = self._collection_stamp(filepath)
+            if filepath == config.ORDERS_FILE:
+                data = self._load_orders()
+            else:
+                data = self._load_json(filepath)
+                record_type = self._record_types.get(filepath)
+                if record_type:
+                    data = record_type.from_dicts(data)
+        self._cache[filepath] = data
+        self._stamps[filepath] = stamp
+
+        builder = self._index_builders.get(filepath)
+        if builder:
+            builder(data)
+        return data
+
+    def _write_json(self, filepath: str, data: Any) -> bool:
+        """
+        JSON faylga yozish
+
+        Kesh darhol yangilanadi. Event loop ichida chaqirilsa (GROUP_COMMIT),
+        yozuv shu tsikl oxirigacha kechiktiriladi va shu vaqt ichidagi
+        barcha yozuvlar birga diskka tushiriladi.
+
+        Args:
+            filepath: Fayl yo'li
+            data: Yoziladigan ma'lumotlar
+
+        Returns:
+            bool: Muvaffaqiyatli yozilgan (yoki navbatga qo'yilgan) bo'lsa True
+        """
+        return self._write_many({filepath: data})
+
+    def _write_many(self, files: Dict[str, Any]) -> bool:
+        """
+        Bir nechta kolleksiyani birga yozish
+
+        Fayllar bitta flush ichida yoziladi, bir nechta fayl esa intent-log
+        orqali atomik almashtiriladi (_write_files ga qarang).
+
+        Args:
+            files: Fayl yo'li -> ma'lumotlar
+
+        Returns:
+            bool: Muvaffaqiyatli yozilgan (yoki navbatga qo'yilgan) bo'lsa True
+        """
+        # Keshni darhol yangilash (write-through)
+        self._cache.update(files)
+        if config.USERS_FILE in files:
+            self._users_touched_at = None
+
+        if self._schedule_flush():
+            self._pending.update(files)
+            return True
+
+        return self._commit_files(files)
+
+    def _append_order_journal(self, entries: List[Dict]):
+        """
+        Buyurtmalar jurnaliga yozuvlar qo'shish (butun faylni qayta yozmasdan)
+
+        Args:
+            entries: Jurnal yozuvlari (hammasi bitta fsync bilan yoziladi)
+        """
+        # Buyurtmalar muhim - jurnal yozuvlari write-behind kutmasdan,
+        # joriy tsikl oxirida diskka tushiriladi
+        if self._schedule_flush(urgent=True):
+            self._pending_journal.extend(entries)
+            return
+
+        with self._io_lock:
+            self._commit_journal(self._journal.encode(entries), len(entries))
+
+    @contextmanager
+    def transaction(self) -> Iterator['Transaction']:
+        """
+        Bir nechta kolleksiyani atomik o'zgartirish
+
+        Blok ichida txn.read() kolleksiyaning nusxasini beradi, o'zgarishlar
+        txn.write() bilan belgilanadi. Blok xatosiz tugasa barcha
+        o'zgarishlar birga (bitta flush, bitta intent-log) yoziladi,
+        xato bo'lsa - hech biri qo'llanmaydi.
+
+            with db.transaction() as txn:
+                categories = txn.read(config.CATEGORIES_FILE)
+                ...
+                txn.write(config.CATEGORIES_FILE, categories)
+
+        Yields:
+            Transaction: Tranzaksiya obyekti
+        """
+        with self._exclusive(), self._lock:
+            txn = Transaction(self)
+            yield txn
+            if txn.writes:
+                self._commit_transaction(txn)
+
+    def _commit_transaction(self, txn: 'Transaction'):
+        """
+        Tranzaksiya o'zgarishlarini kesh, indekslar va diskka qo'llash
+
+        Args:
+            txn: Yakunlangan tranzaksiya
+        """
+        files = {filepath: txn.staged[filepath] for filepath in txn.writes}
+        self._write_many(files)
+
+        for filepath, data in files.items():
+            builder = self._index_builders.get(filepath)
+            if builder:
+                builder(data)
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop, executor: Optional[Executor] = None):
+        """
+        Group commit flushlarini berilgan event loop orqali rejalashtirish
+
+        Metodlar executor oqimlarida chaqirilganda ham yozuvlar shu loop
+        tsikli oxirida yig'ilib, diskka berilgan executorda tushiriladi.
+
+        Args:
+            loop: Bot ishlayotgan event loop
+            executor: Disk ishlari uchun executor (bitta oqimli bo'lishi kerak)
+        """
+        self._loop = loop
+        self._executor = executor
+
+    def _schedule_flush(self, urgent: bool = False, within: Optional[float] = None) -> bool:
+        """
+        Navbatdagi yozuvlar uchun flush rejalashtirish
+
+        Write-behind o'chiq bo'lsa flush joriy event-loop tsikli oxirida
+        bo'ladi (group commit). Yoqilgan bo'lsa, kolleksiya "dirty" deb
+        belgilanadi va flush oxirgi o'zgarishdan WRITE_BEHIND_INTERVAL_MS
+        o'tgach bajariladi, lekin birinchi o'zgarishdan
+        WRITE_BEHIND_MAX_DIRTY_MS dan kechikmaydi.
+
+        within berilsa (kechiktirilgan last_seen) flush eng kechi shuncha
+        soniyadan keyin bo'ladi - bu taymer group commit va fayl qulfi
+        sozlamalaridan qat'i nazar ishlaydi, allaqachon rejalashtirilgan
+        flush esa kechiktirilmaydi.
+
+        Args:
+            urgent: Write-behind kutmasdan, joriy tsikl oxirida yozish
+            within: Flush uchun eng ko'p kutish (soniya)
+
+        Returns:
+            bool: Rejalashtirilgan bo'lsa True (event loop yo'q bo'lsa False)
+        """
+        # Bir nechta jarayon rejimida har bir o'zgartirish fayl qulfi
+        # bo'shatilishidan oldin diskka yozilishi kerak
+        if within is None and (not config.GROUP_COMMIT or self._file_lock.enabled):
+            return False
+
+        loop = self._loop
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return False
+
+        now = time.monotonic()
+        if within is not None:
+            delay = max_dirty = within
+        elif config.WRITE_BEHIND_ENABLED and not urgent:
+            delay = config.WRITE_BEHIND_INTERVAL_MS / 1000
+            max_dirty = config.WRITE_BEHIND_MAX_DIRTY_MS / 1000
+        else:
+            delay = max_dirty = 0.0
+
+        if self._flush_not_after is None:
+            self._flush_not_after = now + max_dirty
+        else:
+            self._flush_not_after = min(self._flush_not_after, now + max_dirty)
+        previous_deadline = self._flush_deadline
+        self._flush_deadline = min(now + delay, self._flush_not_after)
+        if within is not None and self._flush_scheduled:
+            self._flush_deadline = min(self._flush_deadline, previous_deadline)
+
+        # Taymer faqat birinchi marta yoki flush vaqti oldinga surilganda qayta o'rnatiladi
+        if not self._flush_scheduled or self._flush_deadline < previous_deadline:
+            try:
+                loop.call_soon_threadsafe(self._arm_flush_timer, loop)
+            except RuntimeError:
+                # Loop yopilgan (bot to'xtamoqda) - darhol yozamiz
+                return False
+            self._flush_scheduled = True
+        return True
+
+    def _arm_flush_timer(self, loop: asyncio.AbstractEventLoop):
+        """
+        Flush taymerini o'rnatish (event loop oqimida chaqiriladi)
+
+        Args:
+            loop: Event loop
+        """
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        delay = max(0.0, self._flush_deadline - time.monotonic())
+        self._flush_timer = loop.call_later(delay, self._on_flush_timer, loop)
+
+    def _on_flush_timer(self, loop: asyncio.AbstractEventLoop):
+        """
+        Taymer ishlaganda: muddat kelgan bo'lsa flush, aks holda kutishni davom ettirish
+
+        Args:
+            loop: Event loop
+        """
+        self._flush_timer = None
+        remaining = self._flush_deadline - time.monotonic()
+        if remaining > 0.001:
+            # Shu orada yangi o'zgarishlar bo'lgan (debounce)
+            self._flush_timer = loop.call_later(remaining, self._on_flush_timer, loop)
+            return
+        self._start_flush()
+
+    def _start_flush(self):
+        """
+        Flushni executorda (bo'lsa) yoki shu yerning o'zida boshlash
+        """
+        if self._executor is not None and self._loop is not None:
+            self._loop.run_in_executor(self._executor, self.flush)
+        else:
+            self.flush()
+
+    def flush(self):
+        """
+        Navbatdagi barcha yozuvlarni diskka tushirish
+
+        Ma'lumotlar qulf ostida baytlarga aylantiriladi, diskka yozish va
+        fsync esa qulfdan tashqarida bajariladi - shu vaqtda boshqa
+        so'rovlar keshdan xizmat qilishda davom etadi.
+        """
+        with self._io_lock:
+            with self._lock:
+                self._flush_scheduled = False
+                self._flush_not_after = None
+                entries, self._pending_journal = self._pending_journal, []
+                files, self._pending = self._pending, {}
+                # Yozilmay turgan last_seen o'zgarishlari ham shu flush bilan ketadi
+                if self._users_touched_at is not None:
+                    files.setdefault(config.USERS_FILE, self._cache[config.USERS_FILE])
+                    self._users_touched_at = None
+                if not entries and not files:
+                    return
+
+                self._flushing = True
+                journal_text = self._journal.encode(entries) if entries else None
+                blobs = {filepath: self._dump(data, filepath) for filepath, data in files.items()}
+
+            try:
+                with self._file_lock:
+                    if journal_text:
+                        self._commit_journal(journal_text, len(entries))
+                    if blobs and self._file_lock.enabled:
+                        blobs = self._drop_stale(blobs)
+                    if blobs:
+                        self._write_files(blobs)
+            finally:
+                self._flushing = False
+
+    def _drop_stale(self, blobs: Dict[str, bytes]) -> Dict[str, bytes]:
+        """
+        Oxirgi o'qishdan keyin boshqa jarayon yozgan fayllarni chiqarib tashlash
+
+        Bir nechta jarayon rejimida navbatda faqat kechiktirilgan last_seen
+        o'zgarishlari bo'ladi - ular boshqa jarayonning yozuvini o'chirib
+        yubormasligi kerak. Bunday fayl keyingi o'qishda diskdan qayta olinadi.
+
+        Args:
+            blobs: Fayl yo'li -> fayl tarkibi
+
+        Returns:
+            Dict[str, bytes]: Xavfsiz yozish mumkin bo'lgan fayllar
+        """
+        fresh = {}
+        for filepath, blob in blobs.items():
+            if filepath in self._stamps and self._file_stamp(filepath) != self._stamps[filepath]:
+                logger.warning(f"⚠️ Fayl boshqa jarayon tomonidan o'zgartirilgan, yozuv bekor qilindi: {filepath}")
+                self._checked_gen.pop(filepath, None)
+                continue
+            fresh[filepath] = blob
+        return fresh
+
+    def _commit_journal(self, text: str, count: int):
+        """
+        Jurnal yozuvlarini bitta fsync bilan diskka yozish
+
+        Args:
+            text: Kodlangan jurnal qatorlari
+            count: Yozuvlar soni
+        """
+        with self._file_lock:
+            try:
+                self._journal.write(text, count)
+            except Exception as e:
+                logger.error(f"❌ Jurnalga yozishda xatolik ({self._journal.filepath}): {e}")
+
+            self._stamps[config.ORDERS_FILE] = self._collection_stamp(config.ORDERS_FILE)
+            self._checked_at[config.ORDERS_FILE] = time.monotonic()
+            self._bump_generation()
+
+    @staticmethod
+    def _dump(data: Any, filepath: str = None) -> bytes:
+        """
+        Ma'lumotlarni fayl baytlariga aylantirish (config.DATA_FORMAT bo'yicha)
+
+        Args:
+            data: Ma'lumotlar
+            filepath: Fayl yo'li (*.gz fayllar siqib yoziladi)
+
+        Returns:
+            bytes: Fayl tarkibi
+        """
+        return formats.encode(data, compress=bool(filepath and filepath.endswith('.gz')))
+
+    def _commit_files(self, files: Dict[str, Any]) -> bool:
+        """
+        Fayllarni darhol (sinxron) va atomik yozish
+
+        Args:
+            files: Fayl yo'li -> ma'lumotlar
+
+        Returns:
+            bool: Barcha fayllar muvaffaqiyatli yozilgan bo'lsa True
+        """
+        with self._io_lock:
+            return self._write_files({filepath: self._dump(data, filepath) for filepath, data in files.items()})
+
+    def _write_files(self, blobs: Dict[str, bytes]) -> bool:
+        """
+        Fayllarni xavfsiz (atomik) yozish
+
+        Har bir fayl avval vaqtinchalik faylga yoziladi va fsync qilinadi,
+        so'ng os.replace bilan asl fayl o'rniga qo'yiladi. Shunday qilib
+        yozish o'rtasida to'xtash faylni hech qachon yarim holda qoldirmaydi.
+
+        Args:
+            blobs: Fayl yo'li -> fayl tarkibi
+
+        Returns:
+            bool: Barcha fayllar muvaffaqiyatli yozilgan bo'lsa True
+        """
+        with self._file_lock:
+            try:
+                if len(blobs) > 1:
+                    return self._write_files_atomic(blobs)
+                return self._replace_files(blobs)
+            finally:
+                self._bump_generation()
+
+    def _replace_files(self, blobs: Dict[str, bytes]) -> bool:
+        """
+        Fayllarni bittalab .tmp orqali almashtirish (_write_files ga qarang)
+
+        Args:
+            blobs: Fayl yo'li -> fayl tarkibi
+
+        Returns:
+            bool: Barcha fayllar muvaffaqiyatli yozilgan bo'lsa True
+        """
+        success = True
+        directories = set()
+
+        for filepath, blob in blobs.items():
+            tmp_path = f"{filepath}.tmp"
+            try:
+                self._write_tmp(tmp_path, blob)
+                os.replace(tmp_path, filepath)
+                directories.add(os.path.dirname(os.path.abspath(filepath)))
+            except Exception as e:
+                logger.error(f"❌ Faylga yozishda xatolik ({filepath}): {e}")
+                success = False
+
+            # O'zimiz yozgan faylni tashqi o'zgarish deb hisoblamaslik
+            self._refresh_stamp(filepath)
+
+        # Rename'lar ham saqlanib qolishi uchun papkani bir marta fsync qilish
+        for directory in directories:
+            self._fsync_dir(directory)
+
+        return success
+
+    def _write_files_atomic(self, blobs: Dict[str, bytes]) -> bool:
+        """
+        Bir nechta faylni "hammasi yoki hech biri" tarzida yozish
+
+        1. Barcha yangi fayllar .tmp ga yoziladi va fsync qilinadi.
+        2. Intent-log (TXN_FILE) ga qaysi .tmp qaysi fayl o'rniga
+           qo'yilishi yoziladi - bu commit nuqtasi.
+        3. Fayllar os.replace bilan almashtiriladi va intent-log o'chiriladi.
+
+        2-qadamdan oldin to'xtasa hech bir fayl o'zgarmaydi; keyin
+        to'xtasa, keyingi ishga tushishda _recover_transaction qolgan
+        almashtirishlarni oxiriga yetkazadi.
+
+        Args:
+            blobs: Fayl yo'li -> fayl tarkibi
+
+        Returns:
+            bool: Muvaffaqiyatli yozilgan bo'lsa True
+        """
+        moves = [(f"{filepath}.tmp", filepath) for filepath in blobs]
+        directories = {os.path.dirname(os.path.abspath(filepath)) for filepath in blobs}
+        directories.add(os.path.dirname(os.path.abspath(config.TXN_FILE)))
+
+        try:
+            for tmp_path, filepath in moves:
+                self._write_tmp(tmp_path, blobs[filepath])
+
+            manifest = json.dumps({'moves': moves}, ensure_ascii=False).encode('utf-8')
+            self._write_tmp(f"{config.TXN_FILE}.tmp", manifest)
+            os.replace(f"{config.TXN_FILE}.tmp", config.TXN_FILE)
+            self._fsync_dir(os.path.dirname(os.path.abspath(config.TXN_FILE)))
+        except Exception as e:
+            logger.error(f"❌ Tranzaksiyani yozishda xatolik ({', '.join(blobs)}): {e}")
+            for tmp_path, _ in moves:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return False
+
+        # Commit nuqtasidan keyin - almashtirishlar jurnal bo'yicha oxiriga yetkaziladi
+        self._apply_moves(moves)
+        for directory in directories:
+            self._fsync_dir(directory)
+        os.remove(config.TXN_FILE)
+
+        for filepath in blobs:
+            self._refresh_stamp(filepath)
+
+        return True
+
+    @staticmethod
+    def _write_tmp(tmp_path: str, blob: bytes):
+        """
+        Vaqtinchalik faylni yozish va fsync qilish
+
+        Args:
+            tmp_path: Vaqtinchalik fayl yo'li
+            blob: Fayl tarkibi
+        """
+        with open(tmp_path, 'wb') as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _apply_moves(moves: List[Tuple[str, str]]):
+        """
+        Intent-log dagi .tmp fayllarni asl fayllar o'rniga qo'yish
+
+        Args:
+            moves: (vaqtinchalik fayl, asl fayl) juftliklari
+        """
+        for tmp_path, filepath in moves:
+            if os.path.exists(tmp_path):
+                os.replace(tmp_path, filepath)
+
+    def _recover_transaction(self):
+        """
+        Oldingi ishga tushishda yarim qolgan tranzaksiyani oxiriga yetkazish
+        """
+        if not os.path.exists(config.TXN_FILE):
+            return
+
+        try:
+            with open(config.TXN_FILE, 'rb') as f:
+                moves = json.loads(f.read())['moves']
+        except (ValueError, KeyError) as e:
+            logger.error(f"❌ Tranzaksiya jurnali o'qilmadi ({config.TXN_FILE}): {e}")
+            return
+
+        self._apply_moves(moves)
+        for directory in {os.path.dirname(os.path.abspath(filepath)) for _, filepath in moves}:
+            self._fsync_dir(directory)
+        os.remove(config.TXN_FILE)
+        self._bump_generation()
+        logger.warning(f"⚠️ Yarim qolgan tranzaksiya tiklandi: {', '.join(f for _, f in moves)}")
+
+    @staticmethod
+    def _fsync_dir(directory: str):
+        """
+        Papkani fsync qilish (Windows'da qo'llab-quvvatlanmaydi)
+
+        Args:
+            directory: Papka yo'li
+        """
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    # ==================== INDEXES ====================
+
+    def _next_id(self, collection: str) -> int:
+        """
+        Kolleksiya uchun yangi ID berish (O(1), ID'lar qayta ishlatilmaydi)
+
+        Oxirgi berilgan ID meta.json da saqlanadi, shuning uchun o'chirilgan
+        yozuvning ID'si keyingi yozuvga berilmaydi (eski buyurtmalar boshqa
+        tovarga ishora qilib qolmaydi).
+
+        Args:
+            collection: Kolleksiya nomi ('products' yoki 'orders')
+
+        Returns:
+            int: Yangi ID
+        """
+        meta, ids = self._reserve_ids(collection, 1)
+        self._write_json(config.META_FILE, meta)
+        return ids[0]
+
+    def _reserve_ids(self, collection: str, count: int) -> Tuple[Dict, List[int]]:
+        """
+        Bir nechta yangi ID ajratish (meta.json yozilmaydi)
+
+        Chaqiruvchi qaytarilgan meta'ni o'z kolleksiyasi bilan birga
+        bitta _write_many da yozadi.
+
+        Args:
+            collection: Kolleksiya nomi ('products' yoki 'orders')
+            count: Nechta ID kerak
+
+        Returns:
+            Tuple[Dict, List[int]]: (yangilangan meta, yangi ID'lar)
+        """
+        by_id = self._products_by_id if collection == 'products' else self._orders_by_id
+        meta = self._read_json(config.META_FILE)
+        if not isinstance(meta, dict):
+            meta = {}
+        sequences = meta.setdefault('sequences', {})
+
+        last_id = sequences.get(collection)
+        if collection not in self._sequences_checked:
+            # Jarayon ichida bir marta: hisoblagich mavjud ID'lardan orqada
+            # qolmaganini tekshirish (eski bazadan o'tish yoki meta.json yo'qolgan)
+            max_id = max(by_id, default=0)
+            if collection == 'orders':
+                # Eski segmentlar xotirada bo'lmasligi, eng oxirgilari esa arxivda bo'lishi mumkin
+                max_id = max(max_id, self._manifest.max_id(), self._archive_manifest.max_id())
+            if last_id is None or last_id < max_id:
+                logger.info(f"✅ ID hisoblagichi tiklandi: {collection} -> {max_id}")
+                last_id = max_id
+            self._sequences_checked.add(collection)
+
+        ids = []
+        new_id = last_id
+        for _ in range(count):
+            new_id += 1
+            # meta.json yozilmay qolgan bo'lsa (masalan, to'satdan to'xtash), band ID'lar o'tkazib yuboriladi
+            while new_id in by_id:
+                new_id += 1
+            ids.append(new_id)
+
+        sequences[collection] = new_id
+        return meta, ids
+
+    def _index_products(self, products: List[Product]):
+        """Tovarlar indekslarini noldan qurish"""
+        self._products_by_id = {p.id: p for p in products}
+        self._product_ids = sorted(self._products_by_id)
+        self._category_products = {}
+        for product_id in self._product_ids:
+            self._category_products.setdefault(self._products_by_id[product_id].category, []).append(product_id)
+        self._available_pool = IdPool(p.id for p in products if p.is_available)
+
+    def _index_orders(self, orders: List[Order]):
+        """Buyurtmalar indekslarini noldan qurish"""
+        self._orders_by_id = {o.id: o for o in orders}
+        self._user_orders = {}
+        self._order_sequence = []
+        self._order_rank = {}
+        self._status_ranks = {}
+        for rank, o in enumerate(sorted(orders, key=lambda x: (x.created_at or '', x.id or 0))):
+            self._user_orders.setdefault(o.user_id, []).append(o.id)
+            self._order_sequence.append(o.id)
+            self._order_rank[o.id] = rank
+            self._status_ranks.setdefault(o.status, []).append(rank)
+
+    def _index_new_order(self, order: Order):
+        """Yangi (eng oxirgi) buyurtmani indekslarga qo'shish - O(1)"""
+        rank = len(self._order_sequence)
+        self._orders_by_id[order.id] = order
+        self._user_orders.setdefault(order.user_id, []).append(order.id)
+        self._order_sequence.append(order.id)
+        self._order_rank[order.id] = rank
+        self._status_ranks.setdefault(order.status, []).append(rank)
+
+    def _reindex_status(self, order_id: int, old_status: str, new_status: str):
+        """Buyurtmani status indeksida boshqa statusga ko'chirish (O(log n))"""
+        rank = self._order_rank[order_id]
+        ranks = self._status_ranks.get(old_status, [])
+        position = bisect.bisect_left(ranks, rank)
+        if position < len(ranks) and ranks[position] == rank:
+            del ranks[position]
+        bisect.insort(self._status_ranks.setdefault(new_status, []), rank)
+
+    def _unindex_product_id(self, product_id: int):
+        """Tovarni ID indeksidan olib tashlash (O(log n) qidiruv)"""
+        ids = self._product_ids
+        position = bisect.bisect_left(ids, product_id)
+        if position < len(ids) and ids[position] == product_id:
+            del ids[position]
+
+    def _unindex_product_category(self, product: Dict):
+        """Tovarni kategoriya indeksidan olib tashlash (O(log n) qidiruv)"""
+        ids = self._category_products.get(product.get('category'))
+        if not ids:
+            return
+        position = bisect.bisect_left(ids, product.get('id'))
+        if position < len(ids) and ids[position] == product.get('id'):
+            del ids[position]
+            if not ids:
+                del self._category_products[product.get('category')]
+
+    def _index_users(self, users: List[User]):
+        """Foydalanuvchilar indekslarini noldan qurish"""
+        self._users_by_id = {u.user_id: u for u in users}
+
+    # ==================== ORDER SEGMENTS ====================
+
+    def _migrate_orders_file(self):
+        """
+        Eski yagona orders.json ni oylik segmentlarga bo'lish (bir marta)
+        """
+        if os.path.exists(config.ORDERS_MANIFEST_FILE) or not os.path.exists(config.ORDERS_FILE):
+            return
+
+        orders = self._load_json(config.ORDERS_FILE)
+        manifest = OrderManifest()
+        files = {}
+        for month, month_orders in split_by_month(orders).items():
+            manifest.update(month, month_orders)
+            files[segment_path(month)] = month_orders
+        files[config.ORDERS_MANIFEST_FILE] = manifest.to_dict()
+
+        if not self._commit_files(files):
+            raise RuntimeError(f"Buyurtmalarni segmentlarga bo'lib bo'lmadi: {config.ORDERS_FILE}")
+
+        os.replace(config.ORDERS_FILE, f"{config.ORDERS_FILE}.migrated")
+        logger.info(f"✅ orders.json {len(files) - 1} ta oylik segmentga bo'lindi ({len(orders)} ta buyurtma)")
+
+    def _load_segment_file(self, month: str) -> List[Dict]:
+        """
+        Bitta segment faylini o'qish
+
+        Args:
+            month: 'YYYY-MM'
+
+        Returns:
+            List[Dict]: Segmentdagi buyurtmalar
+        """
+        self._loaded_segments.add(month)
+        if month not in self._manifest.segments:
+            return []
+        return Order.from_dicts(self._load_json(segment_path(month)))
+
+    def _load_orders(self) -> List[Dict]:
+        """
+        Buyurtmalarni yuklash: manifest, oxirgi (hot) segmentlar va jurnal
+
+        Eski segmentlar bu yerda o'qilmaydi - ular kerak bo'lganda
+        _load_segments orqali yuklanadi.
+
+        Returns:
+            List[Dict]: Xotiradagi buyurtmalar
+        """
+        manifest = self._load_json(config.ORDERS_MANIFEST_FILE)
+        self._manifest = OrderManifest(manifest)
+        self._archive_manifest = OrderManifest(manifest, section='archive')
+        self._loaded_segments = set()
+        self._dirty_segments = set()
+        self._archived = {}
+        self._archive_loaded = set()
+        self._columns = None
+
+        orders = []
+        for month in hot_months():
+            orders.extend(self._load_segment_file(month))
+
+        if self._journal:
+            def resolve(ref: Dict) -> List[Dict]:
+                # Jurnaldagi buyurtma yuklanmagan eski segmentda bo'lsa, avval
+                # o'sha segment to'liq yuklanadi (keyin jurnal uning ustiga qo'llanadi)
+                month = self._manifest.month_for_id(ref.get('id'))
+                if month is None and ref.get('created_at'):
+                    month = order_month(ref)
+                if month is None or month in self._loaded_segments or month not in self._manifest.segments:
+                    return []
+                return self._load_segment_file(month)
+
+            orders = self._journal.replay(orders, resolve=resolve)
+            if self._journal.entries:
+                # Jurnaldagi o'zgarishlar keyingi compactionda segmentlarga yoziladi
+                self._dirty_segments = {order_month(o) for o in orders}
+                self._loaded_segments |= self._dirty_segments
+
+        self._count_orders(orders)
+        return orders
+
+    def _count_orders(self, orders: List[Order]):
+        """
+        Statuslar bo'yicha hisoblagichlarni noldan qurish
+
+        Yuklangan buyurtmalar sanaladi, yuklanmagan segmentlar va arxiv
+        uchun esa manifestdagi sonlar qo'shiladi.
+
+        Args:
+            orders: Xotiradagi buyurtmalar
+        """
+        counts: Dict[str, int] = {}
+        for order in orders:
+            counts[order.status] = counts.get(order.status, 0) + 1
+
+        for manifest, months in ((self._manifest, self._unloaded_segments()),
+                                 (self._archive_manifest, self._archive_manifest.months())):
+            for month in months:
+                for status, count in manifest.segments[month].get('statuses', {}).items():
+                    counts[status] = counts.get(status, 0) + count
+
+        self._order_counts = counts
+
+    def _count_status_change(self, old_status: str, new_status: str):
+        """Status hisoblagichlarini bitta buyurtma uchun yangilash"""
+        self._order_counts[old_status] = self._order_counts.get(old_status, 0) - 1
+        self._order_counts[new_status] = self._order_counts.get(new_status, 0) + 1
+
+    def _load_segments(self, months: List[str]):
+        """
+        Eski segmentlarni xotiraga yuklash (faqat hali yuklanmaganlarini)
+
+        Args:
+            months: Kerakli segmentlar
+        """
+        months = [month for month in months if month not in self._loaded_segments]
+        if not months:
+            return
+
+        orders = self._cache[config.ORDERS_FILE]
+        for month in sorted(months):
+            orders.extend(self._load_segment_file(month))
+        self._index_orders(orders)
+        logger.info(f"✅ Eski buyurtma segmentlari yuklandi: {', '.join(sorted(months))}")
+
+    def _unloaded_segments(self) -> List[str]:
+        """Manifestda bor, lekin xotiraga yuklanmagan segmentlar"""
+        return [month for month in self._manifest.months() if month not in self._loaded_segments]
+
+    def _segment_files(self, months: set) -> Dict[str, Any]:
+        """
+        Berilgan segmentlar va yangilangan manifest (diskka yozish uchun)
+
+        Args:
+            months: Yoziladigan segmentlar (xotiraga yuklangan bo'lishi kerak)
+
+        Returns:
+            Dict[str, Any]: Fayl yo'li -> ma'lumotlar
+        """
+        by_month = split_by_month(
+            o for o in self._cache[config.ORDERS_FILE] if order_month(o) in months
+        )
+        files = {}
+        for month in months:
+            month_orders = by_month.get(month, [])
+            self._manifest.update(month, month_orders)
+            files[segment_path(month)] = month_orders
+        files[config.ORDERS_MANIFEST_FILE] = self._manifest_data()
+        return files
+
+    def _manifest_data(self) -> Dict:
+        """Manifest fayli tarkibi (segmentlar va arxiv bo'limlari)"""
+        return {**self._manifest.to_dict(), **self._archive_manifest.to_dict()}
+
+    def _mark_segments_dirty(self, orders: List[Order]):
+        """
+        Buyurtmalar segmentlarini o'zgargan deb belgilash va (jurnal o'chiq bo'lsa) yozish
+
+        Args:
+            orders: Yangi yoki o'zgargan buyurtmalar
+        """
+        months = {order_month(order) for order in orders}
+        self._loaded_segments |= months
+        self._dirty_segments |= months
+
+        if not self._journal:
+            months, self._dirty_segments = self._dirty_segments, set()
+            self._write_many(self._segment_files(months))
+
+    def _segment_blobs(self, extra: Dict[str, Any] = None) -> Tuple[set, Dict[str, bytes]]:
+        """
+        O'zgargan segmentlar va manifestni baytlarga aylantirish (qulf ostida)
+
+        Args:
+            extra: Qo'shimcha yoziladigan fayllar (masalan, arxiv segmentlari)
+
+        Returns:
+            Tuple[set, Dict[str, bytes]]: Yoziladigan segmentlar va fayl yo'li -> baytlar
+        """
+        months, self._dirty_segments = self._dirty_segments, set()
+        files = self._segment_files(months)
+        files.update(extra or {})
+        return months, {filepath: self._dump(data, filepath) for filepath, data in files.items()}
+
+    def _commit_segments(self, months: set, blobs: Dict[str, bytes]) -> bool:
+        """
+        Segmentlarni atomik yozish va jurnalni tozalash (_io_lock ostida)
+
+        Args:
+            months: Yozilayotgan segmentlar (xatolikda yana o'zgargan deb belgilanadi)
+            blobs: Fayl yo'li -> baytlar
+
+        Returns:
+            bool: Muvaffaqiyatli yozilgan bo'lsa True
+        """
+        if not self._write_files(blobs):
+            with self._lock:
+                self._dirty_segments |= months
+            return False
+
+        if self._journal:
+            self._journal.truncate()
+        self._stamps[config.ORDERS_FILE] = self._collection_stamp(config.ORDERS_FILE)
+        self._bump_generation()
+        return True
+
+    # ==================== ORDER ARCHIVE ====================
+
+    def _load_archive(self, months: List[str]):
         """
-        Initsializatsiya - data papkasini va fayllarni yaratish
+        Arxiv segmentlarini o'qish (faqat hali o'qilmaganlarini)
+
+        Args:
+            months: Kerakli arxiv segmentlari
         """
-        # Data papkasini yaratish
-        if not os.path.exists(config.DATA_DIR):
-            os.makedirs(config.DATA_DIR)
-            logger.info(f"✅ Data papka yaratildi: {config.DATA_DIR}")
+        months = [month for month in months if month not in self._archive_loaded]
+        if not months:
+            return
+
+        for month in sorted(months):
+            self._archive_loaded.add(month)
+            if month not in self._archive_manifest.segments:
+                continue
+            for order in Order.from_dicts(self._load_json(archive_path(month))):
+                self._archived[order.get('id')] = order
+        logger.info(f"✅ Arxiv segmentlari o'qildi: {', '.join(sorted(months))}")
+
+    def _archived_orders(self, months: List[str], predicate: Callable[[Dict], bool]) -> List[Dict]:
+        """
+        Arxivdagi buyurtmalarni filtrlash (kerakli segmentlarni o'qib)
 
-        # Fayllarni initsializatsiya qilish
-        self._init_file(config.PRODUCTS_FILE, [])
-        self._init_file(config.ORDERS_FILE, [])
-        self._init_file(config.USERS_FILE, [])
-        self._init_file(config.CATEGORIES_FILE, [
-            "👕 Kiyimlar",
-            "👟 Poyabzal",
-            "🎒 Sumkalar",
-            "⌚ Aksessuarlar",
-            "📱 Elektronika",
-            "🏠 Uy-ro'zg'or"
-        ])
+        Args:
+            months: Ko'rib chiqiladigan arxiv segmentlari
+            predicate: Buyurtma tanlanadimi
+
+        Returns:
+            List[Dict]: Tanlangan buyurtmalar (jonli ro'yxatda yo'qlari)
+        """
+        if not months:
+            return []
+        self._load_archive(months)
+        months = set(months)
+        return [
+            o for o in self._archived.values()
+            if order_month(o) in months and o.get('id') not in self._orders_by_id and predicate(o)
+        ]
+
+    def _order_columns(self) -> OrderColumns:
+        """
+        Barcha buyurtmalarning ustunli nusxasi (kerak bo'lsa qurib)
 
-        logger.info("✅ JSON Database initsializatsiya qilindi")
+        Ustunlarga faqat xotiradagi buyurtmalar tushadi. Yuklanmagan
+        segmentlar va arxiv fayllarining yig'indilari manifestdan olinadi -
+        qayta qurish (masalan, boshqa jarayon yozganidan keyin) hech bir
+        faylni o'qimaydi. Yig'indisi yo'q eski manifest segmentlari bir
+        marta o'qiladi va manifestga yig'indisi qo'shiladi.
 
-    def _init_file(self, filepath: str, default_data: Any):
+        Returns:
+            OrderColumns: Ustunlar
         """
-        Agar fayl bo'lmasa, default ma'lumotlar bilan yaratish
+        if self._columns is None:
+            columns = OrderColumns()
+            columns.extend(self._cache[config.ORDERS_FILE])
+            cold = [(self._manifest, month, segment_path) for month in self._unloaded_segments()]
+            cold += [(self._archive_manifest, month, archive_path) for month in self._archive_manifest.months()]
+            for manifest, month, path in cold:
+                if manifest is self._archive_manifest and month in self._archive_loaded:
+                    columns.extend(o for o in self._archived.values() if order_month(o) == month)
+                elif not columns.merge(manifest.segments[month]):
+                    orders = self._load_json(path(month))
+                    manifest.update(month, orders)
+                    columns.merge(manifest.segments[month])
+            self._columns = columns
+            logger.info(f"✅ Buyurtmalar ustunlari qurildi: {len(columns)} ta buyurtma xotirada")
+        return self._columns
+
+    def _take_archivable(self, cutoff: str) -> List[Dict]:
+        """
+        Arxivlanadigan buyurtmalarni jonli ro'yxatdan ajratib olish
 
         Args:
-            filepath: Fayl yo'li
-            default_data: Default ma'lumotlar
+            cutoff: Shu vaqtdan oldin yaratilgan yopilgan buyurtmalar ('%Y-%m-%d %H:%M:%S')
+
+        Returns:
+            List[Dict]: Ajratilgan buyurtmalar (ularning segmentlari o'zgargan deb belgilanadi)
         """
-        if not os.path.exists(filepath):
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(default_data, f, ensure_ascii=False, indent=2)
-            logger.info(f"✅ Fayl yaratildi: {filepath}")
+        closed = set(config.ORDERS_ARCHIVE_STATUSES)
+        # Eski segmentlardan faqat yopilgan buyurtmasi borlari yuklanadi
+        self._load_segments([
+            month for month in self._manifest.months()
+            if month <= cutoff[:7] and any(
+                self._manifest.segments[month].get('statuses', {}).get(status) for status in closed)
+        ])
 
-    def _read_json(self, filepath: str) -> Any:
+        orders = self._cache[config.ORDERS_FILE]
+        archived = [
+            o for o in orders
+            if o.get('status') in closed and o.get('created_at') and o['created_at'] < cutoff
+        ]
+        if archived:
+            ids = {o.get('id') for o in archived}
+            orders[:] = [o for o in orders if o.get('id') not in ids]
+            self._index_orders(orders)
+            self._dirty_segments.update(order_month(o) for o in archived)
+        return archived
+
+    def _archive_files(self, archived: List[Dict]) -> Dict[str, Any]:
         """
-        JSON fayldan o'qish
+        Buyurtmalarni arxiv segmentlariga qo'shish
 
         Args:
-            filepath: Fayl yo'li
+            archived: Arxivga ko'chiriladigan buyurtmalar
 
         Returns:
-            Any: O'qilgan ma'lumotlar
+            Dict[str, Any]: Arxiv fayli yo'li -> segmentning barcha buyurtmalari
         """
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.error(f"❌ Faylni o'qishda xatolik ({filepath}): {e}")
-            # Default qiymat qaytarish
-            if filepath == config.CATEGORIES_FILE:
-                return []
-            return []
-
-    def _write_json(self, filepath: str, data: Any):
+        by_month = split_by_month(archived)
+        self._load_archive(list(by_month))
+
+        files = {}
+        for month, month_orders in by_month.items():
+            for order in month_orders:
+                self._archived[order.get('id')] = order
+            segment = sorted(
+                (o for o in self._archived.values() if order_month(o) == month),
+                key=lambda o: o.get('id', 0)
+            )
+            self._archive_manifest.update(month, segment)
+            files[archive_path(month)] = segment
+        return files
+
+    def _restore_archived(self, restored: List[Order]):
         """
-        JSON faylga yozish
+        Arxivdagi buyurtmalarni jonli segmentga qaytarish (masalan, statusi o'zgarganda)
+
+        Jonli segmentlar, arxiv segmentlari va manifest bitta atomik yozuvda
+        yangilanadi - buyurtma hech qachon ikkala joyda ham yoki hech
+        qayerda bo'lmay qolmaydi.
 
         Args:
-            filepath: Fayl yo'li
-            data: Yoziladigan ma'lumotlar
+            restored: Arxivdagi buyurtmalar
         """
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"❌ Faylga yozishda xatolik ({filepath}): {e}")
+        months = {order_month(order) for order in restored}
+        self._load_segments(sorted(months))
+
+        for order in restored:
+            self._archived.pop(order.get('id'), None)
+
+        orders = self._cache[config.ORDERS_FILE]
+        orders.extend(restored)
+        self._index_orders(orders)
+
+        files = self._segment_files(months)
+        for month in months:
+            remaining = sorted(
+                (o for o in self._archived.values() if order_month(o) == month),
+                key=lambda o: o.get('id', 0)
+            )
+            self._archive_manifest.update(month, remaining)
+            files[archive_path(month)] = remaining
+        self._write_many(files)
 
     # ==================== CATEGORIES ====================
 
+    @synchronized
     def get_categories(self) -> List[str]:
         """
         Barcha kategoriyalarni olish
@@ -100,8 +1388,9 @@ class JSONDatabase:
         Returns:
             List[str]: Kategoriyalar ro'yxati
         """
-        return self._read_json(config.CATEGORIES_FILE)
+        return list(self._read_json(config.CATEGORIES_FILE))
 
+    @exclusive
     def add_category(self, category: str) -> bool:
         """
         Yangi kategoriya qo'shish
@@ -112,7 +1401,7 @@ class JSONDatabase:
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        categories = self.get_categories()
+        categories = self._read_json(config.CATEGORIES_FILE)
 
         # Dublikatni tekshirish
         if category in categories:
@@ -121,9 +1410,11 @@ class JSONDatabase:
 
         categories.append(category)
         self._write_json(config.CATEGORIES_FILE, categories)
+        self.events.publish(events.CATEGORY_ADDED, category=category)
         logger.info(f"✅ Kategoriya qo'shildi: {category}")
         return True
 
+    @exclusive
     def delete_category(self, category: str) -> bool:
         """
         Kategoriyani o'chirish (va unga tegishli barcha tovarlarni)
@@ -134,24 +1425,26 @@ class JSONDatabase:
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        categories = self.get_categories()
-
-        if category not in categories:
-            logger.warning(f"⚠️ Kategoriya topilmadi: {category}")
-            return False
-
-        # Kategoriyani o'chirish
-        categories.remove(category)
-        self._write_json(config.CATEGORIES_FILE, categories)
-
-        # Bu kategoriyaga tegishli tovarlarni ham o'chirish
-        products = self.get_all_products()
-        products = [p for p in products if p['category'] != category]
-        self._write_json(config.PRODUCTS_FILE, products)
-
+        with self.transaction() as txn:
+            categories = txn.read(config.CATEGORIES_FILE)
+
+            if category not in categories:
+                logger.warning(f"⚠️ Kategoriya topilmadi: {category}")
+                return False
+
+            # Kategoriyani va unga tegishli tovarlarni bitta tranzaksiyada o'chirish
+            categories.remove(category)
+            all_products = txn.read(config.PRODUCTS_FILE)
+            products = [p for p in all_products if p['category'] != category]
+            product_ids = [p['id'] for p in all_products if p['category'] == category]
+            txn.write(config.CATEGORIES_FILE, categories)
+            txn.write(config.PRODUCTS_FILE, products)
+
+        self.events.publish(events.CATEGORY_DELETED, category=category, product_ids=product_ids)
         logger.info(f"✅ Kategoriya o'chirildi: {category}")
         return True
 
+    @exclusive
     def update_category(self, old_name: str, new_name: str) -> bool:
         """
         Kategoriya nomini o'zgartirish
@@ -163,29 +1456,34 @@ class JSONDatabase:
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        categories = self.get_categories()
-
-        if old_name not in categories:
-            logger.warning(f"⚠️ Kategoriya topilmadi: {old_name}")
-            return False
-
-        # Kategoriya nomini o'zgartirish
-        idx = categories.index(old_name)
-        categories[idx] = new_name
-        self._write_json(config.CATEGORIES_FILE, categories)
-
-        # Tovarlarni ham yangilash
-        products = self.get_all_products()
-        for product in products:
-            if product['category'] == old_name:
-                product['category'] = new_name
-        self._write_json(config.PRODUCTS_FILE, products)
-
+        with self.transaction() as txn:
+            categories = txn.read(config.CATEGORIES_FILE)
+
+            if old_name not in categories:
+                logger.warning(f"⚠️ Kategoriya topilmadi: {old_name}")
+                return False
+
+            # Mavjud kategoriya nomiga o'zgartirish ikkita kategoriyani qo'shib yuboradi
+            if new_name != old_name and new_name in categories:
+                logger.warning(f"⚠️ Kategoriya allaqachon mavjud: {new_name}")
+                return False
+
+            # Kategoriya nomini va tovarlarni bitta tranzaksiyada o'zgartirish
+            categories[categories.index(old_name)] = new_name
+            products = txn.read(config.PRODUCTS_FILE)
+            for product in products:
+                if product['category'] == old_name:
+                    product['category'] = new_name
+            txn.write(config.CATEGORIES_FILE, categories)
+            txn.write(config.PRODUCTS_FILE, products)
+
+        self.events.publish(events.CATEGORY_RENAMED, old_name=old_name, new_name=new_name)
         logger.info(f"✅ Kategoriya o'zgartirildi: {old_name} -> {new_name}")
         return True
 
     # ==================== PRODUCTS ====================
 
+    @exclusive
     def add_product(self, category: str, name: str, description: str,
                     price: float, size: str = None, photo_id: str = None) -> Dict:
         """
@@ -205,26 +1503,33 @@ class JSONDatabase:
         products = self._read_json(config.PRODUCTS_FILE)
 
         # Yangi ID yaratish
-        new_id = max([p.get('id', 0) for p in products], default=0) + 1
-
-        product = {
-            'id': new_id,
-            'category': category,
-            'name': name,
-            'description': description,
-            'price': float(price),
-            'size': size,
-            'photo_id': photo_id,
-            'is_available': True,
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        new_id = self._next_id('products')
+
+        product = Product(
+            id=new_id,
+            category=category,
+            name=name,
+            description=description,
+            price=float(price),
+            size=size,
+            photo_id=photo_id,
+            is_available=True,
+            created_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
 
         products.append(product)
+        self._products_by_id[new_id] = product
+        bisect.insort(self._product_ids, new_id)
+        self._category_products.setdefault(category, []).append(new_id)
+        self._available_pool.add(new_id)
+        self._deck_add(new_id)
         self._write_json(config.PRODUCTS_FILE, products)
+        self.events.publish(events.PRODUCT_ADDED, product_id=new_id, product=product)
 
         logger.info(f"✅ Tovar qo'shildi: {name} (ID: {new_id})")
         return product
 
+    @synchronized
     def get_product(self, product_id: int) -> Optional[Dict]:
         """
         Tovarni ID bo'yicha olish
@@ -235,12 +1540,29 @@ class JSONDatabase:
         Returns:
             Optional[Dict]: Tovar yoki None
         """
-        products = self._read_json(config.PRODUCTS_FILE)
-        for product in products:
-            if product.get('id') == product_id:
-                return product
-        return None
+        self._read_json(config.PRODUCTS_FILE)
+        return self._products_by_id.get(product_id)
+
+    @synchronized
+    def get_products(self, product_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Bir nechta tovarni bitta o'tishda olish
 
+        Args:
+            product_ids: Tovar ID'lari
+
+        Returns:
+            Dict[int, Dict]: Tovar ID -> tovar (topilmaganlari kalitlarda bo'lmaydi)
+        """
+        self._read_json(config.PRODUCTS_FILE)
+        products = {}
+        for product_id in product_ids:
+            product = self._products_by_id.get(product_id)
+            if product is not None:
+                products[product_id] = product
+        return products
+
+    @synchronized
     def get_products_by_category(self, category: str) -> List[Dict]:
         """
         Kategoriya bo'yicha mavjud tovarlarni olish
@@ -251,12 +1573,11 @@ class JSONDatabase:
         Returns:
             List[Dict]: Tovarlar ro'yxati
         """
-        products = self._read_json(config.PRODUCTS_FILE)
-        return [
-            p for p in products
-            if p.get('category') == category and p.get('is_available', True)
-        ]
+        self._read_json(config.PRODUCTS_FILE)
+        products = (self._products_by_id[i] for i in self._category_products.get(category, []))
+        return [p for p in products if p.is_available]
 
+    @synchronized
     def get_all_products(self) -> List[Dict]:
         """
         Barcha tovarlarni olish (mavjud va mavjud bo'lmaganlarni)
@@ -264,8 +1585,9 @@ class JSONDatabase:
         Returns:
             List[Dict]: Tovarlar ro'yxati
         """
-        return self._read_json(config.PRODUCTS_FILE)
+        return list(self._read_json(config.PRODUCTS_FILE))
 
+    @synchronized
     def get_available_products(self) -> List[Dict]:
         """
         Faqat mavjud tovarlarni olish
@@ -274,29 +1596,92 @@ class JSONDatabase:
             List[Dict]: Mavjud tovarlar ro'yxati
         """
         products = self._read_json(config.PRODUCTS_FILE)
-        return [p for p in products if p.get('is_available', True)]
+        return [p for p in products if p.is_available]
+
+    @synchronized
+    def get_products_page(self, offset: int = 0, limit: int = 10) -> Tuple[List[Dict], int]:
+        """
+        Tovarlar sahifasi (ID bo'yicha, SQLite dagi ORDER BY id bilan bir xil)
+
+        Sahifa tartiblangan ID indeksidan kesib olinadi - filtrlash va
+        saralash yo'q, faqat sahifadagi limit ta tovar olinadi.
+
+        Args:
+            offset: Nechta tovar o'tkazib yuboriladi
+            limit: Sahifadagi tovarlar soni
 
+        Returns:
+            Tuple[List[Dict], int]: (sahifadagi tovarlar, jami tovarlar soni)
+        """
+        self._read_json(config.PRODUCTS_FILE)
+        ids = self._product_ids
+        return [self._products_by_id[i] for i in ids[offset:offset + limit]], len(ids)
+
+    @exclusive
     def get_random_products(self, count: int = 3) -> List[Dict]:
         """
         Random tovarlarni olish (avtomatik post uchun)
 
+        Mavjud tovarlar ID to'plamidan O(k) da tanlanadi. AUTO_POST_DECK_MODE
+        yoqilgan bo'lsa, tovarlar takrorlanmaydigan koloda tartibida olinadi.
+
         Args:
             count: Tovarlar soni
 
         Returns:
             List[Dict]: Random tovarlar
         """
-        products = self.get_available_products()
+        self._read_json(config.PRODUCTS_FILE)
 
-        if len(products) == 0:
+        if config.AUTO_POST_DECK_MODE:
+            ids = self._deck_draw(count)
+        else:
+            ids = self._available_pool.sample(count)
+
+        if not ids:
             logger.warning("⚠️ Mavjud tovarlar yo'q")
             return []
 
-        if len(products) <= count:
-            return products
+        return [self._products_by_id[i] for i in ids]
+
+    def _update_available_pool(self, product: Product):
+        """Tovar mavjudligi o'zgarganda ID to'plamini yangilash"""
+        if product.is_available:
+            self._available_pool.add(product.id)
+        else:
+            self._available_pool.discard(product.id)
+
+    def _deck(self) -> Tuple[Dict, ProductDeck]:
+        """meta.json va undagi koloda holati"""
+        meta = self._read_json(config.META_FILE)
+        if not isinstance(meta, dict):
+            meta = {}
+        return meta, ProductDeck(meta.setdefault('deck', {}))
+
+    def _deck_draw(self, count: int) -> List[int]:
+        """
+        Kolodadan navbatdagi tovarlarni olish (holat meta.json da saqlanadi)
 
-        return random.sample(products, count)
+        Args:
+            count: Nechta kerak
 
+        Returns:
+            List[int]: Tovar ID'lari
+        """
+        meta, deck = self._deck()
+        ids = deck.draw(count, self._available_pool.__contains__, self._available_pool.ids)
+        self._write_json(config.META_FILE, meta)
+        return ids
+
+    def _deck_add(self, product_id: int):
+        """Yangi tovarni joriy aylanishga qo'shish (koloda rejimida)"""
+        if not config.AUTO_POST_DECK_MODE:
+            return
+        meta, deck = self._deck()
+        deck.add(product_id)
+        self._write_json(config.META_FILE, meta)
+
+    @exclusive
     def update_product(self, product_id: int, **kwargs) -> bool:
         """
         Tovarni yangilash
@@ -309,17 +1694,23 @@ class JSONDatabase:
             bool: Muvaffaqiyatli bo'lsa True
         """
         products = self._read_json(config.PRODUCTS_FILE)
-
-        for product in products:
-            if product.get('id') == product_id:
-                product.update(kwargs)
-                self._write_json(config.PRODUCTS_FILE, products)
-                logger.info(f"✅ Tovar yangilandi: ID {product_id}")
-                return True
+        product = self._products_by_id.get(product_id)
+
+        if product:
+            if 'category' in kwargs and kwargs['category'] != product.get('category'):
+                self._unindex_product_category(product)
+                bisect.insort(self._category_products.setdefault(kwargs['category'], []), product_id)
+            product.update(kwargs)
+            self._update_available_pool(product)
+            self._write_json(config.PRODUCTS_FILE, products)
+            self.events.publish(events.PRODUCT_UPDATED, product_id=product_id, product=product, fields=dict(kwargs))
+            logger.info(f"✅ Tovar yangilandi: ID {product_id}")
+            return True
 
         logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
         return False
 
+    @exclusive
     def delete_product(self, product_id: int) -> bool:
         """
         Tovarni o'chirish
@@ -331,18 +1722,22 @@ class JSONDatabase:
             bool: Muvaffaqiyatli bo'lsa True
         """
         products = self._read_json(config.PRODUCTS_FILE)
-        original_length = len(products)
-
-        products = [p for p in products if p.get('id') != product_id]
+        product = self._products_by_id.pop(product_id, None)
 
-        if len(products) < original_length:
+        if product:
+            self._unindex_product_id(product_id)
+            self._unindex_product_category(product)
+            self._available_pool.discard(product_id)
+            products.remove(product)
             self._write_json(config.PRODUCTS_FILE, products)
+            self.events.publish(events.PRODUCT_DELETED, product_id=product_id)
             logger.info(f"✅ Tovar o'chirildi: ID {product_id}")
             return True
 
         logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
         return False
 
+    @exclusive
     def toggle_product_availability(self, product_id: int) -> bool:
         """
         Tovar mavjudligini o'zgartirish
@@ -354,20 +1749,148 @@ class JSONDatabase:
             bool: Muvaffaqiyatli bo'lsa True
         """
         products = self._read_json(config.PRODUCTS_FILE)
+        product = self._products_by_id.get(product_id)
 
-        for product in products:
-            if product.get('id') == product_id:
-                product['is_available'] = not product.get('is_available', True)
-                self._write_json(config.PRODUCTS_FILE, products)
-                status = "Mavjud" if product['is_available'] else "Mavjud emas"
-                logger.info(f"✅ Tovar mavjudligi o'zgartirildi: ID {product_id} -> {status}")
-                return True
+        if product:
+            product.is_available = not product.is_available
+            self._update_available_pool(product)
+            self._write_json(config.PRODUCTS_FILE, products)
+            self.events.publish(events.PRODUCT_UPDATED, product_id=product_id, product=product,
+                                fields={'is_available': product.is_available})
+            status = "Mavjud" if product['is_available'] else "Mavjud emas"
+            logger.info(f"✅ Tovar mavjudligi o'zgartirildi: ID {product_id} -> {status}")
+            return True
 
         logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
         return False
 
+    @exclusive
+    def add_products_bulk(self, items: List[Dict]) -> List[Dict]:
+        """
+        Bir nechta tovarni birga qo'shish (import uchun)
+
+        ID'lar bir martada ajratiladi, tovarlar va meta.json bitta yozuvda
+        saqlanadi.
+
+        Args:
+            items: Tovarlar ma'lumotlari (add_product argumentlari:
+                   category, name, description, price, size, photo_id)
+
+        Returns:
+            List[Dict]: Yaratilgan tovarlar
+        """
+        if not items:
+            return []
+
+        products = self._read_json(config.PRODUCTS_FILE)
+        meta, ids = self._reserve_ids('products', len(items))
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        created = []
+        for new_id, item in zip(ids, items):
+            product = Product(
+                id=new_id,
+                category=item['category'],
+                name=item['name'],
+                description=item.get('description', ''),
+                price=float(item.get('price', 0)),
+                size=item.get('size'),
+                photo_id=item.get('photo_id'),
+                is_available=True,
+                created_at=created_at
+            )
+            created.append(product)
+            self._products_by_id[new_id] = product
+            bisect.insort(self._product_ids, new_id)
+            self._category_products.setdefault(product.category, []).append(new_id)
+            self._available_pool.add(new_id)
+
+        products.extend(created)
+        if config.AUTO_POST_DECK_MODE:
+            # meta - keshdagi obyektning o'zi, koloda ham shu yozuvga tushadi
+            _, deck = self._deck()
+            for new_id in ids:
+                deck.add(new_id)
+
+        self._write_many({config.PRODUCTS_FILE: products, config.META_FILE: meta})
+        for product in created:
+            self.events.publish(events.PRODUCT_ADDED, product_id=product.id, product=product)
+        logger.info(f"✅ {len(created)} ta tovar qo'shildi (ID: {ids[0]}-{ids[-1]})")
+        return created
+
+    @exclusive
+    def update_products_bulk(self, product_ids: List[int], **kwargs) -> int:
+        """
+        Bir nechta tovarning maydonlarini birga yangilash
+
+        Args:
+            product_ids: Tovar ID'lari
+            **kwargs: Yangilanadigan maydonlar (masalan, price=..., is_available=False)
+
+        Returns:
+            int: Yangilangan tovarlar soni
+        """
+        products = self._read_json(config.PRODUCTS_FILE)
+        category = kwargs.get('category')
+
+        updated = []
+        for product_id in dict.fromkeys(product_ids):
+            product = self._products_by_id.get(product_id)
+            if not product:
+                continue
+            if 'category' in kwargs and category != product.category:
+                self._unindex_product_category(product)
+                bisect.insort(self._category_products.setdefault(category, []), product_id)
+            product.update(kwargs)
+            self._update_available_pool(product)
+            updated.append(product)
+
+        if updated:
+            self._write_json(config.PRODUCTS_FILE, products)
+            for product in updated:
+                self.events.publish(events.PRODUCT_UPDATED, product_id=product.id, product=product,
+                                    fields=dict(kwargs))
+            logger.info(f"✅ {len(updated)} ta tovar yangilandi")
+        if len(updated) < len(set(product_ids)):
+            logger.warning(f"⚠️ {len(set(product_ids)) - len(updated)} ta tovar topilmadi")
+        return len(updated)
+
+    @exclusive
+    def delete_products_bulk(self, product_ids: List[int]) -> int:
+        """
+        Bir nechta tovarni birga o'chirish
+
+        Args:
+            product_ids: Tovar ID'lari
+
+        Returns:
+            int: O'chirilgan tovarlar soni
+        """
+        products = self._read_json(config.PRODUCTS_FILE)
+
+        removed = set()
+        for product_id in product_ids:
+            product = self._products_by_id.pop(product_id, None)
+            if product:
+                self._unindex_product_id(product_id)
+                self._unindex_product_category(product)
+                self._available_pool.discard(product_id)
+                removed.add(product_id)
+
+        if removed:
+            # Ro'yxat joyida qisqartiriladi (kesh shu obyektga ishora qiladi)
+            products[:] = [p for p in products if p.id not in removed]
+            self._write_json(config.PRODUCTS_FILE, products)
+            for product_id in removed:
+                self.events.publish(events.PRODUCT_DELETED, product_id=product_id)
+            logger.info(f"✅ {len(removed)} ta tovar o'chirildi")
+        if len(removed) < len(set(product_ids)):
+            logger.warning(f"⚠️ {len(set(product_ids)) - len(removed)} ta tovar topilmadi")
+        return len(removed)
+
     # ==================== ORDERS ====================
 
+    @exclusive
     def create_order(self, user_id: int, username: str, product_id: int,
                      customer_name: str, phone: str, address: str,
                      quantity: int = 1) -> Dict:
@@ -389,31 +1912,45 @@ class JSONDatabase:
         orders = self._read_json(config.ORDERS_FILE)
 
         # Yangi ID yaratish
-        new_id = max([o.get('id', 0) for o in orders], default=0) + 1
+        new_id = self._next_id('orders')
 
         # Buyurtma raqamini generatsiya qilish
         order_number = f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}-{user_id}"
 
-        order = {
-            'id': new_id,
-            'order_number': order_number,
-            'user_id': user_id,
-            'username': username,
-            'product_id': product_id,
-            'customer_name': customer_name,
-            'phone': phone,
-            'address': address,
-            'quantity': quantity,
-            'status': 'yangi',
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        order = Order(
+            id=new_id,
+            order_number=order_number,
+            user_id=user_id,
+            username=username,
+            product_id=product_id,
+            customer_name=customer_name,
+            phone=phone,
+            address=address,
+            quantity=quantity,
+            status='yangi',
+            created_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
+        # Tovarning shu paytdagi nomi va narxi buyurtmaga muhrlanadi
+        self._read_json(config.PRODUCTS_FILE)
+        product = self._products_by_id.get(product_id)
+        if product is not None:
+            order.apply_snapshot(product)
 
         orders.append(order)
-        self._write_json(config.ORDERS_FILE, orders)
+        self._index_new_order(order)
+        self._order_counts['yangi'] = self._order_counts.get('yangi', 0) + 1
+        if self._columns is not None:
+            self._columns.append(order)
+
+        self._mark_segments_dirty([order])
+        if self._journal:
+            self._append_order_journal([{'op': 'create', 'order': order}])
+        self.events.publish(events.ORDER_CREATED, order_id=new_id, order=order)
 
         logger.info(f"✅ Buyurtma yaratildi: {order_number}")
         return order
 
+    @synchronized
     def get_order(self, order_id: int) -> Optional[Dict]:
         """
         Buyurtmani ID bo'yicha olish
@@ -424,12 +1961,96 @@ class JSONDatabase:
         Returns:
             Optional[Dict]: Buyurtma yoki None
         """
-        orders = self._read_json(config.ORDERS_FILE)
-        for order in orders:
-            if order.get('id') == order_id:
-                return order
-        return None
+        self._read_json(config.ORDERS_FILE)
+        order = self._find_order(order_id)
+        if order is not None:
+            self._backfill_snapshots([order])
+        return order
 
+    @synchronized
+    def get_orders(self, order_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Bir nechta buyurtmani bitta o'tishda olish
+
+        Kerakli eski segmentlar va arxiv segmentlari bir martada yuklanadi
+        (har bir buyurtma uchun alohida emas).
+
+        Args:
+            order_ids: Buyurtma ID'lari
+
+        Returns:
+            Dict[int, Dict]: Buyurtma ID -> buyurtma (topilmaganlari kalitlarda bo'lmaydi)
+        """
+        self._read_json(config.ORDERS_FILE)
+        ids = list(dict.fromkeys(order_ids))
+
+        missing = [i for i in ids if i not in self._orders_by_id]
+        if missing:
+            months = {self._manifest.month_for_id(i) for i in missing}
+            self._load_segments(sorted(month for month in months if month is not None))
+            missing = [i for i in missing if i not in self._orders_by_id]
+        if missing:
+            months = {self._archive_manifest.month_for_id(i) for i in missing}
+            self._load_archive(sorted(month for month in months if month is not None))
+
+        orders = {}
+        for order_id in ids:
+            order = self._orders_by_id.get(order_id) or self._archived.get(order_id)
+            if order is not None:
+                orders[order_id] = order
+        self._backfill_snapshots(list(orders.values()))
+        return orders
+
+    def _backfill_snapshots(self, orders: List[Order]):
+        """
+        Tovar nusxasi yo'q eski buyurtmalarni joriy tovardan to'ldirish (lazy migratsiya)
+
+        To'ldirilgan jonli buyurtmalarning segmentlari o'zgargan deb
+        belgilanadi va keyingi compaction'da (jurnal bo'sh bo'lsa ham) diskka
+        tushadi.
+        Arxivdagilar faqat xotirada to'ldiriladi. Tovar o'chirilgan bo'lsa,
+        buyurtma nusxasiz qoladi.
+
+        Args:
+            orders: Ko'rsatiladigan buyurtmalar
+        """
+        missing = [order for order in orders if not order.has_snapshot()]
+        if not missing:
+            return
+
+        self._read_json(config.PRODUCTS_FILE)
+        for order in missing:
+            product = self._products_by_id.get(order.product_id)
+            if product is None:
+                continue
+            order.apply_snapshot(product)
+            if order.id in self._orders_by_id:
+                self._dirty_segments.add(order_month(order))
+
+    def _find_order(self, order_id: int) -> Optional[Dict]:
+        """
+        Buyurtmani topish (kerak bo'lsa eski segmentini yoki arxivini o'qib)
+
+        Args:
+            order_id: Buyurtma ID
+
+        Returns:
+            Optional[Dict]: Buyurtma yoki None
+        """
+        order = self._orders_by_id.get(order_id)
+        if order is None:
+            month = self._manifest.month_for_id(order_id)
+            if month is not None:
+                self._load_segments([month])
+                order = self._orders_by_id.get(order_id)
+        if order is None:
+            month = self._archive_manifest.month_for_id(order_id)
+            if month is not None:
+                self._load_archive([month])
+                order = self._archived.get(order_id)
+        return order
+
+    @synchronized
     def get_user_orders(self, user_id: int) -> List[Dict]:
         """
         Foydalanuvchi buyurtmalarini olish
@@ -440,24 +2061,45 @@ class JSONDatabase:
         Returns:
             List[Dict]: Buyurtmalar ro'yxati
         """
-        orders = self._read_json(config.ORDERS_FILE)
-        user_orders = [o for o in orders if o.get('user_id') == user_id]
+        self._read_json(config.ORDERS_FILE)
+        # Eski segmentlardan faqat shu foydalanuvchi buyurtmasi borlari yuklanadi
+        self._load_segments(self._manifest.months_for_user(user_id))
 
-        # Sana bo'yicha saralash (eng yangi birinchi)
-        return sorted(
-            user_orders,
-            key=lambda x: x.get('created_at', ''),
-            reverse=True
-        )
+        # Indeks yaratilish tartibida - eng yangisi birinchi bo'lishi uchun teskari
+        orders = [self._orders_by_id[i] for i in reversed(self._user_orders.get(user_id, []))]
 
-    def get_all_orders(self) -> List[Dict]:
+        # Arxivdan ham faqat shu foydalanuvchi buyurtmasi bor segmentlar o'qiladi
+        archived = self._archived_orders(
+            self._archive_manifest.months_for_user(user_id),
+            lambda o: o.get('user_id') == user_id
+        )
+        if archived:
+            orders = self._newest_first(orders + archived)
+        self._backfill_snapshots(orders)
+        return orders
+
+    @staticmethod
+    def _newest_first(orders: List[Dict]) -> List[Dict]:
+        """Buyurtmalarni eng yangisi birinchi qilib saralash"""
+        return sorted(orders, key=lambda x: (x.get('created_at', ''), x.get('id', 0)), reverse=True)
+
+    @synchronized
+    def get_all_orders(self, include_archived: bool = True) -> List[Dict]:
         """
         Barcha buyurtmalarni olish
 
+        Args:
+            include_archived: Arxivdagi buyurtmalarni ham qo'shish (arxiv fayllari o'qiladi)
+
         Returns:
             List[Dict]: Buyurtmalar ro'yxati
         """
-        orders = self._read_json(config.ORDERS_FILE)
+        self._read_json(config.ORDERS_FILE)
+        self._load_segments(self._manifest.months())
+        orders = list(self._cache[config.ORDERS_FILE])
+
+        if include_archived:
+            orders += self._archived_orders(self._archive_manifest.months(), lambda o: True)
 
         # Sana bo'yicha saralash
         return sorted(
@@ -466,6 +2108,153 @@ class JSONDatabase:
             reverse=True
         )
 
+    @synchronized
+    def get_orders_by_status(self, status: str) -> List[Dict]:
+        """
+        Berilgan statusdagi buyurtmalarni olish
+
+        Args:
+            status: Buyurtma statusi
+
+        Returns:
+            List[Dict]: Buyurtmalar ro'yxati (eng yangi birinchi)
+        """
+        self._read_json(config.ORDERS_FILE)
+        self._load_segments(self._manifest.months_for_status(status))
+        sequence = self._order_sequence
+        orders = [self._orders_by_id[sequence[rank]] for rank in reversed(self._status_ranks.get(status, []))]
+
+        archived = self._archived_orders(
+            self._archive_manifest.months_for_status(status),
+            lambda o: o.get('status') == status
+        )
+        if archived:
+            orders = self._newest_first(orders + archived)
+        return orders
+
+    @synchronized
+    def count_orders_by_status(self, status: str) -> int:
+        """
+        Berilgan statusdagi buyurtmalar sonini olish
+
+        Args:
+            status: Buyurtma statusi
+
+        Returns:
+            int: Buyurtmalar soni
+        """
+        self._read_json(config.ORDERS_FILE)
+        return self._order_counts.get(status, 0)
+
+    @synchronized
+    def get_orders_count(self) -> int:
+        """
+        Barcha buyurtmalar sonini olish
+
+        Returns:
+            int: Buyurtmalar soni
+        """
+        self._read_json(config.ORDERS_FILE)
+        return sum(self._order_counts.values())
+
+    @synchronized
+    def get_orders_page(self, offset: int = 0, limit: int = 20,
+                        status: str = None) -> Tuple[List[Dict], int]:
+        """
+        Buyurtmalar sahifasi (eng yangi birinchi, arxivsiz)
+
+        Sahifa tayyor tartiblangan indeksdan kesib olinadi - saralash yo'q.
+        Yuklanmagan eski segmentlar faqat sahifa ularga yetib borganda
+        (eng yangisidan boshlab) o'qiladi.
+
+        Args:
+            offset: Nechta buyurtma o'tkazib yuboriladi
+            limit: Sahifadagi buyurtmalar soni
+            status: Faqat shu statusdagilar (ixtiyoriy)
+
+        Returns:
+            Tuple[List[Dict], int]: (sahifadagi buyurtmalar, jami jonli buyurtmalar soni)
+        """
+        self._read_json(config.ORDERS_FILE)
+
+        while True:
+            ranks = self._status_ranks.get(status, []) if status else range(len(self._order_sequence))
+            end = max(len(ranks) - offset, 0)
+            start = max(end - limit, 0)
+            pending = [
+                month for month in self._unloaded_segments()
+                if not status or self._manifest.segments[month].get('statuses', {}).get(status)
+            ]
+            if not pending:
+                break
+            # Sahifa to'la va undagi eng eski buyurtma yuklanmagan segmentlardan
+            # yangiroq bo'lsa, eski segmentlar sahifaga ta'sir qilmaydi
+            if end - start == limit and end:
+                oldest = self._orders_by_id[self._order_sequence[ranks[start]]]
+                if order_month(oldest) > max(pending):
+                    break
+            self._load_segments([max(pending)])
+
+        sequence = self._order_sequence
+        page = [self._orders_by_id[sequence[rank]] for rank in reversed(ranks[start:end])]
+        return page, len(ranks) + self._manifest.count(pending, status)
+
+    @synchronized
+    def count_archived_orders(self, status: str = None) -> int:
+        """
+        Arxivdagi buyurtmalar soni (arxiv fayllarini o'qimasdan, manifestdan)
+
+        Args:
+            status: Faqat shu statusdagilar (ixtiyoriy)
+
+        Returns:
+            int: Buyurtmalar soni
+        """
+        self._read_json(config.ORDERS_FILE)
+        return self._archive_manifest.count(self._archive_manifest.months(), status)
+
+    @synchronized
+    def get_archived_orders_page(self, offset: int = 0, limit: int = 20,
+                                 status: str = None) -> Tuple[List[Dict], int]:
+        """
+        Arxivdagi buyurtmalar sahifasi (eng yangi birinchi)
+
+        Har bir arxiv segmentidagi son manifestda bor, shuning uchun faqat
+        sahifaga tushadigan oylar o'qiladi - undan yangi oylar sanab
+        o'tkaziladi, eskilari esa umuman ochilmaydi.
+
+        Args:
+            offset: Nechta buyurtma o'tkazib yuboriladi
+            limit: Sahifadagi buyurtmalar soni
+            status: Faqat shu statusdagilar (ixtiyoriy)
+
+        Returns:
+            Tuple[List[Dict], int]: (sahifadagi buyurtmalar, jami arxivdagi buyurtmalar soni)
+        """
+        self._read_json(config.ORDERS_FILE)
+        manifest = self._archive_manifest
+        months = sorted(manifest.months_for_status(status) if status else manifest.months(), reverse=True)
+
+        # Sahifa boshlanishidan oldingi oylar (o'qilmaydi) va sahifaga tushadigan oylar
+        skipped = seen = 0
+        needed = []
+        for month in months:
+            if seen >= offset + limit:
+                break
+            count = manifest.count([month], status)
+            if seen + count > offset:
+                needed.append(month)
+            else:
+                skipped += count
+            seen += count
+
+        orders = self._newest_first(self._archived_orders(
+            needed, lambda o: not status or o.get('status') == status
+        ))
+        start = offset - skipped
+        return orders[start:start + limit], manifest.count(months, status)
+
+    @exclusive
     def update_order_status(self, order_id: int, status: str) -> bool:
         """
         Buyurtma statusini yangilash
@@ -477,25 +2266,232 @@ class JSONDatabase:
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        orders = self._read_json(config.ORDERS_FILE)
+        self._read_json(config.ORDERS_FILE)
+        order = self._find_order(order_id)
+
+        if order and order_id not in self._orders_by_id:
+            # Arxivdagi buyurtma yangi statusi bilan jonli segmentga qaytadi
+            old_status = order.status
+            self._count_status_change(old_status, status)
+            order.status = status
+            self._restore_archived([order])
+            if self._columns is not None:
+                self._columns.set_status(order, old_status)
+            self.events.publish(events.ORDER_STATUS_CHANGED, order_id=order_id, order=order,
+                                old_status=old_status, status=status)
+            logger.info(f"✅ Arxivdagi buyurtma statusi o'zgartirildi: {order.get('order_number')} -> {status}")
+            return True
 
-        for order in orders:
-            if order.get('id') == order_id:
-                order['status'] = status
-                self._write_json(config.ORDERS_FILE, orders)
-                logger.info(f"✅ Buyurtma statusi o'zgartirildi: {order.get('order_number')} -> {status}")
-                return True
+        if order:
+            old_status = order.get('status')
+            self._reindex_status(order_id, old_status, status)
+            self._count_status_change(old_status, status)
+            order.status = status
+            if self._columns is not None:
+                self._columns.set_status(order, old_status)
+
+            self._mark_segments_dirty([order])
+            if self._journal:
+                self._append_order_journal([{'op': 'status', 'id': order_id, 'status': status}])
+            self.events.publish(events.ORDER_STATUS_CHANGED, order_id=order_id, order=order,
+                                old_status=old_status, status=status)
+            logger.info(f"✅ Buyurtma statusi o'zgartirildi: {order.get('order_number')} -> {status}")
+            return True
 
         logger.warning(f"⚠️ Buyurtma topilmadi: ID {order_id}")
         return False
 
+    @exclusive
+    def update_orders_status_bulk(self, order_ids: List[int], status: str) -> int:
+        """
+        Bir nechta buyurtma statusini birga yangilash
+
+        Indekslar bir o'tishda yangilanadi, jurnalga esa barcha yozuvlar
+        bitta fsync bilan qo'shiladi. Arxivdagi buyurtmalar jonli
+        segmentlarga bitta atomik yozuvda qaytariladi.
+
+        Args:
+            order_ids: Buyurtma ID'lari
+            status: Yangi status
+
+        Returns:
+            int: Yangilangan buyurtmalar soni
+        """
+        self._read_json(config.ORDERS_FILE)
+        live, restored = [], []
+        old_statuses = {}
+
+        for order_id in dict.fromkeys(order_ids):
+            order = self._find_order(order_id)
+            if not order:
+                continue
+
+            old_status = old_statuses[order_id] = order.status
+            self._count_status_change(old_status, status)
+            order.status = status
+            if self._columns is not None:
+                self._columns.set_status(order, old_status)
+
+            if order_id in self._orders_by_id:
+                self._reindex_status(order_id, old_status, status)
+                live.append(order)
+            else:
+                restored.append(order)
+
+        if live:
+            self._mark_segments_dirty(live)
+            if self._journal:
+                self._append_order_journal([
+                    {'op': 'status', 'id': order.id, 'status': status} for order in live
+                ])
+        if restored:
+            self._restore_archived(restored)
+        for order in live + restored:
+            self.events.publish(events.ORDER_STATUS_CHANGED, order_id=order.id, order=order,
+                                old_status=old_statuses[order.id], status=status)
+
+        updated = len(live) + len(restored)
+        if updated:
+            logger.info(f"✅ {updated} ta buyurtma statusi o'zgartirildi -> {status}")
+        if updated < len(set(order_ids)):
+            logger.warning(f"⚠️ {len(set(order_ids)) - updated} ta buyurtma topilmadi")
+        return updated
+
+    @synchronized
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Admin statistikasi (tayyor hisoblagichlardan, O(1))
+
+        Returns:
+            Dict[str, Any]: {'products': ..., 'available_products': ...,
+                             'categories': ..., 'users': ...,
+                             'orders': ..., 'orders_by_status': {status: soni}}
+        """
+        self._read_json(config.PRODUCTS_FILE)
+        self._read_json(config.USERS_FILE)
+        self._read_json(config.ORDERS_FILE)
+        return {
+            'products': len(self._products_by_id),
+            'available_products': len(self._available_pool),
+            'categories': len(self._read_json(config.CATEGORIES_FILE)),
+            'users': len(self._users_by_id),
+            'orders': sum(self._order_counts.values()),
+            'orders_by_status': {status: count for status, count in self._order_counts.items() if count},
+        }
+
+    @synchronized
+    def get_order_analytics(self, days: int = 7) -> Dict[str, Any]:
+        """
+        Buyurtmalar statistikasi (ustunli nusxaning yig'indilaridan)
+
+        Har bir chaqiruv kunlar va tovarlar soniga proporsional - buyurtmalar
+        aylanib chiqilmaydi.
+
+        Args:
+            days: Kunlik hisobot uchun oxirgi kunlar soni
+
+        Returns:
+            Dict[str, Any]: {'statuses': {status: soni},
+                             'daily': {'YYYY-MM-DD': {'orders': ..., 'quantity': ...}},
+                             'products': {tovar ID: donalar (bekor qilinganlarsiz)}}
+        """
+        self._read_json(config.ORDERS_FILE)
+        columns = self._order_columns()
+        return {
+            'statuses': columns.status_counts(),
+            'daily': columns.daily_totals(days),
+            'products': columns.product_quantities(exclude=('bekor',)),
+        }
+
+    def compact_orders(self) -> bool:
+        """
+        Buyurtmalar jurnalini oylik segmentlarga yig'ish
+
+        Faqat o'zgargan segmentlar (odatda joriy oy) va manifest qayta
+        yoziladi. Ular muvaffaqiyatli yozilgandan keyingina jurnal
+        tozalanadi. Jurnalni qayta qo'llash idempotent bo'lgani uchun ikki
+        qadam orasida to'xtab qolish ma'lumot yo'qotmaydi. Jurnal bo'sh
+        (yoki o'chiq) bo'lsa ham, tovar nusxasi to'ldirilgan (backfill)
+        segmentlar shu yerda yoziladi.
+
+        Returns:
+            bool: Compaction bajarilgan bo'lsa True
+        """
+        with self._exclusive():
+            # Navbatdagi jurnal yozuvlari avval diskka tushishi kerak
+            self.flush()
+
+            with self._lock:
+                self._read_json(config.ORDERS_FILE)
+                entries = self._journal.entries if self._journal else 0
+                if entries == 0 and not self._dirty_segments:
+                    return False
+                months, blobs = self._segment_blobs()
+
+            if not self._commit_segments(months, blobs):
+                return False
+
+        logger.info(f"✅ Buyurtmalar segmentlari yozildi: jurnaldan {entries} ta yozuv, {len(months)} ta segment")
+        return True
+
+    def archive_orders(self, older_than_days: int = None) -> int:
+        """
+        Eski yopilgan buyurtmalarni siqilgan arxiv segmentlariga ko'chirish
+
+        ORDERS_ARCHIVE_STATUSES dagi va older_than_days kundan oldin
+        yaratilgan buyurtmalar jonli segmentlardan olinib, o'z oyining
+        arxiv segmentiga (*.json.gz) qo'shiladi. O'zgargan jonli segmentlar,
+        arxiv segmentlari va manifest bitta atomik yozuvda yangilanadi,
+        shuning uchun jurnal ham shu yerda yig'iladi.
+
+        Args:
+            older_than_days: Yoshi (default: config.ORDERS_ARCHIVE_AFTER_DAYS)
+
+        Returns:
+            int: Arxivlangan buyurtmalar soni
+        """
+        days = config.ORDERS_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+        cutoff = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+
+        with self._exclusive():
+            self.flush()
+
+            with self._lock:
+                self._read_json(config.ORDERS_FILE)
+                saved_manifest = copy.deepcopy(self._archive_manifest.segments)
+                archived = self._take_archivable(cutoff)
+                if not archived:
+                    return 0
+                files = self._archive_files(archived)
+                months, blobs = self._segment_blobs(files)
+
+            if not self._commit_segments(months, blobs):
+                # Diskda hech narsa o'zgarmadi - xotiradagi holatni ham qaytarish
+                with self._lock:
+                    self._archive_manifest.segments = saved_manifest
+                    for order in archived:
+                        self._archived.pop(order.get('id'), None)
+                    orders = self._cache[config.ORDERS_FILE]
+                    orders.extend(archived)
+                    self._index_orders(orders)
+                return 0
+
+        logger.info(f"✅ {len(archived)} ta yopilgan buyurtma arxivlandi: {', '.join(sorted(files))}")
+        return len(archived)
+
     # ==================== USERS ====================
 
+    @exclusive
     def add_user(self, user_id: int, username: str = None,
                  first_name: str = None, last_name: str = None) -> Dict:
         """
         Foydalanuvchi qo'shish yoki yangilash
 
+        Fayl faqat ma'lumotlar haqiqatan o'zgarganda yoziladi. Har bir
+        murojaatda yangilanadigan last_seen esa xotirada saqlanadi va
+        diskka LAST_SEEN_FLUSH_INTERVAL da bir marta (yoki boshqa yozuv
+        bilan birga) tushiriladi.
+
         Args:
             user_id: Telegram user ID
             username: Username (ixtiyoriy)
@@ -506,33 +2502,60 @@ class JSONDatabase:
             Dict: Foydalanuvchi ma'lumotlari
         """
         users = self._read_json(config.USERS_FILE)
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
         # Foydalanuvchi mavjudligini tekshirish
-        for user in users:
-            if user.get('user_id') == user_id:
+        user = self._users_by_id.get(user_id)
+        if user:
+            user.last_seen = now
+            if (user.username, user.first_name, user.last_name) != (username, first_name, last_name):
                 # Yangilash
-                user['username'] = username
-                user['first_name'] = first_name
-                user['last_name'] = last_name
+                user.username = username
+                user.first_name = first_name
+                user.last_name = last_name
                 self._write_json(config.USERS_FILE, users)
-                return user
+            else:
+                self._touch_users(users)
+            return user
 
         # Yangi foydalanuvchi qo'shish
-        user = {
-            'user_id': user_id,
-            'username': username,
-            'first_name': first_name,
-            'last_name': last_name,
-            'is_blocked': False,
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        user = User(
+            user_id=user_id,
+            username=username,
+            first_name=first_name,
+            last_name=last_name,
+            is_blocked=False,
+            created_at=now,
+            last_seen=now
+        )
 
         users.append(user)
+        self._users_by_id[user_id] = user
         self._write_json(config.USERS_FILE, users)
+        self.events.publish(events.USER_ADDED, user_id=user_id, user=user)
 
         logger.info(f"✅ Yangi foydalanuvchi: {user_id} (@{username})")
         return user
 
+    def _touch_users(self, users: List[Dict]):
+        """
+        Faqat last_seen o'zgarganini belgilash (fayl darhol yozilmaydi)
+
+        Birinchi kechiktirilgan o'zgarishda flush taymeri o'rnatiladi -
+        bot bo'sh turgan bo'lsa ham last_seen LAST_SEEN_FLUSH_INTERVAL
+        ichida diskka tushadi.
+
+        Args:
+            users: Foydalanuvchilar ro'yxati (keshdagi)
+        """
+        now = time.monotonic()
+        if self._users_touched_at is None:
+            self._users_touched_at = now
+            self._schedule_flush(within=config.LAST_SEEN_FLUSH_INTERVAL)
+        elif now - self._users_touched_at >= config.LAST_SEEN_FLUSH_INTERVAL:
+            self._write_json(config.USERS_FILE, users)
+
+    @synchronized
     def get_all_users(self) -> List[Dict]:
         """
         Barcha foydalanuvchilarni olish
@@ -540,8 +2563,9 @@ class JSONDatabase:
         Returns:
             List[Dict]: Foydalanuvchilar ro'yxati
         """
-        return self._read_json(config.USERS_FILE)
+        return list(self._read_json(config.USERS_FILE))
 
+    @synchronized
     def get_users_count(self) -> int:
         """
         Foydalanuvchilar sonini olish
@@ -551,7 +2575,3 @@ class JSONDatabase:
         """
         users = self._read_json(config.USERS_FILE)
         return len(users)
-
-
-# Global database obyekti
-db = JSONDatabase()
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Xotiradagi (in-memory) baza
+
+JSONDatabase bilan bir xil mantiq va indekslar, lekin diskka hech narsa
+yozilmaydi va hech narsa o'qilmaydi. Yuklama testlari va lokal sinovlar
+uchun: config.DB_BACKEND = "memory". Bot to'xtaganda ma'lumotlar yo'qoladi.
+"""
+
+from typing import Any, Dict, List
+import config
+import logging
+
+from database.base import DEFAULT_CATEGORIES, register_backend
+from database.filelock import FileLock
+from database.json_db import JSONDatabase
+
+logger = logging.getLogger(__name__)
+
+
+@register_backend("memory")
+class MemoryDatabase(JSONDatabase):
+    """
+    Faqat xotirada ishlaydigan baza
+    """
+
+    def _init_storage(self):
+        """
+        Kolleksiyalarni xotirada yaratish (fayllarsiz)
+        """
+        # Jurnal ham kerak emas - buyurtmalar to'g'ridan-to'g'ri keshga yoziladi
+        self._journal = None
+        # Boshqa jarayonlar bilan umumiy fayllar yo'q - qulf fayli ham yaratilmaydi
+        self._file_lock = FileLock(None)
+
+        self._cache[config.PRODUCTS_FILE] = []
+        self._cache[config.ORDERS_FILE] = []
+        self._cache[config.USERS_FILE] = []
+        self._cache[config.CATEGORIES_FILE] = list(DEFAULT_CATEGORIES)
+        self._cache[config.META_FILE] = {'sequences': {}}
+
+        for filepath, builder in self._index_builders.items():
+            builder(self._cache[filepath])
+
+    def _read_json(self, filepath: str) -> Any:
+        """
+        Kolleksiyani xotiradan olish
+
+        Args:
+            filepath: Kolleksiya kaliti (fayl yo'li)
+
+        Returns:
+            Any: Kolleksiya ma'lumotlari
+        """
+        return self._cache[filepath]
+
+    def _write_many(self, files: Dict[str, Any]) -> bool:
+        """
+        Kolleksiyalarni xotirada almashtirish
+
+        Args:
+            files: Kolleksiya kaliti (fayl yo'li) -> yangi ma'lumotlar
+
+        Returns:
+            bool: Doim True
+        """
+        self._cache.update(files)
+        return True
+
+    def _mark_segments_dirty(self, orders: List[Dict]):
+        """
+        Segmentlar yo'q - barcha buyurtmalar bitta ro'yxatda
+
+        Args:
+            orders: Yangi yoki o'zgargan buyurtmalar
+        """
+
+    def compact_orders(self) -> bool:
+        """
+        Jurnal va segment fayllari yo'q
+
+        Returns:
+            bool: Doim False
+        """
+        return False
+
+    def archive_orders(self, older_than_days: int = None) -> int:
+        """
+        Arxiv fayllari yo'q - barcha buyurtmalar xotirada qoladi
+
+        Args:
+            older_than_days: JSONDatabase bilan moslik uchun
+
+        Returns:
+            int: Doim 0
+        """
+        return 0
+
+    def flush(self):
+        """
+        Diskka yoziladigan narsa yo'q
+        """
@@ -0,0 +1,289 @@
+"""
+Yozuv turlari: tovar, buyurtma va foydalanuvchi
+
+Har bir yozuv oddiy dict o'rniga __slots__ li obyekt - xotirada bir necha
+barobar kam joy egallaydi va maydonlarga atribut orqali tez murojaat
+qilinadi (product.name). Eski kod va shablonlar uchun dict'ga o'xshash
+interfeys ham saqlangan (product['name'], product.get('size'), ...).
+
+Diskka yozishda yozuvlar to_dict() orqali oddiy dict'ga aylantiriladi,
+o'qishda esa from_dict() bilan qayta yaratiladi. Faylda ma'lum
+maydonlardan tashqari kalitlar bo'lsa, ular yo'qolmaydi (_extra).
+"""
+
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class Record:
+    """
+    Yozuvlar uchun umumiy asos (dict bilan moslik qatlami)
+
+    Voris klass __slots__ da o'z maydonlarini, DEFAULTS da esa None
+    bo'lmagan default qiymatlarni e'lon qiladi.
+    """
+
+    __slots__ = ('_extra',)
+
+    # Maydon -> default qiymat (e'lon qilinmaganlari uchun None)
+    DEFAULTS: Dict[str, Any] = {}
+
+    FIELDS: Tuple[str, ...] = ()
+    _fieldset: frozenset = frozenset()
+    _defaults: Tuple[Tuple[str, Any], ...] = ()
+    _getter = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.FIELDS = tuple(cls.__slots__)
+        cls._fieldset = frozenset(cls.FIELDS)
+        cls._defaults = tuple((name, cls.DEFAULTS.get(name)) for name in cls.FIELDS)
+        cls._getter = attrgetter(*cls.FIELDS)
+
+    def __init__(self, **fields):
+        """
+        Args:
+            **fields: Maydonlar (noma'lumlari _extra ga tushadi)
+        """
+        for name, default in self._defaults:
+            setattr(self, name, fields.pop(name, default))
+        self._extra: Optional[Dict[str, Any]] = fields or None
+
+    @classmethod
+    def from_dict(cls, data: Any) -> 'Record':
+        """
+        Dict'dan yozuv yaratish (yozuv berilsa, o'zi qaytariladi)
+
+        Args:
+            data: Fayldan o'qilgan dict
+
+        Returns:
+            Record: Yozuv
+        """
+        if isinstance(data, cls):
+            return data
+
+        record = cls.__new__(cls)
+        get = data.get
+        for name, default in cls._defaults:
+            setattr(record, name, get(name, default))
+        record._extra = None
+        if not cls._fieldset.issuperset(data):
+            record._extra = {k: v for k, v in data.items() if k not in cls._fieldset}
+        return record
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[Any]) -> list:
+        """
+        Dict'lar ro'yxatidan yozuvlar ro'yxati
+
+        Args:
+            items: Fayldan o'qilgan dict'lar
+
+        Returns:
+            list: Yozuvlar
+        """
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in items]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Faylga yoziladigan oddiy dict
+
+        Returns:
+            Dict[str, Any]: Barcha maydonlar (va qo'shimcha kalitlar)
+        """
+        data = dict(zip(self.FIELDS, self._getter(self)))
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    # ---------- dict bilan moslik ----------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fieldset:
+            return getattr(self, key)
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._fieldset:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fieldset or bool(self._extra and key in self._extra)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + len(self._extra or ())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        dict.get bilan bir xil; qiymati None bo'lgan maydon uchun default
+
+        Args:
+            key: Maydon nomi
+            default: Maydon bo'lmasa yoki None bo'lsa qaytariladigan qiymat
+
+        Returns:
+            Any: Maydon qiymati
+        """
+        if key in self._fieldset:
+            value = getattr(self, key)
+            return default if value is None else value
+        if self._extra:
+            return self._extra.get(key, default)
+        return default
+
+    def keys(self):
+        """Maydon nomlari (qo'shimcha kalitlar bilan)"""
+        return self.to_dict().keys()
+
+    def values(self):
+        """Maydon qiymatlari"""
+        return self.to_dict().values()
+
+    def items(self):
+        """(maydon, qiymat) juftliklari"""
+        return self.to_dict().items()
+
+    def update(self, other: Any = (), **kwargs):
+        """
+        Bir nechta maydonni o'zgartirish (dict.update kabi)
+
+        Args:
+            other: Dict yoki boshqa yozuv
+            **kwargs: Maydonlar
+        """
+        if isinstance(other, Record):
+            other = other.to_dict()
+        for key, value in dict(other, **kwargs).items():
+            self[key] = value
+
+    def copy(self) -> Dict[str, Any]:
+        """Oddiy dict nusxasi (dict.copy kabi)"""
+        return self.to_dict()
+
+
+class Product(Record):
+    """Tovar"""
+
+    __slots__ = ('id', 'category', 'name', 'description', 'price', 'size',
+                 'photo_id', 'is_available', 'created_at')
+
+    DEFAULTS = {'price': 0.0, 'is_available': True}
+
+    id: int
+    category: str
+    name: str
+    description: str
+    price: float
+    size: Optional[str]
+    photo_id: Optional[str]
+    is_available: bool
+    created_at: str
+
+
+class Order(Record):
+    """
+    Buyurtma
+
+    product_name, category, price, total_price va photo_id - buyurtma
+    berilgan paytdagi tovar nusxasi (snapshot). Tovar keyin o'zgarsa yoki
+    o'chirilsa ham buyurtma to'langan narx bilan ko'rsatiladi.
+    """
+
+    __slots__ = ('id', 'order_number', 'user_id', 'username', 'product_id',
+                 'customer_name', 'phone', 'address', 'quantity', 'status', 'created_at',
+                 'product_name', 'category', 'price', 'total_price', 'photo_id')
+
+    DEFAULTS = {'quantity': 1, 'status': 'yangi'}
+
+    id: int
+    order_number: str
+    user_id: int
+    username: Optional[str]
+    product_id: int
+    customer_name: str
+    phone: str
+    address: str
+    quantity: int
+    status: str
+    created_at: str
+    product_name: Optional[str]
+    category: Optional[str]
+    price: Optional[float]
+    total_price: Optional[float]
+    photo_id: Optional[str]
+
+    def has_snapshot(self) -> bool:
+        """Tovar nusxasi saqlanganmi (eski buyurtmalarda bo'lmasligi mumkin)"""
+        return self.product_name is not None
+
+    def apply_snapshot(self, product: Any):
+        """
+        Tovar nusxasini buyurtmaga yozish
+
+        Args:
+            product: Tovar (yozuv yoki dict)
+        """
+        price = float(product.get('price') or 0)
+        self.product_name = product.get('name')
+        self.category = product.get('category')
+        self.price = price
+        self.total_price = price * (self.quantity or 1)
+        self.photo_id = product.get('photo_id')
+
+
+class User(Record):
+    """Foydalanuvchi"""
+
+    __slots__ = ('user_id', 'username', 'first_name', 'last_name',
+                 'is_blocked', 'created_at', 'last_seen')
+
+    DEFAULTS = {'is_blocked': False}
+
+    user_id: int
+    username: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    is_blocked: bool
+    created_at: str
+    last_seen: Optional[str]
+
+
+def to_plain(obj: Any) -> Dict[str, Any]:
+    """
+    Serializatorlar uchun default funksiya (json, orjson, msgpack)
+
+    Args:
+        obj: Serializator o'zi taniy olmagan obyekt
+
+    Returns:
+        Dict[str, Any]: Yozuvning dict ko'rinishi
+
+    Raises:
+        TypeError: Obyekt yozuv bo'lmasa
+    """
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Serializatsiya qilib bo'lmaydi: {type(obj).__name__}")
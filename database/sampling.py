@@ -0,0 +1,150 @@
+"""
+Avtomatik post uchun tovarlarni tanlash
+
+IdPool - mavjud tovar ID'larining doim yangilanib turadigan to'plami:
+qo'shish/o'chirish O(1), k ta random tanlash O(k).
+
+ProductDeck - "koloda" rejimi: tovarlar aralashtirilgan tartibda
+navbat bilan olinadi va butun katalog bir marta post qilinmaguncha
+hech bir tovar qaytarilmaydi. Koloda holati oddiy dict - backend uni
+o'zi saqlaydi (JSON'da meta.json, SQLite'da meta jadvali).
+"""
+
+import random
+from typing import Callable, Dict, Iterable, List
+
+
+class IdPool:
+    """
+    ID'lar to'plami (random tanlash uchun ro'yxat + joylashuv indeksi)
+    """
+
+    def __init__(self, ids: Iterable[int] = ()):
+        """
+        Args:
+            ids: Boshlang'ich ID'lar
+        """
+        self._ids: List[int] = []
+        self._positions: Dict[int, int] = {}
+        for item_id in ids:
+            self.add(item_id)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._positions
+
+    def ids(self) -> List[int]:
+        """Barcha ID'lar nusxasi"""
+        return list(self._ids)
+
+    def add(self, item_id: int):
+        """
+        ID qo'shish (bor bo'lsa, hech narsa o'zgarmaydi)
+
+        Args:
+            item_id: ID
+        """
+        if item_id not in self._positions:
+            self._positions[item_id] = len(self._ids)
+            self._ids.append(item_id)
+
+    def discard(self, item_id: int):
+        """
+        ID ni olib tashlash (oxirgi element uning o'rniga ko'chiriladi)
+
+        Args:
+            item_id: ID
+        """
+        position = self._positions.pop(item_id, None)
+        if position is None:
+            return
+        last = self._ids.pop()
+        if position < len(self._ids):
+            self._ids[position] = last
+            self._positions[last] = position
+
+    def sample(self, count: int) -> List[int]:
+        """
+        k ta turli random ID
+
+        Args:
+            count: Nechta kerak
+
+        Returns:
+            List[int]: ID'lar (to'plam kichik bo'lsa, hammasi aralashtirilgan holda)
+        """
+        return random.sample(self._ids, min(count, len(self._ids)))
+
+
+class ProductDeck:
+    """
+    Takrorlanmaydigan navbat (koloda)
+
+    Holat tuzilishi: {"order": [5, 2, 9, ...], "position": 3}
+    order - joriy aylanishdagi aralashtirilgan tartib, position - keyingi
+    olinadigan element.
+    """
+
+    def __init__(self, state: Dict):
+        """
+        Args:
+            state: Saqlangan holat (joyida o'zgartiriladi)
+        """
+        state.setdefault('order', [])
+        state.setdefault('position', 0)
+        self.state = state
+
+    def draw(self, count: int, is_available: Callable[[int], bool],
+             all_ids: Callable[[], List[int]]) -> List[int]:
+        """
+        Navbatdagi tovarlarni olish
+
+        Koloda tugasa, mavjud tovarlardan yangi aylanish aralashtiriladi.
+        Shu orada o'chirilgan yoki mavjud bo'lmay qolgan tovarlar o'tkazib
+        yuboriladi.
+
+        Args:
+            count: Nechta kerak
+            is_available: Tovar hali ham mavjudmi
+            all_ids: Barcha mavjud tovar ID'lari (yangi aylanish uchun)
+
+        Returns:
+            List[int]: Tanlangan ID'lar
+        """
+        picked: List[int] = []
+        reshuffled = False
+
+        while len(picked) < count:
+            order, position = self.state['order'], self.state['position']
+            if position >= len(order):
+                if reshuffled:
+                    break
+                order = [item_id for item_id in all_ids() if item_id not in picked]
+                if not order:
+                    break
+                random.shuffle(order)
+                self.state['order'], self.state['position'] = order, 0
+                reshuffled = True
+                continue
+
+            item_id = order[position]
+            self.state['position'] = position + 1
+            if item_id not in picked and is_available(item_id):
+                picked.append(item_id)
+
+        return picked
+
+    def add(self, item_id: int):
+        """
+        Yangi tovarni joriy aylanishning qolgan qismiga random joylash
+
+        Args:
+            item_id: Tovar ID
+        """
+        order, position = self.state['order'], self.state['position']
+        if position >= len(order):
+            # Keyingi aylanish baribir barcha mavjud tovarlardan tuziladi
+            return
+        order.insert(random.randint(position, len(order)), item_id)
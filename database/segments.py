@@ -0,0 +1,248 @@
+"""
+Buyurtmalarning oylik segmentlari
+
+Buyurtmalar bitta orders.json o'rniga oylar bo'yicha alohida fayllarda
+saqlanadi (data/orders/2026-10.json, ...). Kichik manifest har bir segment
+haqida qisqa ma'lumot saqlaydi: buyurtmalar soni, ID oralig'i,
+foydalanuvchilar va statuslar bo'yicha sonlar. Shu ma'lumot orqali qaysi
+eski segmentni yuklash kerakligi (yoki umuman kerak emasligi) aniqlanadi.
+
+Yopilgan (yetkazilgan/bekor qilingan) eski buyurtmalar esa siqilgan arxiv
+segmentlariga (data/orders/archive/2026-10.json.gz) ko'chiriladi. Ular
+manifestning alohida "archive" bo'limida xuddi shunday ta'riflanadi.
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import config
+import logging
+
+from database import formats
+
+logger = logging.getLogger(__name__)
+
+
+def order_month(order: Dict) -> str:
+    """
+    Buyurtma tegishli oy (segment nomi)
+
+    Args:
+        order: Buyurtma
+
+    Returns:
+        str: 'YYYY-MM'
+    """
+    created_at = order.get('created_at') or ''
+    return created_at[:7] if len(created_at) >= 7 else datetime.now().strftime('%Y-%m')
+
+
+def segment_path(month: str, directory: str = None) -> str:
+    """
+    Segment fayli yo'li
+
+    Args:
+        month: 'YYYY-MM'
+        directory: Segmentlar papkasi (default: config.ORDERS_DIR)
+
+    Returns:
+        str: Fayl yo'li
+    """
+    return os.path.join(directory or config.ORDERS_DIR, f"{month}.json")
+
+
+def archive_path(month: str, directory: str = None) -> str:
+    """
+    Arxiv segmenti fayli yo'li
+
+    Args:
+        month: 'YYYY-MM'
+        directory: Arxiv papkasi (default: config.ORDERS_ARCHIVE_DIR)
+
+    Returns:
+        str: Fayl yo'li
+    """
+    return os.path.join(directory or config.ORDERS_ARCHIVE_DIR, f"{month}.json.gz")
+
+
+def hot_months(count: int = None, today: datetime = None) -> List[str]:
+    """
+    Doim xotirada turadigan oxirgi oylar
+
+    Args:
+        count: Oylar soni (default: config.ORDERS_HOT_MONTHS)
+        today: Joriy sana (test uchun)
+
+    Returns:
+        List[str]: 'YYYY-MM' lar, eskisidan yangisiga
+    """
+    count = config.ORDERS_HOT_MONTHS if count is None else count
+    today = today or datetime.now()
+    year, month = today.year, today.month
+    months = []
+    for _ in range(max(count, 1)):
+        months.append(f"{year:04d}-{month:02d}")
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return months[::-1]
+
+
+class OrderManifest:
+    """
+    Segmentlar manifesti
+
+    Tuzilishi:
+        {"segments": {"2026-10": {"count": 12, "min_id": 40, "max_id": 51,
+                                  "users": [123, 456],
+                                  "statuses": {"yangi": 3, "yetkazildi": 9},
+                                  "days": {"2026-10-01": [2, 5], ...},
+                                  "products": {"7": {"yetkazildi": 4}, ...}}},
+         "archive": {"2026-08": {...}}}
+
+    days (kun -> [buyurtmalar, donalar]) va products (tovar ID -> status ->
+    donalar) statistikani segment faylini o'qimasdan qurish uchun.
+
+    Har bir bo'lim (segments, archive) alohida OrderManifest orqali o'qiladi.
+    """
+
+    def __init__(self, data: Any = None, section: str = 'segments'):
+        """
+        Args:
+            data: Manifest fayli tarkibi
+            section: Manifest bo'limi ('segments' yoki 'archive')
+        """
+        self.section = section
+        segments = data.get(section) if isinstance(data, dict) else None
+        self.segments: Dict[str, Dict] = segments if isinstance(segments, dict) else {}
+
+    def months(self) -> List[str]:
+        """Barcha segmentlar, eskisidan yangisiga"""
+        return sorted(self.segments)
+
+    def update(self, month: str, orders: List[Dict]):
+        """
+        Segment ma'lumotini uning buyurtmalaridan qayta hisoblash
+
+        Args:
+            month: 'YYYY-MM'
+            orders: Segmentdagi barcha buyurtmalar
+        """
+        statuses: Dict[str, int] = {}
+        days: Dict[str, List[int]] = {}
+        products: Dict[str, Dict[str, int]] = {}
+        for order in orders:
+            status = order.get('status')
+            quantity = order.get('quantity') or 0
+            statuses[status] = statuses.get(status, 0) + 1
+            day = days.setdefault((order.get('created_at') or '')[:10], [0, 0])
+            day[0] += 1
+            day[1] += quantity
+            by_status = products.setdefault(str(order.get('product_id') or 0), {})
+            by_status[status] = by_status.get(status, 0) + quantity
+
+        ids = [order.get('id', 0) for order in orders]
+        self.segments[month] = {
+            'count': len(orders),
+            'min_id': min(ids, default=0),
+            'max_id': max(ids, default=0),
+            'users': sorted({order.get('user_id') for order in orders}),
+            'statuses': statuses,
+            'days': days,
+            'products': products,
+        }
+
+    def month_for_id(self, order_id: int) -> Optional[str]:
+        """
+        ID qaysi segmentga tegishli
+
+        Args:
+            order_id: Buyurtma ID
+
+        Returns:
+            Optional[str]: 'YYYY-MM' yoki None
+        """
+        for month, info in self.segments.items():
+            if info.get('min_id', 0) <= order_id <= info.get('max_id', -1):
+                return month
+        return None
+
+    def months_for_user(self, user_id: int) -> List[str]:
+        """Foydalanuvchi buyurtmalari bor segmentlar"""
+        return [month for month, info in self.segments.items() if user_id in info.get('users', ())]
+
+    def months_for_status(self, status: str) -> List[str]:
+        """Berilgan statusdagi buyurtmalari bor segmentlar"""
+        return [month for month, info in self.segments.items() if info.get('statuses', {}).get(status)]
+
+    def count(self, months: Iterable[str], status: str = None) -> int:
+        """
+        Segmentlardagi buyurtmalar soni (fayllarni o'qimasdan)
+
+        Args:
+            months: Segmentlar
+            status: Faqat shu statusdagilar (ixtiyoriy)
+
+        Returns:
+            int: Buyurtmalar soni
+        """
+        total = 0
+        for month in months:
+            info = self.segments.get(month, {})
+            total += info.get('statuses', {}).get(status, 0) if status else info.get('count', 0)
+        return total
+
+    def max_id(self) -> int:
+        """Barcha segmentlardagi eng katta ID"""
+        return max((info.get('max_id', 0) for info in self.segments.values()), default=0)
+
+    def to_dict(self) -> Dict:
+        """Faylga yoziladigan ko'rinish (faqat shu bo'lim)"""
+        return {self.section: self.segments}
+
+
+def split_by_month(orders: Iterable[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Buyurtmalarni oylar bo'yicha ajratish
+
+    Args:
+        orders: Buyurtmalar
+
+    Returns:
+        Dict[str, List[Dict]]: 'YYYY-MM' -> shu oydagi buyurtmalar (ID bo'yicha)
+    """
+    by_month: Dict[str, List[Dict]] = {}
+    for order in orders:
+        by_month.setdefault(order_month(order), []).append(order)
+    for month_orders in by_month.values():
+        month_orders.sort(key=lambda o: o.get('id', 0))
+    return by_month
+
+
+def read_all_orders(directory: str) -> List[Dict]:
+    """
+    Papkadagi barcha segmentlarni, arxivdagilari bilan birga o'qish
+    (import uchun)
+
+    Args:
+        directory: Segmentlar papkasi
+
+    Returns:
+        List[Dict]: Barcha buyurtmalar
+    """
+    manifest_path = os.path.join(directory, os.path.basename(config.ORDERS_MANIFEST_FILE))
+    if not os.path.exists(manifest_path):
+        return []
+
+    with open(manifest_path, 'rb') as f:
+        data = formats.decode(f.read())
+
+    paths = [segment_path(month, directory) for month in OrderManifest(data).months()]
+    archive_dir = os.path.join(directory, os.path.basename(config.ORDERS_ARCHIVE_DIR))
+    paths += [archive_path(month, archive_dir) for month in OrderManifest(data, 'archive').months()]
+
+    orders = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            orders.extend(formats.decode(f.read()))
+    return orders
@@ -0,0 +1,1360 @@
+"""
+SQLite bilan ishlash moduli
+JSONDatabase bilan bir xil ochiq API, lekin ma'lumotlar bitta SQLite faylida
+(WAL rejimi, indekslar va tayyorlangan so'rovlar bilan)
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import Executor
+from typing import List, Optional, Dict, Any, Tuple
+import config
+import logging
+
+from database import events, formats
+from database.columns import STATUSES
+from database.journal import OrderJournal
+from database.base import DEFAULT_CATEGORIES, register_backend, synchronized
+from database.models import Order, Product, User
+from database.sampling import ProductDeck
+from database.segments import read_all_orders
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    position INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    price REAL NOT NULL,
+    size TEXT,
+    photo_id TEXT,
+    is_available INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_products_category ON products (category, is_available);
+CREATE INDEX IF NOT EXISTS idx_products_available ON products (is_available);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_number TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    username TEXT,
+    product_id INTEGER,
+    customer_name TEXT,
+    phone TEXT,
+    address TEXT,
+    quantity INTEGER NOT NULL DEFAULT 1,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    product_name TEXT,
+    category TEXT,
+    price REAL,
+    total_price REAL,
+    photo_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_orders_user ON orders (user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_orders_created ON orders (created_at);
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    is_blocked INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    last_seen TEXT
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+PRODUCT_COLUMNS = ('category', 'name', 'description', 'price', 'size', 'photo_id', 'is_available', 'created_at')
+ORDER_COLUMNS = ('order_number', 'user_id', 'username', 'product_id', 'customer_name',
+                 'phone', 'address', 'quantity', 'status', 'created_at')
+# Buyurtma paytidagi tovar nusxasi (Order.apply_snapshot)
+ORDER_SNAPSHOT_COLUMNS = ('product_name', 'category', 'price', 'total_price', 'photo_id')
+USER_COLUMNS = ('username', 'first_name', 'last_name', 'is_blocked', 'created_at', 'last_seen')
+
+
+@register_backend("sqlite")
+class SQLiteDatabase:
+    """
+    SQLite bilan ishlash klassi
+    JSONDatabase o'rniga ishlatiladi (config.DB_BACKEND = "sqlite")
+    """
+
+    def __init__(self, filepath: str = None):
+        """
+        Initsializatsiya - ulanish, WAL rejimi va sxema
+
+        Args:
+            filepath: SQLite fayli yo'li (default: config.SQLITE_FILE)
+        """
+        self.filepath = filepath or config.SQLITE_FILE
+
+        directory = os.path.dirname(self.filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+            logger.info(f"✅ Data papka yaratildi: {directory}")
+
+        self._lock = threading.RLock()
+        # Ulanish executor oqimlari orasida bo'lishiladi - kirish self._lock bilan
+        self._conn = sqlite3.connect(
+            self.filepath,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        is_new = self._conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'categories'"
+        ).fetchone()[0] == 0
+
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            if is_new:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO categories (name) VALUES (?)",
+                    [(name,) for name in DEFAULT_CATEGORIES]
+                )
+
+            # Eski bazalarga yangi ustunlarni qo'shish
+            user_columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(users)")}
+            if 'last_seen' not in user_columns:
+                self._conn.execute("ALTER TABLE users ADD COLUMN last_seen TEXT")
+            order_columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(orders)")}
+            for column, column_type in zip(ORDER_SNAPSHOT_COLUMNS, ('TEXT', 'TEXT', 'REAL', 'REAL', 'TEXT')):
+                if column not in order_columns:
+                    self._conn.execute(f"ALTER TABLE orders ADD COLUMN {column} {column_type}")
+
+        # Faqat last_seen o'zgargan foydalanuvchilar (user_id -> vaqt), keyinroq yoziladi
+        self._last_seen: Dict[int, str] = {}
+        self._last_seen_since: Optional[float] = None
+        # Bot bo'sh turganda ham yig'ilgan last_seen yozilishi uchun taymer
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[Executor] = None
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+
+        # O'zgarishlar haqida xabar beruvchi event bus (JSONDatabase bilan bir xil)
+        self.events = events.EventBus()
+
+        logger.info(f"✅ SQLite Database initsializatsiya qilindi: {self.filepath}")
+
+    @staticmethod
+    def _product(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        """SQLite qatorini tovar yozuviga aylantirish"""
+        if row is None:
+            return None
+        product = Product.from_dict(dict(row))
+        product.is_available = bool(product.is_available)
+        return product
+
+    @staticmethod
+    def _order(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        """SQLite qatorini buyurtma yozuviga aylantirish"""
+        return Order.from_dict(dict(row)) if row is not None else None
+
+    @staticmethod
+    def _user(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        """SQLite qatorini foydalanuvchi yozuviga aylantirish"""
+        if row is None:
+            return None
+        user = User.from_dict(dict(row))
+        user.is_blocked = bool(user.is_blocked)
+        return user
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop, executor: Optional[Executor] = None):
+        """
+        last_seen flush taymerini berilgan event loop orqali rejalashtirish
+
+        Args:
+            loop: Bot ishlayotgan event loop
+            executor: Flush uchun executor (bitta oqimli bo'lishi kerak)
+        """
+        self._loop = loop
+        self._executor = executor
+
+    @synchronized
+    def flush(self):
+        """
+        Yig'ilgan last_seen yangilanishlarini yozish
+        (qolgan barcha amallar darhol commit qilinadi)
+        """
+        self._flush_last_seen()
+
+    @synchronized
+    def close(self):
+        """
+        Ulanishni yopish
+        """
+        self._flush_last_seen()
+        self._conn.close()
+
+    # ==================== CATEGORIES ====================
+
+    @synchronized
+    def get_categories(self) -> List[str]:
+        """
+        Barcha kategoriyalarni olish
+
+        Returns:
+            List[str]: Kategoriyalar ro'yxati
+        """
+        rows = self._conn.execute("SELECT name FROM categories ORDER BY position")
+        return [row['name'] for row in rows]
+
+    @synchronized
+    def add_category(self, category: str) -> bool:
+        """
+        Yangi kategoriya qo'shish
+
+        Args:
+            category: Kategoriya nomi
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        try:
+            with self._conn:
+                self._conn.execute("INSERT INTO categories (name) VALUES (?)", (category,))
+        except sqlite3.IntegrityError:
+            logger.warning(f"⚠️ Kategoriya allaqachon mavjud: {category}")
+            return False
+
+        self.events.publish(events.CATEGORY_ADDED, category=category)
+        logger.info(f"✅ Kategoriya qo'shildi: {category}")
+        return True
+
+    @synchronized
+    def delete_category(self, category: str) -> bool:
+        """
+        Kategoriyani o'chirish (va unga tegishli barcha tovarlarni)
+
+        Args:
+            category: Kategoriya nomi
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM categories WHERE name = ?", (category,))
+            if cursor.rowcount == 0:
+                logger.warning(f"⚠️ Kategoriya topilmadi: {category}")
+                return False
+            product_ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM products WHERE category = ?", (category,)
+            )]
+            self._conn.execute("DELETE FROM products WHERE category = ?", (category,))
+
+        self.events.publish(events.CATEGORY_DELETED, category=category, product_ids=product_ids)
+        logger.info(f"✅ Kategoriya o'chirildi: {category}")
+        return True
+
+    @synchronized
+    def update_category(self, old_name: str, new_name: str) -> bool:
+        """
+        Kategoriya nomini o'zgartirish
+
+        Args:
+            old_name: Eski nom
+            new_name: Yangi nom
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        try:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "UPDATE categories SET name = ? WHERE name = ?", (new_name, old_name)
+                )
+                if cursor.rowcount == 0:
+                    logger.warning(f"⚠️ Kategoriya topilmadi: {old_name}")
+                    return False
+                self._conn.execute(
+                    "UPDATE products SET category = ? WHERE category = ?", (new_name, old_name)
+                )
+        except sqlite3.IntegrityError:
+            logger.warning(f"⚠️ Kategoriya allaqachon mavjud: {new_name}")
+            return False
+
+        self.events.publish(events.CATEGORY_RENAMED, old_name=old_name, new_name=new_name)
+        logger.info(f"✅ Kategoriya o'zgartirildi: {old_name} -> {new_name}")
+        return True
+
+    # ==================== PRODUCTS ====================
+
+    @synchronized
+    def add_product(self, category: str, name: str, description: str,
+                    price: float, size: str = None, photo_id: str = None) -> Dict:
+        """
+        Yangi tovar qo'shish
+
+        Args:
+            category: Kategoriya
+            name: Tovar nomi
+            description: Tavsifi
+            price: Narxi
+            size: O'lchami/rangi (ixtiyoriy)
+            photo_id: Telegram photo file_id (ixtiyoriy)
+
+        Returns:
+            Dict: Yaratilgan tovar
+        """
+        product = {
+            'category': category,
+            'name': name,
+            'description': description,
+            'price': float(price),
+            'size': size,
+            'photo_id': photo_id,
+            'is_available': True,
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+        with self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO products ({', '.join(PRODUCT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(PRODUCT_COLUMNS))})",
+                [product[column] for column in PRODUCT_COLUMNS]
+            )
+        product = Product(id=cursor.lastrowid, **product)
+
+        if config.AUTO_POST_DECK_MODE:
+            state = self._load_deck()
+            ProductDeck(state).add(product.id)
+            self._save_deck(state)
+
+        self.events.publish(events.PRODUCT_ADDED, product_id=product.id, product=product)
+        logger.info(f"✅ Tovar qo'shildi: {name} (ID: {product['id']})")
+        return product
+
+    @synchronized
+    def get_product(self, product_id: int) -> Optional[Dict]:
+        """
+        Tovarni ID bo'yicha olish
+
+        Args:
+            product_id: Tovar ID
+
+        Returns:
+            Optional[Dict]: Tovar yoki None
+        """
+        row = self._conn.execute("SELECT * FROM products WHERE id = ?", (product_id,)).fetchone()
+        return self._product(row)
+
+    @synchronized
+    def get_products_by_category(self, category: str) -> List[Dict]:
+        """
+        Kategoriya bo'yicha mavjud tovarlarni olish
+
+        Args:
+            category: Kategoriya nomi
+
+        Returns:
+            List[Dict]: Tovarlar ro'yxati
+        """
+        rows = self._conn.execute(
+            "SELECT * FROM products WHERE category = ? AND is_available = 1 ORDER BY id",
+            (category,)
+        )
+        return [self._product(row) for row in rows]
+
+    @synchronized
+    def get_all_products(self) -> List[Dict]:
+        """
+        Barcha tovarlarni olish (mavjud va mavjud bo'lmaganlarni)
+
+        Returns:
+            List[Dict]: Tovarlar ro'yxati
+        """
+        rows = self._conn.execute("SELECT * FROM products ORDER BY id")
+        return [self._product(row) for row in rows]
+
+    @synchronized
+    def get_available_products(self) -> List[Dict]:
+        """
+        Faqat mavjud tovarlarni olish
+
+        Returns:
+            List[Dict]: Mavjud tovarlar ro'yxati
+        """
+        rows = self._conn.execute("SELECT * FROM products WHERE is_available = 1 ORDER BY id")
+        return [self._product(row) for row in rows]
+
+    @synchronized
+    def get_products_page(self, offset: int = 0, limit: int = 10) -> Tuple[List[Dict], int]:
+        """
+        Tovarlar sahifasi (qo'shilish tartibida)
+
+        Args:
+            offset: Nechta tovar o'tkazib yuboriladi
+            limit: Sahifadagi tovarlar soni
+
+        Returns:
+            Tuple[List[Dict], int]: (sahifadagi tovarlar, jami tovarlar soni)
+        """
+        rows = self._conn.execute(
+            "SELECT * FROM products ORDER BY id LIMIT ? OFFSET ?", (limit, offset)
+        ).fetchall()
+        total = self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+        return [self._product(row) for row in rows], total
+
+    @synchronized
+    def get_random_products(self, count: int = 3) -> List[Dict]:
+        """
+        Random tovarlarni olish (avtomatik post uchun)
+
+        Args:
+            count: Tovarlar soni
+
+        Returns:
+            List[Dict]: Random tovarlar
+        """
+        if config.AUTO_POST_DECK_MODE:
+            return self._draw_from_deck(count)
+
+        rows = self._conn.execute(
+            "SELECT * FROM products WHERE is_available = 1 ORDER BY RANDOM() LIMIT ?",
+            (count,)
+        ).fetchall()
+
+        if not rows:
+            logger.warning("⚠️ Mavjud tovarlar yo'q")
+        return [self._product(row) for row in rows]
+
+    def _load_deck(self) -> Dict:
+        """Koloda holatini meta jadvalidan o'qish"""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'deck'").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _save_deck(self, state: Dict):
+        """Koloda holatini meta jadvaliga yozish"""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('deck', ?)",
+                (json.dumps(state),)
+            )
+
+    def _draw_from_deck(self, count: int) -> List[Dict]:
+        """
+        Kolodadan navbatdagi tovarlarni olish (takrorlanmaydigan rejim)
+
+        Args:
+            count: Nechta kerak
+
+        Returns:
+            List[Dict]: Tovarlar (koloda tartibida)
+        """
+        def is_available(product_id: int) -> bool:
+            return self._conn.execute(
+                "SELECT 1 FROM products WHERE id = ? AND is_available = 1", (product_id,)
+            ).fetchone() is not None
+
+        def all_ids() -> List[int]:
+            return [row[0] for row in self._conn.execute("SELECT id FROM products WHERE is_available = 1")]
+
+        state = self._load_deck()
+        ids = ProductDeck(state).draw(count, is_available, all_ids)
+        self._save_deck(state)
+
+        if not ids:
+            logger.warning("⚠️ Mavjud tovarlar yo'q")
+            return []
+
+        rows = self._conn.execute(
+            f"SELECT * FROM products WHERE id IN ({', '.join('?' * len(ids))})", ids
+        ).fetchall()
+        by_id = {row['id']: self._product(row) for row in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
+    @synchronized
+    def update_product(self, product_id: int, **kwargs) -> bool:
+        """
+        Tovarni yangilash
+
+        Args:
+            product_id: Tovar ID
+            **kwargs: Yangilanadigan maydonlar
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        fields = {k: v for k, v in kwargs.items() if k in PRODUCT_COLUMNS}
+        if len(fields) != len(kwargs):
+            unknown = set(kwargs) - set(fields)
+            logger.warning(f"⚠️ Noma'lum tovar maydonlari e'tiborsiz qoldirildi: {unknown}")
+
+        if fields:
+            assignments = ', '.join(f"{column} = ?" for column in fields)
+            with self._conn:
+                cursor = self._conn.execute(
+                    f"UPDATE products SET {assignments} WHERE id = ?",
+                    [*fields.values(), product_id]
+                )
+            found = cursor.rowcount > 0
+        else:
+            found = self.get_product(product_id) is not None
+
+        if found:
+            self.events.publish(events.PRODUCT_UPDATED, product_id=product_id,
+                                product=self.get_product(product_id), fields=fields)
+            logger.info(f"✅ Tovar yangilandi: ID {product_id}")
+            return True
+
+        logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
+        return False
+
+    @synchronized
+    def delete_product(self, product_id: int) -> bool:
+        """
+        Tovarni o'chirish
+
+        Args:
+            product_id: Tovar ID
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM products WHERE id = ?", (product_id,))
+
+        if cursor.rowcount:
+            self.events.publish(events.PRODUCT_DELETED, product_id=product_id)
+            logger.info(f"✅ Tovar o'chirildi: ID {product_id}")
+            return True
+
+        logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
+        return False
+
+    @synchronized
+    def toggle_product_availability(self, product_id: int) -> bool:
+        """
+        Tovar mavjudligini o'zgartirish
+
+        Args:
+            product_id: Tovar ID
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE products SET is_available = 1 - is_available WHERE id = ?",
+                (product_id,)
+            )
+
+        if cursor.rowcount:
+            product = self.get_product(product_id)
+            self.events.publish(events.PRODUCT_UPDATED, product_id=product_id, product=product,
+                                fields={'is_available': product.is_available})
+            status = "Mavjud" if product['is_available'] else "Mavjud emas"
+            logger.info(f"✅ Tovar mavjudligi o'zgartirildi: ID {product_id} -> {status}")
+            return True
+
+        logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
+        return False
+
+    @synchronized
+    def add_products_bulk(self, items: List[Dict]) -> List[Dict]:
+        """
+        Bir nechta tovarni bitta tranzaksiyada qo'shish
+
+        Args:
+            items: Tovarlar ma'lumotlari (add_product argumentlari)
+
+        Returns:
+            List[Dict]: Yaratilgan tovarlar
+        """
+        if not items:
+            return []
+
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        created = []
+        with self._conn:
+            for item in items:
+                product = Product(
+                    category=item['category'],
+                    name=item['name'],
+                    description=item.get('description', ''),
+                    price=float(item.get('price', 0)),
+                    size=item.get('size'),
+                    photo_id=item.get('photo_id'),
+                    is_available=True,
+                    created_at=created_at
+                )
+                cursor = self._conn.execute(
+                    f"INSERT INTO products ({', '.join(PRODUCT_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(PRODUCT_COLUMNS))})",
+                    [product[column] for column in PRODUCT_COLUMNS]
+                )
+                product.id = cursor.lastrowid
+                created.append(product)
+
+        if config.AUTO_POST_DECK_MODE:
+            state = self._load_deck()
+            deck = ProductDeck(state)
+            for product in created:
+                deck.add(product.id)
+            self._save_deck(state)
+
+        for product in created:
+            self.events.publish(events.PRODUCT_ADDED, product_id=product.id, product=product)
+        logger.info(f"✅ {len(created)} ta tovar qo'shildi (ID: {created[0].id}-{created[-1].id})")
+        return created
+
+    @synchronized
+    def update_products_bulk(self, product_ids: List[int], **kwargs) -> int:
+        """
+        Bir nechta tovarning maydonlarini bitta tranzaksiyada yangilash
+
+        Args:
+            product_ids: Tovar ID'lari
+            **kwargs: Yangilanadigan maydonlar
+
+        Returns:
+            int: Yangilangan tovarlar soni
+        """
+        fields = {k: v for k, v in kwargs.items() if k in PRODUCT_COLUMNS}
+        if len(fields) != len(kwargs):
+            unknown = set(kwargs) - set(fields)
+            logger.warning(f"⚠️ Noma'lum tovar maydonlari e'tiborsiz qoldirildi: {unknown}")
+
+        ids = list(dict.fromkeys(product_ids))
+        if not ids:
+            return 0
+
+        if fields:
+            assignments = ', '.join(f"{column} = ?" for column in fields)
+            with self._conn:
+                cursor = self._conn.executemany(
+                    f"UPDATE products SET {assignments} WHERE id = ?",
+                    [[*fields.values(), product_id] for product_id in ids]
+                )
+            updated = cursor.rowcount
+        else:
+            updated = len(self._rows_by_ids('products', ids, 'id'))
+
+        if updated:
+            for product_id, product in self.get_products(ids).items():
+                self.events.publish(events.PRODUCT_UPDATED, product_id=product_id, product=product, fields=fields)
+            logger.info(f"✅ {updated} ta tovar yangilandi")
+        if updated < len(ids):
+            logger.warning(f"⚠️ {len(ids) - updated} ta tovar topilmadi")
+        return updated
+
+    @synchronized
+    def delete_products_bulk(self, product_ids: List[int]) -> int:
+        """
+        Bir nechta tovarni bitta tranzaksiyada o'chirish
+
+        Args:
+            product_ids: Tovar ID'lari
+
+        Returns:
+            int: O'chirilgan tovarlar soni
+        """
+        ids = list(dict.fromkeys(product_ids))
+        existing = [row[0] for row in self._rows_by_ids('products', ids, 'id')]
+        with self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM products WHERE id = ?", [(product_id,) for product_id in existing]
+            )
+        deleted = max(cursor.rowcount, 0)
+
+        if deleted:
+            for product_id in existing:
+                self.events.publish(events.PRODUCT_DELETED, product_id=product_id)
+            logger.info(f"✅ {deleted} ta tovar o'chirildi")
+        if deleted < len(ids):
+            logger.warning(f"⚠️ {len(ids) - deleted} ta tovar topilmadi")
+        return deleted
+
+    def _rows_by_ids(self, table: str, ids: List[int], columns: str = '*') -> List[sqlite3.Row]:
+        """
+        ID'lar bo'yicha qatorlar (bitta IN so'rovi, katta ro'yxat bo'laklarga bo'linadi)
+
+        Args:
+            table: Jadval nomi
+            ids: ID'lar
+            columns: Olinadigan ustunlar
+
+        Returns:
+            List[sqlite3.Row]: Topilgan qatorlar (tartib kafolatlanmaydi)
+        """
+        rows = []
+        # SQLite parametrlar soni cheklangan - bo'laklab so'raladi
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows += self._conn.execute(
+                f"SELECT {columns} FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall()
+        return rows
+
+    @synchronized
+    def get_products(self, product_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Bir nechta tovarni bitta so'rovda olish
+
+        Args:
+            product_ids: Tovar ID'lari
+
+        Returns:
+            Dict[int, Dict]: Tovar ID -> tovar (topilmaganlari kalitlarda bo'lmaydi)
+        """
+        rows = self._rows_by_ids('products', list(dict.fromkeys(product_ids)))
+        return {row['id']: self._product(row) for row in rows}
+
+    # ==================== ORDERS ====================
+
+    @synchronized
+    def create_order(self, user_id: int, username: str, product_id: int,
+                     customer_name: str, phone: str, address: str,
+                     quantity: int = 1) -> Dict:
+        """
+        Yangi buyurtma yaratish
+
+        Args:
+            user_id: Telegram user ID
+            username: Telegram username
+            product_id: Tovar ID
+            customer_name: Mijoz ismi
+            phone: Telefon
+            address: Manzil
+            quantity: Miqdor
+
+        Returns:
+            Dict: Yaratilgan buyurtma
+        """
+        # Buyurtma raqamini generatsiya qilish
+        order_number = f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}-{user_id}"
+
+        order = {
+            'order_number': order_number,
+            'user_id': user_id,
+            'username': username,
+            'product_id': product_id,
+            'customer_name': customer_name,
+            'phone': phone,
+            'address': address,
+            'quantity': quantity,
+            'status': 'yangi',
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        order = Order(**order)
+        # Tovarning shu paytdagi nomi va narxi buyurtmaga muhrlanadi
+        product = self.get_product(product_id)
+        if product is not None:
+            order.apply_snapshot(product)
+
+        columns = ORDER_COLUMNS + ORDER_SNAPSHOT_COLUMNS
+        with self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO orders ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                [order[column] for column in columns]
+            )
+        order.id = cursor.lastrowid
+        self.events.publish(events.ORDER_CREATED, order_id=order.id, order=order)
+
+        logger.info(f"✅ Buyurtma yaratildi: {order_number}")
+        return order
+
+    @synchronized
+    def get_order(self, order_id: int) -> Optional[Dict]:
+        """
+        Buyurtmani ID bo'yicha olish
+
+        Args:
+            order_id: Buyurtma ID
+
+        Returns:
+            Optional[Dict]: Buyurtma yoki None
+        """
+        row = self._conn.execute("SELECT * FROM orders WHERE id = ?", (order_id,)).fetchone()
+        order = self._order(row)
+        if order is not None:
+            self._backfill_snapshots([order])
+        return order
+
+    @synchronized
+    def get_orders(self, order_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Bir nechta buyurtmani bitta so'rovda olish
+
+        Args:
+            order_ids: Buyurtma ID'lari
+
+        Returns:
+            Dict[int, Dict]: Buyurtma ID -> buyurtma (topilmaganlari kalitlarda bo'lmaydi)
+        """
+        orders = [self._order(row) for row in self._rows_by_ids('orders', list(dict.fromkeys(order_ids)))]
+        self._backfill_snapshots(orders)
+        return {order.id: order for order in orders}
+
+    def _backfill_snapshots(self, orders: List[Order]):
+        """
+        Tovar nusxasi yo'q eski buyurtmalarni joriy tovardan to'ldirish (lazy migratsiya)
+
+        Args:
+            orders: Ko'rsatiladigan buyurtmalar (tovari o'chirilganlari nusxasiz qoladi)
+        """
+        missing = [order for order in orders if not order.has_snapshot()]
+        if not missing:
+            return
+
+        products = self.get_products([order.product_id for order in missing])
+        filled = []
+        for order in missing:
+            product = products.get(order.product_id)
+            if product is not None:
+                order.apply_snapshot(product)
+                filled.append(order)
+
+        if filled:
+            assignments = ', '.join(f"{column} = ?" for column in ORDER_SNAPSHOT_COLUMNS)
+            with self._conn:
+                self._conn.executemany(
+                    f"UPDATE orders SET {assignments} WHERE id = ? AND product_name IS NULL",
+                    [[order[column] for column in ORDER_SNAPSHOT_COLUMNS] + [order.id] for order in filled]
+                )
+
+    @synchronized
+    def get_user_orders(self, user_id: int) -> List[Dict]:
+        """
+        Foydalanuvchi buyurtmalarini olish
+
+        Args:
+            user_id: Telegram user ID
+
+        Returns:
+            List[Dict]: Buyurtmalar ro'yxati (eng yangi birinchi)
+        """
+        rows = self._conn.execute(
+            "SELECT * FROM orders WHERE user_id = ? ORDER BY created_at DESC, id DESC",
+            (user_id,)
+        ).fetchall()
+        orders = [self._order(row) for row in rows]
+        self._backfill_snapshots(orders)
+        return orders
+
+    @synchronized
+    def get_all_orders(self, include_archived: bool = True) -> List[Dict]:
+        """
+        Barcha buyurtmalarni olish
+
+        Args:
+            include_archived: JSONDatabase bilan moslik uchun (SQLite'da arxiv yo'q)
+
+        Returns:
+            List[Dict]: Buyurtmalar ro'yxati (eng yangi birinchi)
+        """
+        rows = self._conn.execute("SELECT * FROM orders ORDER BY created_at DESC, id DESC")
+        return [self._order(row) for row in rows]
+
+    @synchronized
+    def get_orders_by_status(self, status: str) -> List[Dict]:
+        """
+        Berilgan statusdagi buyurtmalarni olish
+
+        Args:
+            status: Buyurtma statusi
+
+        Returns:
+            List[Dict]: Buyurtmalar ro'yxati (eng yangi birinchi)
+        """
+        rows = self._conn.execute(
+            "SELECT * FROM orders WHERE status = ? ORDER BY created_at DESC, id DESC",
+            (status,)
+        )
+        return [self._order(row) for row in rows]
+
+    @synchronized
+    def count_orders_by_status(self, status: str) -> int:
+        """
+        Berilgan statusdagi buyurtmalar sonini olish
+
+        Args:
+            status: Buyurtma statusi
+
+        Returns:
+            int: Buyurtmalar soni
+        """
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM orders WHERE status = ?", (status,)
+        ).fetchone()[0]
+
+    @synchronized
+    def get_orders_count(self) -> int:
+        """
+        Barcha buyurtmalar sonini olish
+
+        Returns:
+            int: Buyurtmalar soni
+        """
+        return self._conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    @synchronized
+    def get_orders_page(self, offset: int = 0, limit: int = 20,
+                        status: str = None) -> Tuple[List[Dict], int]:
+        """
+        Buyurtmalar sahifasi (eng yangi birinchi, idx_orders_created / idx_orders_status orqali)
+
+        Args:
+            offset: Nechta buyurtma o'tkazib yuboriladi
+            limit: Sahifadagi buyurtmalar soni
+            status: Faqat shu statusdagilar (ixtiyoriy)
+
+        Returns:
+            Tuple[List[Dict], int]: (sahifadagi buyurtmalar, jami buyurtmalar soni)
+        """
+        where, params = ("WHERE status = ?", [status]) if status else ("", [])
+        rows = self._conn.execute(
+            f"SELECT * FROM orders {where} ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+            [*params, limit, offset]
+        ).fetchall()
+        total = self._conn.execute(f"SELECT COUNT(*) FROM orders {where}", params).fetchone()[0]
+        return [self._order(row) for row in rows], total
+
+    @synchronized
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Admin statistikasi (indekslangan COUNT so'rovlari bilan)
+
+        Returns:
+            Dict[str, Any]: JSONDatabase.get_statistics bilan bir xil tuzilma
+        """
+        products, available, categories, users = self._conn.execute(
+            "SELECT (SELECT COUNT(*) FROM products), "
+            "(SELECT COUNT(*) FROM products WHERE is_available = 1), "
+            "(SELECT COUNT(*) FROM categories), "
+            "(SELECT COUNT(*) FROM users)"
+        ).fetchone()
+        by_status = dict(self._conn.execute("SELECT status, COUNT(*) FROM orders GROUP BY status").fetchall())
+        return {
+            'products': products,
+            'available_products': available,
+            'categories': categories,
+            'users': users,
+            'orders': sum(by_status.values()),
+            'orders_by_status': by_status,
+        }
+
+    @synchronized
+    def get_order_analytics(self, days: int = 7) -> Dict[str, Any]:
+        """
+        Buyurtmalar statistikasi (GROUP BY so'rovlari bilan)
+
+        Args:
+            days: Kunlik hisobot uchun oxirgi kunlar soni
+
+        Returns:
+            Dict[str, Any]: JSONDatabase.get_order_analytics bilan bir xil tuzilma
+        """
+        statuses = {status: 0 for status in STATUSES}
+        for status, count in self._conn.execute("SELECT status, COUNT(*) FROM orders GROUP BY status"):
+            statuses[status] = count
+
+        first = datetime.now().date() - timedelta(days=max(days, 1) - 1)
+        daily = {
+            (first + timedelta(days=i)).strftime('%Y-%m-%d'): {'orders': 0, 'quantity': 0}
+            for i in range(max(days, 1))
+        }
+        rows = self._conn.execute(
+            "SELECT substr(created_at, 1, 10) AS day, COUNT(*), SUM(quantity) FROM orders "
+            "WHERE created_at >= ? GROUP BY day",
+            (first.strftime('%Y-%m-%d'),)
+        )
+        for day, count, quantity in rows:
+            if day in daily:
+                daily[day] = {'orders': count, 'quantity': quantity or 0}
+
+        rows = self._conn.execute(
+            "SELECT product_id, SUM(quantity) FROM orders WHERE status != 'bekor' GROUP BY product_id"
+        )
+        return {
+            'statuses': statuses,
+            'daily': daily,
+            'products': {product_id: quantity or 0 for product_id, quantity in rows},
+        }
+
+    @synchronized
+    def update_order_status(self, order_id: int, status: str) -> bool:
+        """
+        Buyurtma statusini yangilash
+
+        Args:
+            order_id: Buyurtma ID
+            status: Yangi status
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        row = self._conn.execute("SELECT status FROM orders WHERE id = ?", (order_id,)).fetchone()
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE orders SET status = ? WHERE id = ?", (status, order_id)
+            )
+
+        if cursor.rowcount:
+            order = self.get_order(order_id)
+            self.events.publish(events.ORDER_STATUS_CHANGED, order_id=order_id, order=order,
+                                old_status=row['status'], status=status)
+            logger.info(f"✅ Buyurtma statusi o'zgartirildi: {order['order_number']} -> {status}")
+            return True
+
+        logger.warning(f"⚠️ Buyurtma topilmadi: ID {order_id}")
+        return False
+
+    @synchronized
+    def update_orders_status_bulk(self, order_ids: List[int], status: str) -> int:
+        """
+        Bir nechta buyurtma statusini bitta tranzaksiyada yangilash
+
+        Args:
+            order_ids: Buyurtma ID'lari
+            status: Yangi status
+
+        Returns:
+            int: Yangilangan buyurtmalar soni
+        """
+        ids = list(dict.fromkeys(order_ids))
+        old_statuses = {row['id']: row['status'] for row in self._rows_by_ids('orders', ids, 'id, status')}
+        with self._conn:
+            cursor = self._conn.executemany(
+                "UPDATE orders SET status = ? WHERE id = ?", [(status, order_id) for order_id in ids]
+            )
+        updated = max(cursor.rowcount, 0)
+
+        if updated:
+            for order_id, order in self.get_orders(list(old_statuses)).items():
+                self.events.publish(events.ORDER_STATUS_CHANGED, order_id=order_id, order=order,
+                                    old_status=old_statuses[order_id], status=status)
+            logger.info(f"✅ {updated} ta buyurtma statusi o'zgartirildi -> {status}")
+        if updated < len(ids):
+            logger.warning(f"⚠️ {len(ids) - updated} ta buyurtma topilmadi")
+        return updated
+
+    def compact_orders(self) -> bool:
+        """
+        JSONDatabase bilan moslik uchun - SQLite'da jurnal yo'q
+
+        Returns:
+            bool: Doim False
+        """
+        return False
+
+    def archive_orders(self, older_than_days: int = None) -> int:
+        """
+        JSONDatabase bilan moslik uchun - SQLite indekslari tufayli eski
+        buyurtmalar so'rovlarni sekinlashtirmaydi, arxiv kerak emas
+
+        Args:
+            older_than_days: Ishlatilmaydi
+
+        Returns:
+            int: Doim 0
+        """
+        return 0
+
+    def count_archived_orders(self, status: str = None) -> int:
+        """
+        JSONDatabase bilan moslik uchun - SQLite da arxiv yo'q
+
+        Args:
+            status: Ishlatilmaydi
+
+        Returns:
+            int: Doim 0
+        """
+        return 0
+
+    def get_archived_orders_page(self, offset: int = 0, limit: int = 20,
+                                 status: str = None) -> Tuple[List[Dict], int]:
+        """
+        JSONDatabase bilan moslik uchun - SQLite da arxiv yo'q
+
+        Args:
+            offset: Ishlatilmaydi
+            limit: Ishlatilmaydi
+            status: Ishlatilmaydi
+
+        Returns:
+            Tuple[List[Dict], int]: Doim ([], 0)
+        """
+        return [], 0
+
+    # ==================== USERS ====================
+
+    @synchronized
+    def add_user(self, user_id: int, username: str = None,
+                 first_name: str = None, last_name: str = None) -> Dict:
+        """
+        Foydalanuvchi qo'shish yoki yangilash
+
+        Qator faqat ma'lumotlar o'zgarganda yangilanadi; last_seen esa
+        yig'ilib, LAST_SEEN_FLUSH_INTERVAL da bir marta yoziladi.
+
+        Args:
+            user_id: Telegram user ID
+            username: Username (ixtiyoriy)
+            first_name: Ism (ixtiyoriy)
+            last_name: Familiya (ixtiyoriy)
+
+        Returns:
+            Dict: Foydalanuvchi ma'lumotlari
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        row = self._conn.execute("SELECT * FROM users WHERE user_id = ?", (user_id,)).fetchone()
+
+        if row is None:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO users (user_id, username, first_name, last_name, is_blocked, created_at, last_seen) "
+                    "VALUES (?, ?, ?, ?, 0, ?, ?)",
+                    (user_id, username, first_name, last_name, now, now)
+                )
+            logger.info(f"✅ Yangi foydalanuvchi: {user_id} (@{username})")
+
+        elif (row['username'], row['first_name'], row['last_name']) != (username, first_name, last_name):
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE users SET username = ?, first_name = ?, last_name = ?, last_seen = ? "
+                    "WHERE user_id = ?",
+                    (username, first_name, last_name, now, user_id)
+                )
+            self._last_seen.pop(user_id, None)
+
+        else:
+            # O'zgarish yo'q - faqat last_seen, u ham keyinroq bitta tranzaksiyada
+            self._last_seen[user_id] = now
+            self._touch_users()
+            user = self._user(row)
+            user.last_seen = now
+            return user
+
+        user = self._user(self._conn.execute("SELECT * FROM users WHERE user_id = ?", (user_id,)).fetchone())
+        if row is None:
+            self.events.publish(events.USER_ADDED, user_id=user_id, user=user)
+        return user
+
+    def _touch_users(self):
+        """
+        last_seen yangilanishlarini yig'ish va LAST_SEEN_FLUSH_INTERVAL da bir marta yozish
+
+        Yig'ish boshlanganda taymer ham o'rnatiladi - bot bo'sh turgan bo'lsa
+        ham last_seen LAST_SEEN_FLUSH_INTERVAL dan kechikmay yoziladi
+        (JSONDatabase bilan bir xil).
+        """
+        now = time.monotonic()
+        if self._last_seen_since is None:
+            self._last_seen_since = now
+            self._schedule_flush()
+        elif now - self._last_seen_since >= config.LAST_SEEN_FLUSH_INTERVAL:
+            self._flush_last_seen()
+
+    def _schedule_flush(self) -> bool:
+        """
+        LAST_SEEN_FLUSH_INTERVAL dan keyin flush rejalashtirish
+
+        Returns:
+            bool: Rejalashtirilgan bo'lsa True (event loop yo'q bo'lsa False)
+        """
+        loop = self._loop
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return False
+
+        try:
+            loop.call_soon_threadsafe(self._arm_flush_timer, loop)
+        except RuntimeError:
+            # Loop yopilgan - last_seen keyingi flush yoki close() bilan yoziladi
+            return False
+        return True
+
+    def _arm_flush_timer(self, loop: asyncio.AbstractEventLoop):
+        """
+        Flush taymerini o'rnatish (event loop oqimida chaqiriladi)
+
+        Args:
+            loop: Event loop
+        """
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = loop.call_later(config.LAST_SEEN_FLUSH_INTERVAL, self._on_flush_timer, loop)
+
+    def _on_flush_timer(self, loop: asyncio.AbstractEventLoop):
+        """
+        Taymer ishlaganda flushni executorda (bo'lsa) yoki shu yerda bajarish
+
+        Args:
+            loop: Event loop
+        """
+        self._flush_timer = None
+        if self._executor is not None and self._loop is loop:
+            loop.run_in_executor(self._executor, self.flush)
+        else:
+            self.flush()
+
+    def _flush_last_seen(self):
+        """
+        Yig'ilgan last_seen qiymatlarini bitta tranzaksiyada yozish
+        """
+        self._last_seen_since = None
+        if not self._last_seen:
+            return
+
+        seen, self._last_seen = self._last_seen, {}
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE users SET last_seen = ? WHERE user_id = ?",
+                [(last_seen, user_id) for user_id, last_seen in seen.items()]
+            )
+
+    @synchronized
+    def get_all_users(self) -> List[Dict]:
+        """
+        Barcha foydalanuvchilarni olish
+
+        Returns:
+            List[Dict]: Foydalanuvchilar ro'yxati
+        """
+        self._flush_last_seen()
+        rows = self._conn.execute("SELECT * FROM users ORDER BY rowid")
+        return [self._user(row) for row in rows]
+
+    @synchronized
+    def get_users_count(self) -> int:
+        """
+        Foydalanuvchilar sonini olish
+
+        Returns:
+            int: Foydalanuvchilar soni
+        """
+        return self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    # ==================== IMPORT ====================
+
+    @synchronized
+    def import_from_json(self, data_dir: str = None) -> Dict[str, int]:
+        """
+        Mavjud data/*.json fayllaridan bir martalik import
+
+        ID'lar saqlanadi, shuning uchun buyurtmalardagi product_id'lar
+        to'g'ri tovarga ishora qilishda davom etadi. meta.json dagi oxirgi
+        berilgan ID'lar ham sqlite_sequence ga ko'chiriladi - o'chirilgan
+        tovarning ID'si yangi tovarga qayta berilmaydi. Qayta ishga tushirish
+        xavfsiz - mavjud yozuvlar yangilanadi.
+
+        Args:
+            data_dir: JSON fayllar papkasi (default: config.DATA_DIR)
+
+        Returns:
+            Dict[str, int]: Har bir kolleksiyadan import qilingan yozuvlar soni
+        """
+        data_dir = data_dir or config.DATA_DIR
+
+        def load(filename: str) -> List:
+            filepath = os.path.join(data_dir, filename)
+            if not os.path.exists(filepath):
+                return []
+            # Fayl istalgan DATA_FORMAT da (pretty/compact/msgpack) bo'lishi mumkin
+            with open(filepath, 'rb') as f:
+                return formats.decode(f.read())
+
+        categories = load(os.path.basename(config.CATEGORIES_FILE))
+        products = load(os.path.basename(config.PRODUCTS_FILE))
+        users = load(os.path.basename(config.USERS_FILE))
+        meta = load(os.path.basename(config.META_FILE)) or {}
+        orders = read_all_orders(os.path.join(data_dir, os.path.basename(config.ORDERS_DIR)))
+        # Hali segmentlarga bo'linmagan eski orders.json
+        orders.extend(load(os.path.basename(config.ORDERS_FILE)))
+
+        # Jurnaldagi, hali snapshotga yig'ilmagan buyurtmalarni ham qo'shish
+        journal_path = os.path.join(data_dir, os.path.basename(config.ORDERS_JOURNAL_FILE))
+        orders = OrderJournal(journal_path).replay(orders)
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO categories (name) VALUES (?)",
+                [(name,) for name in categories]
+            )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO products (id, {', '.join(PRODUCT_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(PRODUCT_COLUMNS))})",
+                [
+                    (p['id'], p.get('category'), p.get('name'), p.get('description'),
+                     float(p.get('price', 0)), p.get('size'), p.get('photo_id'),
+                     int(p.get('is_available', True)), p.get('created_at', ''))
+                    for p in products
+                ]
+            )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO orders (id, {', '.join(ORDER_COLUMNS + ORDER_SNAPSHOT_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(ORDER_COLUMNS + ORDER_SNAPSHOT_COLUMNS))})",
+                [
+                    (o['id'], *[o.get(column) for column in ORDER_COLUMNS + ORDER_SNAPSHOT_COLUMNS])
+                    for o in orders
+                ]
+            )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO users (user_id, {', '.join(USER_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(USER_COLUMNS))})",
+                [
+                    (u['user_id'], u.get('username'), u.get('first_name'), u.get('last_name'),
+                     int(u.get('is_blocked', False)), u.get('created_at', ''), u.get('last_seen'))
+                    for u in users
+                ]
+            )
+            self._seed_sequences(meta.get('sequences', {}))
+
+        counts = {
+            'categories': len(categories),
+            'products': len(products),
+            'orders': len(orders),
+            'users': len(users),
+        }
+        logger.info(f"✅ JSON fayllardan import qilindi: {counts}")
+        return counts
+
+    def _seed_sequences(self, sequences: Dict[str, int]):
+        """
+        AUTOINCREMENT hisoblagichlarini meta.json dagi oxirgi ID'lardan davom ettirish
+
+        Hisoblagich faqat oshiriladi: jadvaldagi eng katta ID dan yoki
+        mavjud qiymatdan kichik bo'lib qolmaydi.
+
+        Args:
+            sequences: Kolleksiya -> oxirgi berilgan ID
+        """
+        for table in ('products', 'orders'):
+            last_id = sequences.get(table)
+            if not last_id:
+                continue
+            updated = self._conn.execute(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (last_id, table)
+            ).rowcount
+            if not updated:
+                self._conn.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, last_id)
+                )
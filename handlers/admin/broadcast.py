@@ -9,7 +9,7 @@ from aiogram.fsm.state import State, StatesGroup
 import asyncio
 
 from keyboars.admin_kb import get_admin_main_menu
-from database.json_db import db
+from database.async_db import AsyncDatabase
 from middlewares.admin_check import AdminFilter
 
 router = Router()
@@ -22,11 +22,11 @@ class BroadcastState(StatesGroup):
 
 
 @router.message(F.text == "✉️ Xabar yuborish")
-async def start_broadcast(message: Message, state: FSMContext):
+async def start_broadcast(message: Message, state: FSMContext, db: AsyncDatabase):
     """Xabar yuborishni boshlash"""
     await state.set_state(BroadcastState.waiting_for_message)
 
-    users_count = db.get_users_count()
+    users_count = await db.get_users_count()
 
     await message.answer(
         f"📢 <b>Xabar yuborish</b>\n\n"
@@ -51,9 +51,9 @@ async def cancel_broadcast(message: Message, state: FSMContext):
 
 
 @router.message(BroadcastState.waiting_for_message)
-async def process_broadcast(message: Message, state: FSMContext):
+async def process_broadcast(message: Message, state: FSMContext, db: AsyncDatabase):
     """Xabarni barcha userlarga yuborish"""
-    users = db.get_all_users()
+    users = await db.get_all_users()
 
     if not users:
         await message.answer("❌ Foydalanuvchilar yo'q")
@@ -9,7 +9,7 @@ from aiogram.fsm.state import State, StatesGroup
 
 import config
 from keyboars.admin_kb import get_categories_admin_keyboard, get_category_manage_keyboard, get_admin_main_menu
-from database.json_db import db
+from database.async_db import AsyncDatabase
 from middlewares.admin_check import AdminFilter
 
 router = Router()
@@ -29,9 +29,9 @@ class EditCategory(StatesGroup):
 
 
 @router.message(F.text == "📂 Kategoriyalar")
-async def categories_menu(message: Message):
+async def categories_menu(message: Message, db: AsyncDatabase):
     """Kategoriyalar menyusi"""
-    categories = db.get_categories()
+    categories = await db.get_categories()
 
     text = f"""
 📂 <b>KATEGORIYALAR BOSHQARUVI</b>
@@ -48,9 +48,9 @@ Kategoriyani tanlang yoki yangi qo'shing:
 
 
 @router.callback_query(F.data == "admin_categories_menu")
-async def categories_menu_callback(callback: CallbackQuery):
+async def categories_menu_callback(callback: CallbackQuery, db: AsyncDatabase):
     """Kategoriyalar menyusiga qaytish"""
-    categories = db.get_categories()
+    categories = await db.get_categories()
 
     text = f"""
 📂 <b>KATEGORIYALAR BOSHQARUVI</b>
@@ -81,7 +81,7 @@ async def start_add_category(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(AddCategory.name)
-async def input_category_name(message: Message, state: FSMContext):
+async def input_category_name(message: Message, state: FSMContext, db: AsyncDatabase):
     """Kategoriya nomini kiritish"""
     category_name = message.text.strip()
 
@@ -90,7 +90,7 @@ async def input_category_name(message: Message, state: FSMContext):
         return
 
     # Kategoriyani qo'shish
-    success = db.add_category(category_name)
+    success = await db.add_category(category_name)
 
     if success:
         await message.answer(
@@ -108,12 +108,12 @@ async def input_category_name(message: Message, state: FSMContext):
 
 
 @router.callback_query(F.data.startswith("admin_manage_category:"))
-async def manage_category(callback: CallbackQuery):
+async def manage_category(callback: CallbackQuery, db: AsyncDatabase):
     """Kategoriyani boshqarish"""
     category = callback.data.split(":", 1)[1]
 
     # Kategoriyada nechta tovar borligini aniqlash
-    products = db.get_products_by_category(category)
+    products = await db.get_products_by_category(category)
     products_count = len(products)
 
     text = f"""
@@ -148,7 +148,7 @@ async def start_edit_category(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(EditCategory.new_name)
-async def input_new_category_name(message: Message, state: FSMContext):
+async def input_new_category_name(message: Message, state: FSMContext, db: AsyncDatabase):
     """Yangi kategoriya nomini kiritish"""
     new_name = message.text.strip()
 
@@ -160,7 +160,7 @@ async def input_new_category_name(message: Message, state: FSMContext):
     old_name = data['old_name']
 
     # Kategoriyani yangilash
-    success = db.update_category(old_name, new_name)
+    success = await db.update_category(old_name, new_name)
 
     if success:
         await message.answer(
@@ -179,16 +179,16 @@ async def input_new_category_name(message: Message, state: FSMContext):
 
 
 @router.callback_query(F.data.startswith("admin_confirm_delete_category:"))
-async def confirm_delete_category(callback: CallbackQuery):
+async def confirm_delete_category(callback: CallbackQuery, db: AsyncDatabase):
     """Kategoriyani o'chirishni tasdiqlash"""
     category = callback.data.split(":", 1)[1]
 
     # Kategoriyada nechta tovar borligini aniqlash
-    products = db.get_products_by_category(category)
+    products = await db.get_products_by_category(category)
     products_count = len(products)
 
     # O'chirish
-    success = db.delete_category(category)
+    success = await db.delete_category(category)
 
     if success:
         warning = f"\n\n⚠️ {products_count} ta tovar ham o'chirildi!" if products_count > 0 else ""
@@ -199,7 +199,7 @@ async def confirm_delete_category(callback: CallbackQuery):
         await callback.answer("🗑 O'chirildi", show_alert=True)
 
         # Kategoriyalar menyusiga qaytish
-        categories = db.get_categories()
+        categories = await db.get_categories()
         await callback.bot.send_message(
             chat_id=callback.message.chat.id,
             text=f"📂 Jami kategoriyalar: {len(categories)}",
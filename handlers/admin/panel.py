@@ -8,9 +8,14 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 
 import config
-from keyboars.admin_kb import get_admin_main_menu, get_orders_list_keyboard, get_order_status_keyboard
+from keyboars.admin_kb import (
+    get_admin_main_menu,
+    get_orders_list_keyboard,
+    get_order_status_keyboard,
+    ORDERS_PER_PAGE
+)
 from keyboars.user_kb import get_main_menu
-from database.json_db import db
+from database.async_db import AsyncDatabase
 from middlewares.admin_check import AdminFilter
 
 router = Router()
@@ -40,74 +45,99 @@ async def user_mode(message: Message, state: FSMContext):
 
 
 @router.message(F.text == "📊 Statistika")
-async def show_statistics(message: Message):
+async def show_statistics(message: Message, db: AsyncDatabase):
     """Statistika ko'rsatish"""
-    products = db.get_all_products()
-    available_products = db.get_available_products()
-    orders = db.get_all_orders()
-    users_count = db.get_users_count()
-    categories = db.get_categories()
-
-    # Statuslar bo'yicha buyurtmalar
-    new_orders = len([o for o in orders if o['status'] == 'yangi'])
-    confirmed_orders = len([o for o in orders if o['status'] == 'tasdiqlandi'])
-    delivering_orders = len([o for o in orders if o['status'] == 'yetkazilmoqda'])
-    delivered_orders = len([o for o in orders if o['status'] == 'yetkazildi'])
-    cancelled_orders = len([o for o in orders if o['status'] == 'bekor'])
+    # Barcha sonlar bazadagi tayyor hisoblagichlardan (O(1))
+    stats = await db.get_statistics()
+    by_status = stats['orders_by_status']
+
+    # Oxirgi 7 kun va eng ko'p buyurtma qilingan tovarlar (ustunli statistika)
+    analytics = await db.get_order_analytics(days=7)
+    week_orders = sum(day['orders'] for day in analytics['daily'].values())
+    week_quantity = sum(day['quantity'] for day in analytics['daily'].values())
+    top_products = sorted(analytics['products'].items(), key=lambda item: item[1], reverse=True)[:3]
+
+    # Tovar nomlari bitta so'rovda olinadi
+    products = await db.get_products([product_id for product_id, _ in top_products])
+
+    top_text = ""
+    for idx, (product_id, quantity) in enumerate(top_products, 1):
+        product = products.get(product_id)
+        name = product['name'] if product else f"#{product_id}"
+        top_text += f"{idx}. {name} - {quantity} dona\n"
 
     stats_text = f"""
 📊 <b>STATISTIKA</b>
 
 📦 <b>Tovarlar:</b>
-• Jami: {len(products)}
-• Mavjud: {len(available_products)}
-• Mavjud emas: {len(products) - len(available_products)}
+• Jami: {stats['products']}
+• Mavjud: {stats['available_products']}
+• Mavjud emas: {stats['products'] - stats['available_products']}
 
-📂 <b>Kategoriyalar:</b> {len(categories)}
+📂 <b>Kategoriyalar:</b> {stats['categories']}
 
 🛒 <b>Buyurtmalar:</b>
-• Jami: {len(orders)}
-• 🆕 Yangi: {new_orders}
-• ✅ Tasdiqlangan: {confirmed_orders}
-• 🚚 Yetkazilmoqda: {delivering_orders}
-• ✔️ Yetkazilgan: {delivered_orders}
-• ❌ Bekor qilingan: {cancelled_orders}
-
-👥 <b>Foydalanuvchilar:</b> {users_count}
+• Jami: {stats['orders']}
+• 🆕 Yangi: {by_status.get('yangi', 0)}
+• ✅ Tasdiqlangan: {by_status.get('tasdiqlandi', 0)}
+• 🚚 Yetkazilmoqda: {by_status.get('yetkazilmoqda', 0)}
+• ✔️ Yetkazilgan: {by_status.get('yetkazildi', 0)}
+• ❌ Bekor qilingan: {by_status.get('bekor', 0)}
+• 📈 Oxirgi 7 kun: {week_orders} ta ({week_quantity} dona)
+
+🏆 <b>Eng ko'p buyurtma qilingan:</b>
+{top_text or "—"}
+👥 <b>Foydalanuvchilar:</b> {stats['users']}
     """
 
     await message.answer(stats_text)
 
 
+def _orders_header(total: int, archived: int) -> str:
+    """
+    Buyurtmalar ro'yxati sarlavhasi
+
+    Jami son statistikadagi bilan bir xil (arxiv bilan), arxivdagilar
+    esa alohida ko'rsatiladi - ular "🗄 Arxiv" ro'yxatida.
+
+    Args:
+        total: Jonli buyurtmalar soni
+        archived: Arxivdagi buyurtmalar soni
+    """
+    text = f"📦 Jami buyurtmalar: {total + archived}\n"
+    if archived:
+        text += f"🗄 Arxivda: {archived}\n"
+    return text + "\nBuyurtmani tanlang:"
+
+
 @router.message(F.text == "📦 Buyurtmalar")
-async def show_orders(message: Message):
+async def show_orders(message: Message, db: AsyncDatabase):
     """Buyurtmalar ro'yxatini ko'rsatish"""
-    orders = db.get_all_orders()
+    # Ro'yxatda jonli buyurtmalar sahifalab ko'rsatiladi - arxivni o'qish shart emas,
+    # arxiv soni manifestdan olinadi
+    orders, total = await db.get_orders_page(0, ORDERS_PER_PAGE)
+    archived = await db.count_archived_orders()
 
-    if not orders:
+    if not total and not archived:
         await message.answer("📭 Buyurtmalar yo'q")
         return
 
     await message.answer(
-        f"📦 Jami buyurtmalar: {len(orders)}\n\n"
-        "Buyurtmani tanlang:",
-        reply_markup=get_orders_list_keyboard(orders)
+        _orders_header(total, archived),
+        reply_markup=get_orders_list_keyboard(orders, total, archived=archived)
     )
 
 
 @router.callback_query(F.data.startswith("admin_order:"))
-async def show_order_detail(callback: CallbackQuery):
+async def show_order_detail(callback: CallbackQuery, db: AsyncDatabase):
     """Buyurtma tafsilotlari"""
     order_id = int(callback.data.split(":")[1])
-    order = db.get_order(order_id)
+    order = await db.get_order(order_id)
 
     if not order:
         await callback.answer("❌ Buyurtma topilmadi", show_alert=True)
         return
 
-    product = db.get_product(order['product_id'])
-    total_price = product['price'] * order['quantity']
-
     status_emoji = {
         'yangi': '🆕',
         'tasdiqlandi': '✅',
@@ -123,10 +153,10 @@ async def show_order_detail(callback: CallbackQuery):
 📅 <b>Sana:</b> {order['created_at']}
 📊 <b>Status:</b> {order['status'].capitalize()}
 
-📦 <b>Tovar:</b> {product['name']}
-💰 <b>Narxi:</b> {product['price']:,.0f} so'm
+📦 <b>Tovar:</b> {order.get('product_name', "Tovar o'chirilgan")}
+💰 <b>Narxi:</b> {order.get('price', 0):,.0f} so'm
 🔢 <b>Miqdor:</b> {order['quantity']}
-💵 <b>Jami:</b> {total_price:,.0f} so'm
+💵 <b>Jami:</b> {order.get('total_price', 0):,.0f} so'm
 
 👤 <b>Mijoz:</b> {order['customer_name']}
 📱 <b>Telefon:</b> {order['phone']}
@@ -136,12 +166,13 @@ async def show_order_detail(callback: CallbackQuery):
 👤 <b>Username:</b> @{order['username']}
     """
 
-    if product.get('photo_id'):
+    # Tovar ma'lumotlari buyurtmaning o'zida (buyurtma paytidagi nusxa)
+    if order.get('photo_id'):
         try:
             await callback.message.delete()
             await callback.bot.send_photo(
                 chat_id=callback.message.chat.id,
-                photo=product['photo_id'],
+                photo=order['photo_id'],
                 caption=order_text,
                 reply_markup=get_order_status_keyboard(order_id)
             )
@@ -160,15 +191,15 @@ async def show_order_detail(callback: CallbackQuery):
 
 
 @router.callback_query(F.data.startswith("admin_order_status:"))
-async def change_order_status(callback: CallbackQuery):
+async def change_order_status(callback: CallbackQuery, db: AsyncDatabase):
     """Buyurtma statusini o'zgartirish"""
     parts = callback.data.split(":")
     order_id = int(parts[1])
     new_status = parts[2]
 
-    db.update_order_status(order_id, new_status)
+    await db.update_order_status(order_id, new_status)
 
-    order = db.get_order(order_id)
+    order = await db.get_order(order_id)
 
     # Mijozga xabar yuborish
     status_messages = {
@@ -190,19 +221,52 @@ async def change_order_status(callback: CallbackQuery):
     await callback.answer(f"✅ Status o'zgartirildi: {new_status}", show_alert=True)
 
     # Buyurtma tafsilotlarini qayta ko'rsatish
-    await show_order_detail(callback)
+    await show_order_detail(callback, db)
 
 
 @router.callback_query(F.data == "admin_orders")
-async def back_to_orders(callback: CallbackQuery):
+async def back_to_orders(callback: CallbackQuery, db: AsyncDatabase):
     """Buyurtmalar ro'yxatiga qaytish"""
-    orders = db.get_all_orders()
+    orders, total = await db.get_orders_page(0, ORDERS_PER_PAGE)
+    archived = await db.count_archived_orders()
 
     await callback.message.delete()
     await callback.bot.send_message(
         chat_id=callback.message.chat.id,
-        text=f"📦 Jami buyurtmalar: {len(orders)}\n\nBuyurtmani tanlang:",
-        reply_markup=get_orders_list_keyboard(orders)
+        text=_orders_header(total, archived),
+        reply_markup=get_orders_list_keyboard(orders, total, archived=archived)
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("admin_orders_page:"))
+async def change_orders_page(callback: CallbackQuery, db: AsyncDatabase):
+    """Buyurtmalar sahifasini o'zgartirish"""
+    page = int(callback.data.split(":")[1])
+    orders, total = await db.get_orders_page(page * ORDERS_PER_PAGE, ORDERS_PER_PAGE)
+    archived = await db.count_archived_orders()
+
+    await callback.message.edit_text(
+        _orders_header(total, archived),
+        reply_markup=get_orders_list_keyboard(orders, total, page, archived=archived)
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("admin_archive_page:"))
+async def show_archived_orders(callback: CallbackQuery, db: AsyncDatabase):
+    """Arxivdagi buyurtmalar sahifasi"""
+    page = int(callback.data.split(":")[1])
+    # Faqat shu sahifaga tushadigan arxiv oylari o'qiladi
+    orders, total = await db.get_archived_orders_page(page * ORDERS_PER_PAGE, ORDERS_PER_PAGE)
+
+    if not total:
+        await callback.answer("📭 Arxiv bo'sh", show_alert=True)
+        return
+
+    await callback.message.edit_text(
+        f"🗄 Arxivdagi buyurtmalar: {total}\n\nBuyurtmani tanlang:",
+        reply_markup=get_orders_list_keyboard(orders, total, page, archive=True)
     )
     await callback.answer()
 
@@ -11,11 +11,12 @@ import config
 from keyboars.admin_kb import (
     get_categories_admin_keyboard,
     get_products_list_keyboard,
+    PRODUCTS_PER_PAGE,
     get_product_manage_keyboard,
     get_confirm_delete_keyboard,
     get_admin_main_menu
 )
-from database.json_db import db
+from database.async_db import AsyncDatabase
 from middlewares.admin_check import AdminFilter
 
 router = Router()
@@ -34,9 +35,9 @@ class AddProduct(StatesGroup):
 
 
 @router.message(F.text == "➕ Tovar qo'shish")
-async def start_add_product(message: Message, state: FSMContext):
+async def start_add_product(message: Message, state: FSMContext, db: AsyncDatabase):
     """Tovar qo'shishni boshlash"""
-    categories = db.get_categories()
+    categories = await db.get_categories()
 
     if not categories:
         await message.answer(
@@ -133,7 +134,7 @@ async def input_size(message: Message, state: FSMContext):
 
 
 @router.message(AddProduct.photo, F.photo)
-async def input_photo(message: Message, state: FSMContext):
+async def input_photo(message: Message, state: FSMContext, db: AsyncDatabase):
     """Rasmni qabul qilish"""
     photo_id = message.photo[-1].file_id
 
@@ -141,7 +142,7 @@ async def input_photo(message: Message, state: FSMContext):
     data = await state.get_data()
 
     # Tovarni qo'shish
-    product = db.add_product(
+    product = await db.add_product(
         category=data['category'],
         name=data['name'],
         description=data.get('description'),
@@ -169,7 +170,7 @@ async def input_photo(message: Message, state: FSMContext):
 
 
 @router.message(AddProduct.photo)
-async def input_no_photo(message: Message, state: FSMContext):
+async def input_no_photo(message: Message, state: FSMContext, db: AsyncDatabase):
     """Rasmsiz tovar qo'shish"""
     if message.text != "-":
         await message.answer(
@@ -181,7 +182,7 @@ async def input_no_photo(message: Message, state: FSMContext):
     data = await state.get_data()
 
     # Tovarni qo'shish
-    product = db.add_product(
+    product = await db.add_product(
         category=data['category'],
         name=data['name'],
         description=data.get('description'),
@@ -205,26 +206,26 @@ async def input_no_photo(message: Message, state: FSMContext):
 
 
 @router.message(F.text == "📋 Tovarlar ro'yxati")
-async def show_products_list(message: Message):
+async def show_products_list(message: Message, db: AsyncDatabase):
     """Tovarlar ro'yxati"""
-    products = db.get_all_products()
+    products, total = await db.get_products_page(0, PRODUCTS_PER_PAGE)
 
     if not products:
         await message.answer(config.MESSAGES['no_products'])
         return
 
     await message.answer(
-        f"📋 Jami tovarlar: {len(products)}\n\n"
+        f"📋 Jami tovarlar: {total}\n\n"
         "Tovarni tanlang:",
-        reply_markup=get_products_list_keyboard(products)
+        reply_markup=get_products_list_keyboard(products, total)
     )
 
 
 @router.callback_query(F.data.startswith("admin_product:"))
-async def show_product_detail(callback: CallbackQuery):
+async def show_product_detail(callback: CallbackQuery, db: AsyncDatabase):
     """Tovar tafsilotlari"""
     product_id = int(callback.data.split(":")[1])
-    product = db.get_product(product_id)
+    product = await db.get_product(product_id)
 
     if not product:
         await callback.answer("❌ Tovar topilmadi", show_alert=True)
@@ -271,22 +272,22 @@ async def show_product_detail(callback: CallbackQuery):
 
 
 @router.callback_query(F.data.startswith("admin_toggle:"))
-async def toggle_availability(callback: CallbackQuery):
+async def toggle_availability(callback: CallbackQuery, db: AsyncDatabase):
     """Mavjudlikni o'zgartirish"""
     product_id = int(callback.data.split(":")[1])
-    db.toggle_product_availability(product_id)
+    await db.toggle_product_availability(product_id)
 
     await callback.answer("✅ Mavjudlik o'zgartirildi", show_alert=True)
 
     # Qayta ko'rsatish
-    await show_product_detail(callback)
+    await show_product_detail(callback, db)
 
 
 @router.callback_query(F.data.startswith("admin_delete:"))
-async def confirm_delete_product(callback: CallbackQuery):
+async def confirm_delete_product(callback: CallbackQuery, db: AsyncDatabase):
     """O'chirishni tasdiqlash"""
     product_id = int(callback.data.split(":")[1])
-    product = db.get_product(product_id)
+    product = await db.get_product(product_id)
 
     if not product:
         await callback.answer("❌ Tovar topilmadi", show_alert=True)
@@ -308,14 +309,14 @@ async def confirm_delete_product(callback: CallbackQuery):
 
 
 @router.callback_query(F.data.startswith("admin_confirm_delete:"))
-async def delete_product(callback: CallbackQuery):
+async def delete_product(callback: CallbackQuery, db: AsyncDatabase):
     """Tovarni o'chirish"""
     product_id = int(callback.data.split(":")[1])
-    product = db.get_product(product_id)
+    product = await db.get_product(product_id)
     product_name = product['name'] if product else "Noma'lum"
 
     # O'chirish
-    db.delete_product(product_id)
+    await db.delete_product(product_id)
 
     await callback.message.edit_text(
         f"✅ {config.MESSAGES['product_deleted']}\n\n"
@@ -331,28 +332,28 @@ async def delete_product(callback: CallbackQuery):
 
 
 @router.callback_query(F.data == "admin_products_list")
-async def back_to_products_list(callback: CallbackQuery):
+async def back_to_products_list(callback: CallbackQuery, db: AsyncDatabase):
     """Tovarlar ro'yxatiga qaytish"""
-    products = db.get_all_products()
+    products, total = await db.get_products_page(0, PRODUCTS_PER_PAGE)
 
     await callback.message.delete()
     await callback.bot.send_message(
         chat_id=callback.message.chat.id,
-        text=f"📋 Jami tovarlar: {len(products)}\n\nTovarni tanlang:",
-        reply_markup=get_products_list_keyboard(products)
+        text=f"📋 Jami tovarlar: {total}\n\nTovarni tanlang:",
+        reply_markup=get_products_list_keyboard(products, total)
     )
     await callback.answer()
 
 
 @router.callback_query(F.data.startswith("admin_page:"))
-async def change_page(callback: CallbackQuery):
+async def change_page(callback: CallbackQuery, db: AsyncDatabase):
     """Sahifani o'zgartirish"""
     page = int(callback.data.split(":")[1])
-    products = db.get_all_products()
+    products, total = await db.get_products_page(page * PRODUCTS_PER_PAGE, PRODUCTS_PER_PAGE)
 
     await callback.message.edit_text(
-        f"📋 Jami tovarlar: {len(products)}\n\nTovarni tanlang:",
-        reply_markup=get_products_list_keyboard(products, page)
+        f"📋 Jami tovarlar: {total}\n\nTovarni tanlang:",
+        reply_markup=get_products_list_keyboard(products, total, page)
     )
     await callback.answer()
 
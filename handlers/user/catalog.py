@@ -12,13 +12,13 @@ from keyboars.user_kb import (
     get_products_keyboard,
     get_product_detail_keyboard
 )
-from database.json_db import db
+from database.async_db import AsyncDatabase
 
 router = Router()
 
 
 @router.message(F.text == "🛍 Tovarlar")
-async def show_categories(message: Message, state: FSMContext):
+async def show_categories(message: Message, state: FSMContext, db: AsyncDatabase):
     """
     Kategoriyalarni ko'rsatish
     Asosiy menyudan "Tovarlar" tugmasi bosilganda
@@ -27,7 +27,7 @@ async def show_categories(message: Message, state: FSMContext):
     await state.clear()
 
     # Kategoriyalarni olish
-    categories = db.get_categories()
+    categories = await db.get_categories()
 
     if not categories:
         await message.answer(
@@ -46,7 +46,7 @@ async def show_categories(message: Message, state: FSMContext):
 
 
 @router.callback_query(F.data.startswith("category:"))
-async def show_products_in_category(callback: CallbackQuery, state: FSMContext):
+async def show_products_in_category(callback: CallbackQuery, state: FSMContext, db: AsyncDatabase):
     """
     Tanlangan kategoriya ichidagi tovarlarni ko'rsatish
     """
@@ -54,7 +54,7 @@ async def show_products_in_category(callback: CallbackQuery, state: FSMContext):
     category = callback.data.split(":", 1)[1]
 
     # Kategoriya bo'yicha tovarlarni olish
-    products = db.get_products_by_category(category)
+    products = await db.get_products_by_category(category)
 
     if not products:
         await callback.answer(
@@ -77,7 +77,7 @@ async def show_products_in_category(callback: CallbackQuery, state: FSMContext):
 
 
 @router.callback_query(F.data == "back_to_categories")
-async def back_to_categories(callback: CallbackQuery, state: FSMContext):
+async def back_to_categories(callback: CallbackQuery, state: FSMContext, db: AsyncDatabase):
     """
     Kategoriyalar ro'yxatiga qaytish
     """
@@ -85,7 +85,7 @@ async def back_to_categories(callback: CallbackQuery, state: FSMContext):
     await state.clear()
 
     # Kategoriyalarni olish
-    categories = db.get_categories()
+    categories = await db.get_categories()
 
     await callback.message.edit_text(
         f"📂 <b>Kategoriyalar</b> ({len(categories)} ta)\n\n"
@@ -96,7 +96,7 @@ async def back_to_categories(callback: CallbackQuery, state: FSMContext):
 
 
 @router.callback_query(F.data.startswith("product:"))
-async def show_product_detail(callback: CallbackQuery, state: FSMContext):
+async def show_product_detail(callback: CallbackQuery, state: FSMContext, db: AsyncDatabase):
     """
     Tovar tafsilotlarini ko'rsatish
     """
@@ -104,7 +104,7 @@ async def show_product_detail(callback: CallbackQuery, state: FSMContext):
     product_id = int(callback.data.split(":")[1])
 
     # Tovarni bazadan olish
-    product = db.get_product(product_id)
+    product = await db.get_product(product_id)
 
     if not product:
         await callback.answer(
@@ -193,7 +193,7 @@ async def product_unavailable_alert(callback: CallbackQuery):
 
 
 @router.callback_query(F.data == "back_to_products")
-async def back_to_products(callback: CallbackQuery, state: FSMContext):
+async def back_to_products(callback: CallbackQuery, state: FSMContext, db: AsyncDatabase):
     """
     Tovarlar ro'yxatiga qaytish
     """
@@ -203,7 +203,7 @@ async def back_to_products(callback: CallbackQuery, state: FSMContext):
 
     if category:
         # Kategoriya ma'lum bo'lsa, o'sha kategoriya tovarlarini ko'rsatish
-        products = db.get_products_by_category(category)
+        products = await db.get_products_by_category(category)
 
         # Eski xabarni o'chirish
         await callback.message.delete()
@@ -217,7 +217,7 @@ async def back_to_products(callback: CallbackQuery, state: FSMContext):
         )
     else:
         # Kategoriya noma'lum bo'lsa, kategoriyalar ro'yxatiga qaytish
-        categories = db.get_categories()
+        categories = await db.get_categories()
 
         await callback.message.delete()
 
@@ -13,7 +13,7 @@ from keyboars.user_kb import (
     get_phone_keyboard,
     get_main_menu
 )
-from database.json_db import db
+from database.async_db import AsyncDatabase
 
 router = Router()
 
@@ -29,7 +29,7 @@ class OrderForm(StatesGroup):
 
 
 @router.callback_query(F.data.startswith("order:"))
-async def start_order(callback: CallbackQuery, state: FSMContext):
+async def start_order(callback: CallbackQuery, state: FSMContext, db: AsyncDatabase):
     """
     Buyurtma jarayonini boshlash
     Tovar tafsilotidan "Buyurtma berish" tugmasi bosilganda ishlaydi
@@ -37,7 +37,7 @@ async def start_order(callback: CallbackQuery, state: FSMContext):
     product_id = int(callback.data.split(":")[1])
 
     # Tovarni tekshirish
-    product = db.get_product(product_id)
+    product = await db.get_product(product_id)
 
     if not product:
         await callback.answer("❌ Tovar topilmadi", show_alert=True)
@@ -310,7 +310,7 @@ async def cancel_order_quantity(message: Message, state: FSMContext):
 
 
 @router.message(OrderForm.waiting_for_quantity)
-async def process_quantity(message: Message, state: FSMContext):
+async def process_quantity(message: Message, state: FSMContext, db: AsyncDatabase):
     """
     Miqdorni qabul qilish va to'lov so'rash
     """
@@ -347,7 +347,7 @@ async def process_quantity(message: Message, state: FSMContext):
     product_size = data.get('product_size')
 
     # Tovar ma'lumotlarini olish
-    product = db.get_product(product_id)
+    product = await db.get_product(product_id)
 
     if not product:
         await message.answer(
@@ -420,7 +420,7 @@ async def cancel_order_payment(message: Message, state: FSMContext):
 
 
 @router.message(OrderForm.waiting_for_payment, F.photo)
-async def process_payment_check(message: Message, state: FSMContext):
+async def process_payment_check(message: Message, state: FSMContext, db: AsyncDatabase):
     """
     To'lov chekini qabul qilish va buyurtmani yaratish
     """
@@ -438,7 +438,7 @@ async def process_payment_check(message: Message, state: FSMContext):
     payment_photo_id = message.photo[-1].file_id
 
     # Tovar ma'lumotlarini olish
-    product = db.get_product(product_id)
+    product = await db.get_product(product_id)
 
     if not product:
         await message.answer("❌ Tovar topilmadi", reply_markup=get_main_menu())
@@ -446,7 +446,7 @@ async def process_payment_check(message: Message, state: FSMContext):
         return
 
     # Buyurtmani bazaga saqlash
-    order = db.create_order(
+    order = await db.create_order(
         user_id=message.from_user.id,
         username=message.from_user.username or "noma'lum",
         product_id=product_id,
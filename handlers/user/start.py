@@ -10,13 +10,13 @@ from aiogram.fsm.context import FSMContext
 
 import config
 from keyboars.user_kb import get_main_menu, get_faq_keyboard, get_orders_history_keyboard
-from database.json_db import db
+from database.async_db import AsyncDatabase
 
 router = Router()
 
 
 @router.message(CommandStart())
-async def cmd_start(message: Message, state: FSMContext):
+async def cmd_start(message: Message, state: FSMContext, db: AsyncDatabase):
     """
     Start buyrug'i - Botga /start yuborganida
     Deep link: /start order_123 - to'g'ri buyurtma formasi
@@ -25,7 +25,7 @@ async def cmd_start(message: Message, state: FSMContext):
     await state.clear()
 
     # Foydalanuvchini bazaga qo'shish/yangilash
-    db.add_user(
+    await db.add_user(
         user_id=message.from_user.id,
         username=message.from_user.username,
         first_name=message.from_user.first_name,
@@ -40,7 +40,7 @@ async def cmd_start(message: Message, state: FSMContext):
             product_id = int(args[1].replace('order_', ''))
 
             # Tovarni olish
-            product = db.get_product(product_id)
+            product = await db.get_product(product_id)
 
             if product and product.get('is_available'):
                 # To'g'ridan-to'g'ri buyurtma formasi
@@ -154,12 +154,12 @@ async def back_to_menu(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(F.text == "📦 Mening buyurtmalarim")
-async def my_orders(message: Message):
+async def my_orders(message: Message, db: AsyncDatabase):
     """
     Foydalanuvchi buyurtmalari tarixi
     """
     # Foydalanuvchi buyurtmalarini olish
-    orders = db.get_user_orders(message.from_user.id)
+    orders = await db.get_user_orders(message.from_user.id)
 
     if not orders:
         await message.answer(
@@ -174,9 +174,8 @@ async def my_orders(message: Message):
 
     # Oxirgi 5 ta buyurtma haqida ma'lumot
     for order in orders[:5]:
-        # Tovar ma'lumotlarini olish
-        product = db.get_product(order['product_id'])
-        product_name = product['name'] if product else "Tovar topilmadi"
+        # Tovar nomi buyurtmaning o'zida saqlangan
+        product_name = order.get('product_name', "Tovar topilmadi")
 
         # Status emoji
         status_emoji = {
@@ -216,7 +215,7 @@ async def my_orders(message: Message):
 
 
 @router.callback_query(F.data.startswith("view_order:"))
-async def view_order_detail(callback: CallbackQuery):
+async def view_order_detail(callback: CallbackQuery, db: AsyncDatabase):
     """
     Buyurtma tafsilotlarini ko'rish
     """
@@ -224,22 +223,17 @@ async def view_order_detail(callback: CallbackQuery):
     order_id = int(callback.data.split(":")[1])
 
     # Buyurtmani olish
-    order = db.get_order(order_id)
+    order = await db.get_order(order_id)
 
     if not order:
         await callback.answer("❌ Buyurtma topilmadi", show_alert=True)
         return
 
-    # Tovar ma'lumotlarini olish
-    product = db.get_product(order['product_id'])
-
-    if not product:
+    # Tovar ma'lumotlari buyurtma paytidagi nusxadan (narx - to'langan narx)
+    if not order.get('product_name'):
         await callback.answer("❌ Tovar topilmadi", show_alert=True)
         return
 
-    # Umumiy narx
-    total_price = product['price'] * order['quantity']
-
     # Status emoji
     status_emoji = {
         'yangi': '🆕',
@@ -273,11 +267,11 @@ async def view_order_detail(callback: CallbackQuery):
 ━━━━━━━━━━━━━━━━━━━━
 
 📦 <b>TOVAR:</b>
-• Nomi: {product['name']}
-• Kategoriya: {product['category']}
-• Narxi: {product['price']:,.0f} so'm
+• Nomi: {order['product_name']}
+• Kategoriya: {order.get('category', '—')}
+• Narxi: {order.get('price', 0):,.0f} so'm
 • Miqdor: {order['quantity']} dona
-• <b>JAMI: {total_price:,.0f} so'm</b>
+• <b>JAMI: {order.get('total_price', 0):,.0f} so'm</b>
 
 ━━━━━━━━━━━━━━━━━━━━
 
@@ -290,12 +284,12 @@ async def view_order_detail(callback: CallbackQuery):
     """
 
     # Agar tovar rasmi bo'lsa
-    if product.get('photo_id'):
+    if order.get('photo_id'):
         try:
             await callback.message.delete()
             await callback.bot.send_photo(
                 chat_id=callback.message.chat.id,
-                photo=product['photo_id'],
+                photo=order['photo_id'],
                 caption=detail_text
             )
         except Exception:
@@ -9,7 +9,13 @@ from aiogram.types import (
     InlineKeyboardButton
 )
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
-from typing import List, Dict
+from typing import List
+
+from database.models import Order, Product
+
+# Ro'yxatlarda bir sahifadagi elementlar soni
+PRODUCTS_PER_PAGE = 10
+ORDERS_PER_PAGE = 20
 
 
 def get_admin_main_menu() -> ReplyKeyboardMarkup:
@@ -183,38 +189,20 @@ def get_product_manage_keyboard(product_id: int) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
-def get_products_list_keyboard(products: List[Dict], page: int = 0, per_page: int = 10) -> InlineKeyboardMarkup:
+def _page_buttons(page: int, per_page: int, total: int, prefix: str) -> List[InlineKeyboardButton]:
     """
-    Tovarlar ro'yxati klaviaturasi (sahifalash bilan)
+    Sahifalash tugmalari (oldingi, sahifa raqami, keyingi)
 
     Args:
-        products: Tovarlar ro'yxati
         page: Joriy sahifa (0 dan boshlanadi)
-        per_page: Har bir sahifada nechta tovar
-    """
-    builder = InlineKeyboardBuilder()
-
-    # Sahifalash
-    start = page * per_page
-    end = start + per_page
-    page_products = products[start:end]
-
-    # Har bir tovar uchun tugma
-    for product in page_products:
-        # Status emoji
-        status = "✅" if product.get('is_available', True) else "❌"
-
-        # Tugma teksti
-        text = f"{status} {product['name']} ({product['price']:,.0f} so'm)"
-
-        builder.row(
-            InlineKeyboardButton(
-                text=text,
-                callback_data=f"admin_product:{product['id']}"
-            )
-        )
+        per_page: Har bir sahifadagi elementlar soni
+        total: Jami elementlar soni
+        prefix: Callback prefiksi (masalan, "admin_page")
 
-    # Sahifalash tugmalari
+    Returns:
+        List[InlineKeyboardButton]: Tugmalar
+    """
+    total_pages = max((total + per_page - 1) // per_page, 1)
     nav_buttons = []
 
     # Oldingi sahifa
@@ -222,12 +210,11 @@ def get_products_list_keyboard(products: List[Dict], page: int = 0, per_page: in
         nav_buttons.append(
             InlineKeyboardButton(
                 text="⬅️ Oldingi",
-                callback_data=f"admin_page:{page - 1}"
+                callback_data=f"{prefix}:{page - 1}"
             )
         )
 
     # Sahifa raqami
-    total_pages = (len(products) + per_page - 1) // per_page
     nav_buttons.append(
         InlineKeyboardButton(
             text=f"📄 {page + 1}/{total_pages}",
@@ -236,14 +223,47 @@ def get_products_list_keyboard(products: List[Dict], page: int = 0, per_page: in
     )
 
     # Keyingi sahifa
-    if end < len(products):
+    if (page + 1) * per_page < total:
         nav_buttons.append(
             InlineKeyboardButton(
                 text="Keyingi ➡️",
-                callback_data=f"admin_page:{page + 1}"
+                callback_data=f"{prefix}:{page + 1}"
             )
         )
 
+    return nav_buttons
+
+
+def get_products_list_keyboard(products: List[Product], total: int, page: int = 0,
+                               per_page: int = PRODUCTS_PER_PAGE) -> InlineKeyboardMarkup:
+    """
+    Tovarlar ro'yxati klaviaturasi (sahifalash bilan)
+
+    Args:
+        products: Joriy sahifadagi tovarlar (db.get_products_page)
+        total: Jami tovarlar soni
+        page: Joriy sahifa (0 dan boshlanadi)
+        per_page: Har bir sahifada nechta tovar
+    """
+    builder = InlineKeyboardBuilder()
+
+    # Har bir tovar uchun tugma
+    for product in products:
+        # Status emoji
+        status = "✅" if product.is_available else "❌"
+
+        # Tugma teksti
+        text = f"{status} {product.name} ({product.price:,.0f} so'm)"
+
+        builder.row(
+            InlineKeyboardButton(
+                text=text,
+                callback_data=f"admin_product:{product.id}"
+            )
+        )
+
+    # Sahifalash tugmalari
+    nav_buttons = _page_buttons(page, per_page, total, "admin_page")
     if nav_buttons:
         builder.row(*nav_buttons)
 
@@ -294,20 +314,24 @@ def get_order_status_keyboard(order_id: int) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
-def get_orders_list_keyboard(orders: List[Dict], limit: int = 20) -> InlineKeyboardMarkup:
+def get_orders_list_keyboard(orders: List[Order], total: int, page: int = 0,
+                             per_page: int = ORDERS_PER_PAGE, archived: int = 0,
+                             archive: bool = False) -> InlineKeyboardMarkup:
     """
-    Buyurtmalar ro'yxati klaviaturasi
+    Buyurtmalar ro'yxati klaviaturasi (sahifalash bilan)
 
     Args:
-        orders: Buyurtmalar ro'yxati
-        limit: Ko'rsatiladigan maksimal buyurtmalar soni
+        orders: Joriy sahifadagi buyurtmalar (db.get_orders_page yoki
+            db.get_archived_orders_page)
+        total: Ro'yxatdagi jami buyurtmalar soni
+        page: Joriy sahifa (0 dan boshlanadi)
+        per_page: Har bir sahifada nechta buyurtma
+        archived: Arxivdagi buyurtmalar soni (jonli ro'yxatda arxiv tugmasi uchun)
+        archive: Arxiv ro'yxati ko'rsatilyaptimi
     """
     builder = InlineKeyboardBuilder()
 
-    # Faqat eng yangi buyurtmalar
-    recent_orders = orders[:limit]
-
-    for order in recent_orders:
+    for order in orders:
         # Status emoji
         status_emoji = {
             'yangi': '🆕',
@@ -315,25 +339,48 @@ def get_orders_list_keyboard(orders: List[Dict], limit: int = 20) -> InlineKeybo
             'yetkazilmoqda': '🚚',
             'yetkazildi': '✔️',
             'bekor': '❌'
-        }.get(order.get('status', 'yangi'), '❓')
+        }.get(order.status or 'yangi', '❓')
 
         # Tugma teksti
-        text = f"{status_emoji} {order['order_number']}"
+        text = f"{status_emoji} {order.order_number}"
 
         builder.row(
             InlineKeyboardButton(
                 text=text,
-                callback_data=f"admin_order:{order['id']}"
+                callback_data=f"admin_order:{order.id}"
+            )
+        )
+
+    # Sahifalash tugmalari
+    prefix = "admin_archive_page" if archive else "admin_orders_page"
+    nav_buttons = _page_buttons(page, per_page, total, prefix)
+    if nav_buttons:
+        builder.row(*nav_buttons)
+
+    # Arxivdagi buyurtmalar alohida ro'yxatda
+    if not archive and archived:
+        builder.row(
+            InlineKeyboardButton(
+                text=f"🗄 Arxiv ({archived})",
+                callback_data="admin_archive_page:0"
             )
         )
 
     # Orqaga
-    builder.row(
-        InlineKeyboardButton(
-            text="« Admin panel",
-            callback_data="admin_menu"
+    if archive:
+        builder.row(
+            InlineKeyboardButton(
+                text="« Buyurtmalar",
+                callback_data="admin_orders"
+            )
+        )
+    else:
+        builder.row(
+            InlineKeyboardButton(
+                text="« Admin panel",
+                callback_data="admin_menu"
+            )
         )
-    )
 
     return builder.as_markup()
 
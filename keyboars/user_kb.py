@@ -9,7 +9,9 @@ from aiogram.types import (
     InlineKeyboardButton
 )
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
-from typing import List, Dict
+from typing import List
+
+from database.models import Order, Product
 
 
 def get_main_menu() -> ReplyKeyboardMarkup:
@@ -74,12 +76,12 @@ def get_categories_keyboard(categories: List[str]) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
-def get_products_keyboard(products: List[Dict], category: str) -> InlineKeyboardMarkup:
+def get_products_keyboard(products: List[Product], category: str) -> InlineKeyboardMarkup:
     """
     Kategoriya ichidagi tovarlar klaviaturasi
 
     Args:
-        products: Tovarlar ro'yxati (dict list)
+        products: Tovarlar ro'yxati
         category: Kategoriya nomi
 
     Returns:
@@ -90,12 +92,12 @@ def get_products_keyboard(products: List[Dict], category: str) -> InlineKeyboard
     # Har bir tovar uchun tugma
     for product in products:
         # Tovar nomi va narxi
-        text = f"{product['name']} - {product['price']:,.0f} so'm"
+        text = f"{product.name} - {product.price:,.0f} so'm"
 
         builder.row(
             InlineKeyboardButton(
                 text=text,
-                callback_data=f"product:{product['id']}"
+                callback_data=f"product:{product.id}"
             )
         )
 
@@ -257,7 +259,7 @@ def get_phone_keyboard() -> ReplyKeyboardMarkup:
     )
 
 
-def get_orders_history_keyboard(orders: List[Dict]) -> InlineKeyboardMarkup:
+def get_orders_history_keyboard(orders: List[Order]) -> InlineKeyboardMarkup:
     """
     Buyurtmalar tarixi klaviaturasi
 
@@ -277,14 +279,14 @@ def get_orders_history_keyboard(orders: List[Dict]) -> InlineKeyboardMarkup:
             'yetkazilmoqda': '🚚',
             'yetkazildi': '✔️',
             'bekor': '❌'
-        }.get(order['status'], '❓')
+        }.get(order.status, '❓')
 
-        text = f"{status_emoji} {order['order_number']}"
+        text = f"{status_emoji} {order.order_number}"
 
         builder.row(
             InlineKeyboardButton(
                 text=text,
-                callback_data=f"view_order:{order['id']}"
+                callback_data=f"view_order:{order.id}"
             )
         )
 
@@ -0,0 +1,59 @@
+"""
+Testlar uchun umumiy fixture'lar
+
+Har bir test o'z vaqtinchalik data papkasida ishlaydi: config dagi
+barcha fayl yo'llari shu papkaga yo'naltiriladi.
+"""
+
+import pytest
+
+import config
+
+# config atributi -> data papkasiga nisbatan yo'l
+DATA_PATHS = {
+    'DATA_DIR': '',
+    'PRODUCTS_FILE': 'products.json',
+    'ORDERS_FILE': 'orders.json',
+    'ORDERS_DIR': 'orders',
+    'ORDERS_MANIFEST_FILE': 'orders/manifest.json',
+    'ORDERS_ARCHIVE_DIR': 'orders/archive',
+    'USERS_FILE': 'users.json',
+    'CATEGORIES_FILE': 'categories.json',
+    'META_FILE': 'meta.json',
+    'TXN_FILE': 'txn.json',
+    'ORDERS_JOURNAL_FILE': 'orders.journal',
+    'SQLITE_FILE': 'shop.db',
+    'DATA_LOCK_FILE': '.lock',
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """
+    config dagi data yo'llarini vaqtinchalik papkaga yo'naltirish
+
+    Returns:
+        pathlib.Path: Data papkasi
+    """
+    for name, relative in DATA_PATHS.items():
+        monkeypatch.setattr(config, name, str(tmp_path / relative) if relative else str(tmp_path))
+    monkeypatch.setattr(config, 'DATA_FORMAT', 'pretty')
+    monkeypatch.setattr(config, 'DATA_LOCK_ENABLED', False)
+    monkeypatch.setattr(config, 'ORDERS_JOURNAL_ENABLED', True)
+    return tmp_path
+
+
+@pytest.fixture(params=['json', 'memory', 'sqlite'])
+def backend(request, data_dir):
+    """
+    Har bir backend (JSON, xotira, SQLite) uchun yangi baza
+
+    Returns:
+        StorageBackend: Baza
+    """
+    from database import create_backend
+
+    db = create_backend(request.param)
+    yield db
+    if request.param == 'sqlite':
+        db.close()
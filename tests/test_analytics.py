@@ -0,0 +1,143 @@
+"""
+Buyurtmalar statistikasi: ustunli nusxa, yig'indilar va manifestdan qurish
+"""
+
+import json
+from datetime import datetime
+
+import config
+from database.base import DEFAULT_CATEGORIES
+from database.columns import OrderColumns
+from database.json_db import JSONDatabase
+from database.segments import OrderManifest, segment_path
+
+TODAY = datetime(2024, 3, 10, 15, 0)
+
+
+def order(order_id, product_id, quantity, status, created_at):
+    return {'id': order_id, 'user_id': 7, 'product_id': product_id, 'quantity': quantity,
+            'status': status, 'created_at': created_at}
+
+
+ORDERS = [
+    order(1, 1, 2, 'yangi', '2024-03-10 09:00:00'),
+    order(2, 1, 1, 'bekor', '2024-03-10 10:00:00'),
+    order(3, 2, 5, 'yetkazildi', '2024-03-09 23:59:59'),
+    order(4, 2, 1, 'yangi', '2024-02-01 12:00:00'),
+]
+
+
+def report(columns):
+    return (columns.status_counts(), columns.daily_totals(3, today=TODAY),
+            columns.product_quantities(exclude=('bekor',)))
+
+
+def test_columns_aggregates():
+    columns = OrderColumns()
+    columns.extend(ORDERS)
+
+    statuses, daily, products = report(columns)
+
+    assert len(columns) == 4
+    assert statuses == {'yangi': 2, 'tasdiqlandi': 0, 'yetkazilmoqda': 0, 'yetkazildi': 1, 'bekor': 1}
+    assert daily == {
+        '2024-03-08': {'orders': 0, 'quantity': 0},
+        '2024-03-09': {'orders': 1, 'quantity': 5},
+        '2024-03-10': {'orders': 2, 'quantity': 3},
+    }
+    assert products == {1: 2, 2: 6}
+
+
+def test_status_change_moves_totals():
+    columns = OrderColumns()
+    columns.extend(ORDERS)
+
+    changed = dict(ORDERS[0], status='bekor')
+    assert columns.set_status(changed, 'yangi')
+
+    statuses, _, products = report(columns)
+    assert statuses['yangi'] == 1
+    assert statuses['bekor'] == 2
+    assert products == {2: 6}
+
+    # Qayta qo'shish eski qiymatlarni almashtiradi
+    columns.append(dict(ORDERS[2], quantity=1))
+    assert report(columns)[2] == {2: 2}
+    assert len(columns) == 4
+
+
+def test_merged_segment_matches_rows():
+    manifest = OrderManifest()
+    manifest.update('2024-03', ORDERS[:3])
+    manifest.update('2024-02', ORDERS[3:])
+    manifest = OrderManifest(json.loads(json.dumps(manifest.to_dict())))
+
+    merged = OrderColumns()
+    assert merged.merge(manifest.segments['2024-03'])
+    assert merged.merge(manifest.segments['2024-02'])
+    assert not merged.merge({'count': 1, 'statuses': {'yangi': 1}})
+
+    rows = OrderColumns()
+    rows.extend(ORDERS)
+
+    assert len(merged) == 0
+    assert report(merged) == report(rows)
+
+    # Ustunda yo'q buyurtmaning statusi ham yig'indilarda hisobga olinadi
+    assert not merged.set_status(dict(ORDERS[3], status='bekor'), 'yangi')
+    rows.set_status(dict(ORDERS[3], status='bekor'), 'yangi')
+    assert report(merged) == report(rows)
+
+
+def test_analytics_agree_across_backends(backend):
+    first = backend.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 100)
+    second = backend.add_product(DEFAULT_CATEGORIES[0], 'B', 'd', 100)
+    backend.create_order(1, 'ali', first['id'], 'Ali', '+998', 'Toshkent', quantity=2)
+    backend.create_order(1, 'ali', second['id'], 'Ali', '+998', 'Toshkent', quantity=3)
+    backend.create_order(1, 'ali', second['id'], 'Ali', '+998', 'Toshkent', quantity=4)
+    backend.update_order_status(3, 'bekor')
+
+    analytics = backend.get_order_analytics(days=2)
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    assert analytics['statuses']['yangi'] == 2
+    assert analytics['statuses']['bekor'] == 1
+    assert analytics['daily'][today] == {'orders': 3, 'quantity': 9}
+    assert len(analytics['daily']) == 2
+    assert analytics['products'] == {first['id']: 2, second['id']: 3}
+
+
+def test_cold_segments_are_not_read(data_dir):
+    orders = []
+    for month in ('2023-01', '2023-02', '2023-03'):
+        for day, status in ((5, 'yangi'), (6, 'bekor')):
+            order_id = len(orders) + 1
+            orders.append({
+                'id': order_id, 'order_number': f'ORD-{order_id}', 'user_id': 7,
+                'username': 'u', 'product_id': order_id % 2 + 1, 'customer_name': 'Ali',
+                'phone': '+998', 'address': 'Toshkent', 'quantity': order_id,
+                'created_at': f'{month}-{day:02d} 12:00:00', 'status': status,
+            })
+    with open(config.ORDERS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(orders, f)
+    JSONDatabase()
+
+    db = JSONDatabase()
+    assert db.get_orders_count() == 6
+    assert db._unloaded_segments() == ['2023-01', '2023-02', '2023-03']
+    reads = []
+    load_json = db._load_json
+    db._load_json = lambda filepath: reads.append(filepath) or load_json(filepath)
+
+    analytics = db.get_order_analytics(days=7)
+
+    assert reads == []
+    assert analytics['statuses']['yangi'] == 3
+    assert analytics['statuses']['bekor'] == 3
+    # Toq ID'lar - yangi (2-tovar), juftlari - bekor qilingan (1-tovar)
+    assert analytics['products'] == {2: 1 + 3 + 5}
+
+    # Sovuq segmentdagi buyurtma bekor qilinsa tovar yig'indisidan chiqadi
+    assert db.update_order_status(3, 'bekor')
+    assert db.get_order_analytics(days=7)['products'] == {2: 1 + 5}
+    assert segment_path('2023-02') in reads
@@ -0,0 +1,123 @@
+"""
+Buyurtmalar arxivi: arxivlash, admin uchun arxiv sahifalari va qaytarish
+"""
+
+import json
+
+import pytest
+
+import config
+from database import create_backend
+from database.json_db import JSONDatabase
+
+MONTHS = ['2024-01', '2024-02', '2024-03']
+
+
+@pytest.fixture
+def archived_db(data_dir):
+    """
+    Har oyda uchta yetkazilgan va bitta yangi buyurtma, yetkazilganlari arxivlangan
+
+    Returns:
+        JSONDatabase: Baza (diskdan qayta ochilgan - arxiv hali o'qilmagan)
+    """
+    orders = []
+    for month in MONTHS:
+        for day, status in ((5, 'yetkazildi'), (10, 'yetkazildi'), (15, 'yetkazildi'), (20, 'yangi')):
+            order_id = len(orders) + 1
+            orders.append({
+                'id': order_id, 'order_number': f'ORD-{order_id}', 'user_id': 7,
+                'username': 'u', 'product_id': 1, 'customer_name': 'Ali', 'phone': '+998',
+                'address': 'Toshkent', 'quantity': 1, 'created_at': f'{month}-{day:02d} 12:00:00',
+                'status': status,
+            })
+    with open(config.ORDERS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(orders, f)
+
+    assert JSONDatabase().archive_orders(older_than_days=30) == 9
+    return JSONDatabase()
+
+
+def test_live_page_excludes_archive(archived_db):
+    orders, total = archived_db.get_orders_page(0, 20)
+
+    assert total == 3
+    assert [o['id'] for o in orders] == [12, 8, 4]
+    assert archived_db.count_archived_orders() == 9
+    assert archived_db.count_archived_orders('yetkazildi') == 9
+    assert archived_db.count_archived_orders('yangi') == 0
+    # Sarlavhadagi jami statistikadagi bilan bir xil
+    assert total + archived_db.count_archived_orders() == archived_db.get_statistics()['orders']
+
+
+def test_archive_pages_are_newest_first(archived_db):
+    pages = [archived_db.get_archived_orders_page(offset, 4) for offset in (0, 4, 8)]
+
+    assert [total for _, total in pages] == [9, 9, 9]
+    assert [[o['id'] for o in page] for page, _ in pages] == [[11, 10, 9, 7], [6, 5, 3, 2], [1]]
+    assert archived_db.get_archived_orders_page(12, 4) == ([], 9)
+
+
+def test_archive_page_reads_only_needed_months(archived_db):
+    page, _ = archived_db.get_archived_orders_page(0, 3)
+
+    assert [o['id'] for o in page] == [11, 10, 9]
+    assert archived_db._archive_loaded == {'2024-03'}
+
+    page, _ = archived_db.get_archived_orders_page(3, 3)
+
+    assert [o['id'] for o in page] == [7, 6, 5]
+    assert archived_db._archive_loaded == {'2024-03', '2024-02'}
+
+
+def test_archive_page_by_status(archived_db):
+    assert archived_db.get_archived_orders_page(0, 20, status='yangi') == ([], 0)
+    page, total = archived_db.get_archived_orders_page(0, 2, status='yetkazildi')
+    assert total == 9
+    assert [o['id'] for o in page] == [11, 10]
+
+
+def test_archived_order_lookup_and_restore(archived_db):
+    assert archived_db.get_order(5)['order_number'] == 'ORD-5'
+
+    assert archived_db.update_order_status(5, 'bekor')
+
+    assert archived_db.count_archived_orders() == 8
+    assert 5 not in [o['id'] for o in archived_db.get_archived_orders_page(0, 20)[0]]
+    assert archived_db.get_order(5)['status'] == 'bekor'
+    assert archived_db.get_orders_page(0, 20)[1] == 4
+
+    # Qaytarilgan buyurtma diskda ham jonli segmentda
+    reopened = JSONDatabase()
+    assert reopened.count_archived_orders() == 8
+    assert reopened.get_order(5)['status'] == 'bekor'
+    assert reopened.get_statistics()['orders'] == 12
+
+
+@pytest.mark.parametrize('name', ['memory', 'sqlite'])
+def test_backends_without_archive(data_dir, name):
+    backend = create_backend(name)
+
+    assert backend.archive_orders(older_than_days=0) == 0
+    assert backend.count_archived_orders() == 0
+    assert backend.get_archived_orders_page(0, 10) == ([], 0)
+    if name == 'sqlite':
+        backend.close()
+
+
+def test_orders_keyboard_links_archive(archived_db):
+    from keyboars.admin_kb import get_orders_list_keyboard
+
+    def callbacks(markup):
+        return [button.callback_data for row in markup.inline_keyboard for button in row]
+
+    orders, total = archived_db.get_orders_page(0, 20)
+    live = callbacks(get_orders_list_keyboard(orders, total, archived=9))
+    assert 'admin_archive_page:0' in live
+    assert live[-1] == 'admin_menu'
+
+    orders, total = archived_db.get_archived_orders_page(0, 5)
+    archive = callbacks(get_orders_list_keyboard(orders, total, archive=True, per_page=5))
+    assert 'admin_archive_page:1' in archive
+    assert 'admin_archive_page:0' not in archive
+    assert archive[-1] == 'admin_orders'
@@ -0,0 +1,97 @@
+"""
+AsyncDatabase: chaqiruvlar executorda, yozuvlar navbatda, close() hammasini saqlaydi
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+import config
+from database import create_backend, formats
+from database.async_db import AsyncDatabase
+from database.base import DEFAULT_CATEGORIES
+
+
+def test_calls_run_off_the_event_loop(data_dir):
+    backend = create_backend('json')
+    threads = []
+    original = backend.get_categories
+
+    def recording():
+        threads.append(threading.current_thread().name)
+        return original()
+
+    backend.get_categories = recording
+
+    async def main():
+        db = AsyncDatabase(backend)
+        categories = await db.get_categories()
+        await db.close()
+        return categories
+
+    assert asyncio.run(main()) == DEFAULT_CATEGORIES
+    assert threads[0].startswith('db') and threads[0] != threading.main_thread().name
+
+
+def test_private_and_missing_attributes_are_not_proxied(data_dir):
+    db = AsyncDatabase(create_backend('memory'))
+
+    with pytest.raises(AttributeError):
+        db._read_json
+    with pytest.raises(AttributeError):
+        db.no_such_method
+    assert db.events is db.backend.events
+
+
+def test_concurrent_writes_to_one_collection_are_serialized(data_dir):
+    backend = create_backend('json')
+    active, overlaps = [0], []
+    original = backend.add_product
+
+    def tracking(*args, **kwargs):
+        active[0] += 1
+        overlaps.append(active[0])
+        try:
+            return original(*args, **kwargs)
+        finally:
+            active[0] -= 1
+
+    backend.add_product = tracking
+
+    async def main():
+        db = AsyncDatabase(backend)
+        products = await asyncio.gather(*(
+            db.add_product(DEFAULT_CATEGORIES[0], f'P{i}', 'd', 1.0) for i in range(20)
+        ))
+        await db.close()
+        return products
+
+    products = asyncio.run(main())
+
+    assert max(overlaps) == 1
+    assert sorted(p['id'] for p in products) == list(range(1, 21))
+
+
+@pytest.mark.parametrize('name', ['json', 'sqlite'])
+def test_close_persists_pending_writes(data_dir, name):
+    async def main():
+        db = AsyncDatabase(create_backend(name))
+        await db.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 1.0)
+        await db.add_user(1, 'ali')
+        await db.close()
+        return db
+
+    db = asyncio.run(main())
+
+    reopened = create_backend(name)
+    assert [p['name'] for p in reopened.get_all_products()] == ['A']
+    assert reopened.get_users_count() == 1
+    if name == 'json':
+        # Yopilgandan keyin baza event loopga bog'lanmagan
+        assert db.backend._loop is None
+        with open(config.PRODUCTS_FILE, 'rb') as f:
+            assert formats.decode(f.read())[0]['name'] == 'A'
+    else:
+        reopened.close()
+        db.backend.close()
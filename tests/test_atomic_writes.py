@@ -0,0 +1,92 @@
+"""
+Atomik yozish: intent-log (TXN_FILE) orqali tiklash va group commit
+"""
+
+import asyncio
+import json
+import os
+
+import config
+from database import formats
+from database.json_db import JSONDatabase
+
+
+def read(filepath):
+    with open(filepath, 'rb') as f:
+        return formats.decode(f.read())
+
+
+def write_txn(moves):
+    with open(config.TXN_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'moves': moves}, f)
+
+
+def test_committed_transaction_is_rolled_forward(data_dir):
+    JSONDatabase()
+    # Intent-log yozilgan, lekin almashtirishlar tugamagan (uzilish)
+    with open(f"{config.CATEGORIES_FILE}.tmp", 'wb') as f:
+        f.write(formats.encode(['Yangi']))
+    with open(f"{config.PRODUCTS_FILE}.tmp", 'wb') as f:
+        f.write(formats.encode([{'id': 1, 'category': 'Yangi', 'name': 'A', 'description': 'd', 'price': 1.0}]))
+    write_txn([[f"{config.CATEGORIES_FILE}.tmp", config.CATEGORIES_FILE],
+               [f"{config.PRODUCTS_FILE}.tmp", config.PRODUCTS_FILE]])
+
+    db = JSONDatabase()
+
+    assert not os.path.exists(config.TXN_FILE)
+    assert not os.path.exists(f"{config.PRODUCTS_FILE}.tmp")
+    assert db.get_categories() == ['Yangi']
+    assert [p['name'] for p in db.get_all_products()] == ['A']
+
+
+def test_partially_applied_transaction_is_completed(data_dir):
+    JSONDatabase()
+    with open(f"{config.USERS_FILE}.tmp", 'wb') as f:
+        f.write(formats.encode([{'user_id': 5, 'username': 'u'}]))
+    # Birinchi almashtirish bajarilib bo'lgan - .tmp fayli yo'q
+    write_txn([[f"{config.CATEGORIES_FILE}.tmp", config.CATEGORIES_FILE],
+               [f"{config.USERS_FILE}.tmp", config.USERS_FILE]])
+    categories = read(config.CATEGORIES_FILE)
+
+    db = JSONDatabase()
+
+    assert not os.path.exists(config.TXN_FILE)
+    assert db.get_categories() == categories
+    assert [u['user_id'] for u in db.get_all_users()] == [5]
+
+
+def test_uncommitted_temp_files_are_ignored(data_dir):
+    categories = JSONDatabase().get_categories()
+    # Intent-log yozilmasdan oldin uzilgan - asl fayllar o'zgarmasligi kerak
+    with open(f"{config.CATEGORIES_FILE}.tmp", 'wb') as f:
+        f.write(formats.encode(['Yarim']))
+
+    assert JSONDatabase().get_categories() == categories
+
+
+def test_writes_in_one_loop_tick_are_group_committed(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'WRITE_BEHIND_ENABLED', False)
+    db = JSONDatabase()
+    calls = []
+    original = db._write_files
+
+    def counting(blobs):
+        calls.append(sorted(blobs))
+        return original(blobs)
+
+    monkeypatch.setattr(db, '_write_files', counting)
+
+    async def main():
+        db.bind_loop(asyncio.get_running_loop())
+        for i in range(3):
+            db.add_product('K', f'P{i}', 'd', 1.0)
+        # Hali hech narsa yozilmagan - flush tsikl oxirida
+        assert calls == []
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+
+    assert calls == [sorted([config.PRODUCTS_FILE, config.META_FILE])]
+    with open(config.PRODUCTS_FILE, 'rb') as f:
+        assert [p['name'] for p in formats.decode(f.read())] == ['P0', 'P1', 'P2']
+    assert not os.path.exists(config.TXN_FILE)
@@ -0,0 +1,90 @@
+"""
+Backendlar registri va JSON / xotira / SQLite backendlarining bir xil ishlashi
+"""
+
+import pytest
+
+from database import StorageBackend, available_backends, create_backend
+from database.base import DEFAULT_CATEGORIES
+
+
+def test_registry():
+    assert {'json', 'memory', 'sqlite'} <= set(available_backends())
+
+    with pytest.raises(ValueError):
+        create_backend('yo\'q')
+
+
+def test_implements_protocol(backend):
+    assert isinstance(backend, StorageBackend)
+
+
+def test_product_lifecycle(backend):
+    category = DEFAULT_CATEGORIES[0]
+    product = backend.add_product(category, 'Futbolka', 'Paxta', 120000, size='M')
+
+    assert product['id'] == 1
+    assert product['is_available'] is True
+    assert backend.get_product(product['id'])['name'] == 'Futbolka'
+
+    assert backend.update_product(product['id'], price=99000, name='Ko\'ylak')
+    assert backend.update_product(999, price=1) is False
+    assert backend.get_product(product['id'])['price'] == 99000
+    assert backend.get_product(product['id'])['name'] == 'Ko\'ylak'
+
+    assert backend.toggle_product_availability(product['id'])
+    assert backend.get_product(product['id'])['is_available'] is False
+    assert backend.get_available_products() == []
+
+    assert backend.delete_product(product['id'])
+    assert backend.delete_product(product['id']) is False
+    assert backend.get_product(product['id']) is None
+    assert backend.get_all_products() == []
+
+
+def test_order_lifecycle(backend):
+    product = backend.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 1000)
+    order = backend.create_order(1, 'ali', product['id'], 'Ali', '+998', 'Toshkent', quantity=3)
+
+    assert order['id'] == 1
+    assert order['status'] == 'yangi'
+    assert order['product_name'] == 'A'
+    assert order['total_price'] == 3000
+    assert backend.get_order(order['id'])['quantity'] == 3
+    assert [o['id'] for o in backend.get_user_orders(1)] == [order['id']]
+    assert backend.get_user_orders(2) == []
+
+    assert backend.update_order_status(order['id'], 'tasdiqlandi')
+    assert backend.update_order_status(999, 'tasdiqlandi') is False
+    assert backend.count_orders_by_status('tasdiqlandi') == 1
+    assert backend.count_orders_by_status('yangi') == 0
+    assert [o['id'] for o in backend.get_orders_by_status('tasdiqlandi')] == [order['id']]
+    assert backend.get_orders_count() == 1
+
+
+def test_statistics_agree(backend):
+    product = backend.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 500)
+    backend.add_user(1, 'ali')
+    backend.add_user(2, 'vali')
+    for _ in range(3):
+        backend.create_order(1, 'ali', product['id'], 'Ali', '+998', 'Toshkent', quantity=2)
+    backend.update_order_status(1, 'yetkazildi')
+    backend.update_order_status(2, 'bekor')
+
+    stats = backend.get_statistics()
+
+    assert stats['users'] == 2
+    assert stats['products'] == 1
+    assert stats['available_products'] == 1
+    assert stats['categories'] == len(DEFAULT_CATEGORIES)
+    assert stats['orders'] == 3
+    assert stats['orders_by_status'] == {'yangi': 1, 'yetkazildi': 1, 'bekor': 1}
+
+
+def test_users_are_not_duplicated(backend):
+    backend.add_user(1, 'ali', 'Ali')
+    backend.add_user(1, 'ali', 'Ali')
+    backend.add_user(2, 'vali')
+
+    assert backend.get_users_count() == 2
+    assert sorted(u['user_id'] for u in backend.get_all_users()) == [1, 2]
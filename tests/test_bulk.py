@@ -0,0 +1,79 @@
+"""
+Bir nechta yozuvni birga o'zgartirish: natija yakka chaqiruvlar bilan bir xil, yozuv esa bitta
+"""
+
+import config
+from database.base import DEFAULT_CATEGORIES
+from database.json_db import JSONDatabase
+
+
+def items(count, **fields):
+    return [dict({'category': DEFAULT_CATEGORIES[0], 'name': f'P{i}', 'price': 1.0}, **fields)
+            for i in range(count)]
+
+
+def test_bulk_products(backend):
+    created = backend.add_products_bulk(items(4, size='M'))
+
+    assert [p['id'] for p in created] == [1, 2, 3, 4]
+    assert all(p['is_available'] and p['size'] == 'M' for p in created)
+    assert backend.add_products_bulk([]) == []
+
+    # Takrorlangan va mavjud bo'lmagan ID'lar hisobga olinmaydi
+    assert backend.update_products_bulk([1, 2, 2, 99], price=5.0, category=DEFAULT_CATEGORIES[1]) == 2
+    assert [p['id'] for p in backend.get_products_by_category(DEFAULT_CATEGORIES[1])] == [1, 2]
+    assert backend.get_product(2)['price'] == 5.0
+    assert backend.get_product(3)['price'] == 1.0
+
+    assert backend.update_products_bulk([3, 4], is_available=False) == 2
+    assert [p['id'] for p in backend.get_available_products()] == [1, 2]
+
+    assert backend.delete_products_bulk([1, 3, 99]) == 2
+    assert [p['id'] for p in backend.get_all_products()] == [2, 4]
+
+
+def test_bulk_order_status(backend):
+    product = backend.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 1.0)
+    for _ in range(4):
+        backend.create_order(1, 'ali', product['id'], 'Ali', '+998', 'Toshkent')
+
+    assert backend.update_orders_status_bulk([1, 2, 2, 99], 'tasdiqlandi') == 2
+
+    assert [o['id'] for o in backend.get_orders_by_status('tasdiqlandi')] == [2, 1]
+    assert backend.count_orders_by_status('yangi') == 2
+    assert backend.get_statistics()['orders_by_status'] == {'yangi': 2, 'tasdiqlandi': 2}
+
+
+def test_bulk_calls_write_once(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'GROUP_COMMIT', False)
+    db = JSONDatabase()
+    calls = []
+    original = db._write_files
+    monkeypatch.setattr(db, '_write_files', lambda blobs: calls.append(sorted(blobs)) or original(blobs))
+
+    db.add_products_bulk(items(50))
+    db.update_products_bulk(list(range(1, 51)), price=2.0)
+    db.delete_products_bulk(list(range(1, 26)))
+
+    assert calls == [
+        sorted([config.PRODUCTS_FILE, config.META_FILE]),
+        [config.PRODUCTS_FILE],
+        [config.PRODUCTS_FILE],
+    ]
+    assert len(JSONDatabase().get_all_products()) == 25
+
+
+def test_bulk_status_is_journaled_once(data_dir):
+    db = JSONDatabase()
+    product = db.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 1.0)
+    for _ in range(10):
+        db.create_order(1, 'ali', product['id'], 'Ali', '+998', 'Toshkent')
+    appends = []
+    original = db._append_order_journal
+    db._append_order_journal = lambda entries: appends.append(len(entries)) or original(entries)
+
+    assert db.update_orders_status_bulk(list(range(1, 11)), 'bekor') == 10
+
+    assert appends == [10]
+    db.flush()
+    assert JSONDatabase().count_orders_by_status('bekor') == 10
@@ -0,0 +1,96 @@
+"""
+JSONDatabase keshi: write-through va tashqi o'zgarishlarni (mtime/size) aniqlash
+"""
+
+import collections
+
+import pytest
+
+import config
+from database import formats
+from database.json_db import JSONDatabase
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Diskdan o'qishlar soni: fayl yo'li -> necha marta"""
+    counter = collections.Counter()
+    original = JSONDatabase._load_json
+
+    def counting(self, filepath):
+        counter[filepath] += 1
+        return original(self, filepath)
+
+    monkeypatch.setattr(JSONDatabase, '_load_json', counting)
+    return counter
+
+
+def write_outside(filepath, data):
+    """Boshqa jarayon yozganini taqlid qilish"""
+    with open(filepath, 'wb') as f:
+        f.write(formats.encode(data))
+
+
+def test_reads_are_served_from_cache(data_dir, monkeypatch, loads):
+    monkeypatch.setattr(config, 'CACHE_CHECK_INTERVAL', 0)
+    db = JSONDatabase()
+    db.get_categories()
+
+    for _ in range(5):
+        db.get_categories()
+
+    # Fayl o'zgarmagan - stat qilinadi, lekin qayta o'qilmaydi
+    assert loads[config.CATEGORIES_FILE] == 1
+
+
+def test_writes_go_through_cache(data_dir, loads):
+    db = JSONDatabase()
+    product = db.add_product('K', 'A', 'd', 1.0)
+
+    assert db.get_product(product['id'])['name'] == 'A'
+    assert loads[config.PRODUCTS_FILE] == 1
+    # Diskka ham yozilgan
+    with open(config.PRODUCTS_FILE, 'rb') as f:
+        assert formats.decode(f.read())[0]['name'] == 'A'
+
+
+def test_outside_write_invalidates_cache(data_dir, monkeypatch, loads):
+    monkeypatch.setattr(config, 'CACHE_CHECK_INTERVAL', 0)
+    db = JSONDatabase()
+    db.add_product('K', 'A', 'd', 1.0)
+
+    write_outside(config.PRODUCTS_FILE, [
+        {'id': 1, 'category': 'K', 'name': 'Tashqaridan', 'description': 'd', 'price': 2.0},
+        {'id': 2, 'category': 'K', 'name': 'Yangi', 'description': 'd', 'price': 3.0},
+    ])
+
+    assert [p['name'] for p in db.get_all_products()] == ['Tashqaridan', 'Yangi']
+    # Indekslar ham qayta qurilgan
+    assert db.get_product(2)['name'] == 'Yangi'
+    assert [p['id'] for p in db.get_products_by_category('K')] == [1, 2]
+
+
+def test_stamp_checks_are_throttled(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_CHECK_INTERVAL', 3600)
+    db = JSONDatabase()
+    categories = db.get_categories()
+
+    write_outside(config.CATEGORIES_FILE, ['Tashqaridan'])
+
+    # Interval tugamaguncha fayl holati tekshirilmaydi
+    assert db.get_categories() == categories
+
+    db._checked_at.clear()
+    assert db.get_categories() == ['Tashqaridan']
+
+
+def test_corrupt_file_is_backed_up(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_CHECK_INTERVAL', 0)
+    db = JSONDatabase()
+    db.get_categories()
+
+    with open(config.CATEGORIES_FILE, 'wb') as f:
+        f.write(b'["buzilgan')
+
+    assert db.get_categories() == []
+    assert any(path.name.startswith('categories.json.corrupt-') for path in data_dir.iterdir())
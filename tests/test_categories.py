@@ -0,0 +1,87 @@
+"""
+Kategoriyalar: qo'shish, nomini o'zgartirish va o'chirish (barcha backendlarda)
+"""
+
+import os
+
+import pytest
+
+import config
+from database import formats
+from database.base import DEFAULT_CATEGORIES
+from database.json_db import JSONDatabase
+
+
+def read(filepath):
+    with open(filepath, 'rb') as f:
+        return formats.decode(f.read())
+
+
+def test_default_categories(backend):
+    assert backend.get_categories() == DEFAULT_CATEGORIES
+
+
+def test_add_category_rejects_duplicates(backend):
+    assert backend.add_category('Yangi') is True
+    assert backend.add_category('Yangi') is False
+    assert backend.get_categories().count('Yangi') == 1
+
+
+def test_rename_moves_products(backend):
+    old = DEFAULT_CATEGORIES[0]
+    product = backend.add_product(old, 'A', 'd', 1.0)
+
+    assert backend.update_category(old, 'Yangi nom') is True
+
+    assert old not in backend.get_categories()
+    assert backend.get_categories()[0] == 'Yangi nom'
+    assert backend.get_product(product['id'])['category'] == 'Yangi nom'
+    assert [p['id'] for p in backend.get_products_by_category('Yangi nom')] == [product['id']]
+    assert backend.get_products_by_category(old) == []
+
+
+def test_rename_to_existing_name_is_rejected(backend):
+    first, second = DEFAULT_CATEGORIES[0], DEFAULT_CATEGORIES[1]
+    a = backend.add_product(first, 'A', 'd', 1.0)
+    b = backend.add_product(second, 'B', 'd', 1.0)
+
+    assert backend.update_category(first, second) is False
+
+    assert backend.get_categories() == DEFAULT_CATEGORIES
+    assert backend.get_product(a['id'])['category'] == first
+    assert backend.get_product(b['id'])['category'] == second
+
+
+def test_rename_missing_category(backend):
+    assert backend.update_category('Yo\'q', 'Yangi') is False
+    assert backend.get_categories() == DEFAULT_CATEGORIES
+
+
+def test_delete_removes_products(backend):
+    first, second = DEFAULT_CATEGORIES[0], DEFAULT_CATEGORIES[1]
+    a = backend.add_product(first, 'A', 'd', 1.0)
+    b = backend.add_product(second, 'B', 'd', 1.0)
+
+    assert backend.delete_category(first) is True
+    assert backend.delete_category(first) is False
+
+    assert first not in backend.get_categories()
+    assert backend.get_product(a['id']) is None
+    assert [p['id'] for p in backend.get_all_products()] == [b['id']]
+
+
+def test_transaction_writes_all_files_or_none(data_dir):
+    db = JSONDatabase()
+    product = db.add_product(db.get_categories()[0], 'A', 'd', 1.0)
+
+    assert db.update_category(product['category'], 'Yangi nom')
+    assert 'Yangi nom' in read(config.CATEGORIES_FILE)
+    assert read(config.PRODUCTS_FILE)[0]['category'] == 'Yangi nom'
+    assert not os.path.exists(config.TXN_FILE)
+
+    with pytest.raises(RuntimeError):
+        with db.transaction() as txn:
+            txn.write(config.CATEGORIES_FILE, [])
+            raise RuntimeError
+    assert 'Yangi nom' in db.get_categories()
+    assert 'Yangi nom' in read(config.CATEGORIES_FILE)
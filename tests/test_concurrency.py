@@ -0,0 +1,63 @@
+"""
+Parallel oqimlardan yozish: qulflar tartibi (deadlock bo'lmasligi)
+"""
+
+import threading
+import time
+
+import pytest
+
+import config
+from database.json_db import JSONDatabase
+
+
+def run_threads(*targets, timeout=30):
+    """Funksiyalarni parallel ishga tushirish; timeout ichida tugamasa - deadlock"""
+    deadline = time.monotonic() + timeout
+    errors = []
+
+    def wrap(target):
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=wrap, args=(t,), daemon=True) for t in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    assert not any(thread.is_alive() for thread in threads), "deadlock"
+    assert not errors, errors
+
+
+@pytest.mark.parametrize('journal', [True, False])
+def test_synchronous_writes_do_not_deadlock_with_compaction(data_dir, monkeypatch, journal):
+    # Event loop yo'q va GROUP_COMMIT o'chiq - har bir yozuv darhol diskka tushadi
+    monkeypatch.setattr(config, 'GROUP_COMMIT', False)
+    monkeypatch.setattr(config, 'ORDERS_JOURNAL_ENABLED', journal)
+    db = JSONDatabase()
+    product = db.add_product('K', 'A', 'd', 1.0)
+
+    def users():
+        for i in range(40):
+            db.add_user(i, f'u{i}')
+
+    def orders():
+        for i in range(40):
+            order = db.create_order(i, 'u', product['id'], 'Ali', '+998', 'Toshkent')
+            db.update_order_status(order['id'], 'tasdiqlandi')
+            if i % 5 == 0:
+                db.compact_orders()
+
+    def products():
+        for i in range(40):
+            db.update_product(product['id'], price=float(i))
+            db.flush()
+
+    run_threads(users, orders, products)
+
+    reopened = JSONDatabase()
+    assert reopened.get_users_count() == 40
+    assert reopened.count_orders_by_status('tasdiqlandi') == 40
+    assert reopened.get_product(product['id'])['price'] == 39.0
@@ -0,0 +1,83 @@
+"""
+Statistika hisoblagichlari: har bir o'zgarishdan keyin to'liq sanash bilan bir xil
+"""
+
+import json
+import random
+
+import config
+from database.base import DEFAULT_CATEGORIES
+from database.json_db import JSONDatabase
+
+STATUSES = ('yangi', 'tasdiqlandi', 'yetkazilmoqda', 'yetkazildi', 'bekor')
+
+
+def counted(backend):
+    """Statistika to'liq ro'yxatlardan sanalganda"""
+    products = backend.get_all_products()
+    by_status = {}
+    for order in backend.get_all_orders():
+        by_status[order['status']] = by_status.get(order['status'], 0) + 1
+    return {
+        'products': len(products),
+        'available_products': sum(1 for p in products if p['is_available']),
+        'categories': len(backend.get_categories()),
+        'users': len(backend.get_all_users()),
+        'orders': sum(by_status.values()),
+        'orders_by_status': by_status,
+    }
+
+
+def test_counters_follow_mutations(backend):
+    rng = random.Random(3)
+
+    for step in range(150):
+        action = rng.random()
+        products = backend.get_all_products()
+        if action < 0.2 or not products:
+            backend.add_product(rng.choice(DEFAULT_CATEGORIES), f'P{step}', 'd', 1.0)
+        elif action < 0.3:
+            backend.toggle_product_availability(rng.choice(products)['id'])
+        elif action < 0.35:
+            backend.delete_product(rng.choice(products)['id'])
+        elif action < 0.4:
+            backend.update_products_bulk([p['id'] for p in products[:3]], is_available=rng.random() < 0.5)
+        elif action < 0.45:
+            backend.add_category(f'K{step}')
+        elif action < 0.5:
+            backend.add_user(rng.randint(1, 20), 'u')
+        elif action < 0.75:
+            backend.create_order(1, 'u', rng.choice(products)['id'], 'Ali', '+998', 'Toshkent')
+        elif backend.get_orders_count():
+            order_ids = rng.sample(range(1, backend.get_orders_count() + 1), 1 + (action > 0.9))
+            backend.update_orders_status_bulk(order_ids, rng.choice(STATUSES))
+
+        if step % 25 == 0:
+            assert backend.get_statistics() == counted(backend)
+
+    assert backend.get_statistics() == counted(backend)
+    assert backend.count_orders_by_status('yangi') == counted(backend)['orders_by_status'].get('yangi', 0)
+
+
+def test_counters_are_rebuilt_from_manifest(data_dir):
+    orders = []
+    for month in ('2023-01', '2023-02', '2023-03'):
+        for day, status in ((5, 'yetkazildi'), (6, 'bekor'), (7, 'yangi')):
+            order_id = len(orders) + 1
+            orders.append({
+                'id': order_id, 'order_number': f'ORD-{order_id}', 'user_id': 7,
+                'username': 'u', 'product_id': 1, 'customer_name': 'Ali', 'phone': '+998',
+                'address': 'Toshkent', 'quantity': 1, 'created_at': f'{month}-{day:02d} 12:00:00',
+                'status': status,
+            })
+    with open(config.ORDERS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(orders, f)
+    assert JSONDatabase().archive_orders(older_than_days=30) == 6
+
+    # Eski segmentlar va arxiv o'qilmasdan ham hisoblagichlar to'liq
+    db = JSONDatabase()
+    stats = db.get_statistics()
+    assert db._unloaded_segments()
+    assert stats['orders'] == 9
+    assert stats['orders_by_status'] == {'yetkazildi': 3, 'bekor': 3, 'yangi': 3}
+    assert db.count_orders_by_status('bekor') == 3
@@ -0,0 +1,116 @@
+"""
+EventBus: obuna, tarqatish, loopga bog'lash va baza o'zgarishlaridan keladigan eventlar
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from database import events
+from database.base import DEFAULT_CATEGORIES
+from database.events import EventBus
+
+
+def test_subscribe_filters_by_type():
+    bus = EventBus()
+    seen, everything = [], []
+    bus.subscribe(lambda e: seen.append(e.data['product_id']), events.PRODUCT_ADDED)
+
+    @bus.on()
+    def all_events(event):
+        everything.append(event.type)
+
+    bus.publish(events.PRODUCT_ADDED, product_id=1)
+    bus.publish(events.PRODUCT_DELETED, product_id=2)
+    bus.unsubscribe(all_events)
+    bus.publish(events.PRODUCT_ADDED, product_id=3)
+
+    assert seen == [1, 3]
+    assert everything == [events.PRODUCT_ADDED, events.PRODUCT_DELETED]
+    with pytest.raises(ValueError):
+        bus.subscribe(print, 'product_renamed')
+
+
+def test_failing_handler_does_not_stop_others():
+    bus = EventBus()
+    seen = []
+
+    def broken(event):
+        raise RuntimeError('xato')
+
+    bus.subscribe(broken, events.USER_ADDED)
+    bus.subscribe(lambda e: seen.append(e.data['user_id']), events.USER_ADDED)
+
+    bus.publish(events.USER_ADDED, user_id=7)
+
+    assert seen == [7]
+
+
+def test_async_handler_without_loop_is_skipped(recwarn):
+    bus = EventBus()
+
+    async def handler(event):
+        raise AssertionError('chaqirilmasligi kerak')
+
+    bus.subscribe(handler)
+    bus.publish(events.ORDER_CREATED, order_id=1)
+
+    # Coroutine yopiladi - "never awaited" ogohlantirishi chiqmaydi
+    assert not [w for w in recwarn if 'never awaited' in str(w.message)]
+
+
+def test_bound_loop_dispatches_on_loop_thread():
+    bus = EventBus()
+    threads = []
+
+    async def main():
+        bus.bind_loop(asyncio.get_running_loop())
+        done = asyncio.Event()
+
+        async def handler(event):
+            threads.append(threading.current_thread())
+            done.set()
+
+        bus.subscribe(handler, events.ORDER_CREATED)
+        await asyncio.to_thread(bus.publish, events.ORDER_CREATED, order_id=1)
+        await asyncio.wait_for(done.wait(), 1)
+
+    asyncio.run(main())
+
+    assert threads == [threading.main_thread()]
+
+
+def test_database_mutations_publish_events(backend):
+    seen = []
+    backend.events.subscribe(lambda e: seen.append((e.type, e.data)))
+
+    backend.add_category('Yangi')
+    backend.update_category('Yangi', 'Eski')
+    product = backend.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 1.0)
+    backend.update_product(product['id'], price=2.0)
+    order = backend.create_order(1, 'ali', product['id'], 'Ali', '+998', 'Toshkent')
+    backend.update_order_status(order['id'], 'tasdiqlandi')
+    backend.delete_product(product['id'])
+    backend.add_user(1, 'ali')
+
+    assert [event_type for event_type, _ in seen] == [
+        events.CATEGORY_ADDED, events.CATEGORY_RENAMED, events.PRODUCT_ADDED,
+        events.PRODUCT_UPDATED, events.ORDER_CREATED, events.ORDER_STATUS_CHANGED,
+        events.PRODUCT_DELETED, events.USER_ADDED,
+    ]
+    assert seen[1][1] == {'old_name': 'Yangi', 'new_name': 'Eski'}
+    assert seen[3][1]['fields'] == {'price': 2.0}
+    assert seen[5][1]['old_status'] == 'yangi' and seen[5][1]['status'] == 'tasdiqlandi'
+
+
+def test_failed_mutations_publish_nothing(backend):
+    seen = []
+    backend.events.subscribe(seen.append)
+
+    backend.update_product(99, price=2.0)
+    backend.delete_product(99)
+    backend.update_order_status(99, 'bekor')
+    backend.update_category(DEFAULT_CATEGORIES[0], DEFAULT_CATEGORIES[1])
+
+    assert seen == []
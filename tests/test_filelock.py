@@ -0,0 +1,97 @@
+"""
+Bir nechta jarayon: fcntl qulfi va generation hisoblagichi
+"""
+
+import collections
+import multiprocessing
+import os
+
+import pytest
+
+import config
+from database.filelock import FileLock
+from database.json_db import JSONDatabase
+
+
+def _add_products(tag, count):
+    db = JSONDatabase()
+    for i in range(count):
+        db.add_product('K', f'{tag}{i}', 'd', 1.0)
+        db.create_order(i, 'u', 1, 'Ali', '+998', 'Toshkent')
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="fork kerak")
+def test_processes_sharing_data_dir_do_not_lose_updates(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'DATA_LOCK_ENABLED', True)
+    JSONDatabase()
+
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=_add_products, args=(tag, 25)) for tag in 'ab']
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(120)
+    assert [process.exitcode for process in processes] == [0, 0]
+
+    db = JSONDatabase()
+    ids = [p['id'] for p in db.get_all_products()]
+    assert len(ids) == len(set(ids)) == 50
+    assert len({o['id'] for o in db.get_all_orders()}) == 50
+
+
+def test_lock_is_reentrant_and_counts_generations(data_dir):
+    lock = FileLock(config.DATA_LOCK_FILE)
+
+    assert lock.generation() == 0
+    with lock:
+        with lock:
+            assert lock.bump() == (0, 1)
+    assert lock.generation() == 1
+    assert FileLock(None).generation() is None
+    assert FileLock(None).bump() == (None, None)
+
+
+def test_reload_only_after_foreign_write(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'DATA_LOCK_ENABLED', True)
+    writer, reader = JSONDatabase(), JSONDatabase()
+    reader.get_all_products()
+    reader.get_all_users()
+
+    loads = collections.Counter()
+    original = reader._load_json
+
+    def counting(filepath):
+        loads[filepath] += 1
+        return original(filepath)
+
+    monkeypatch.setattr(reader, '_load_json', counting)
+
+    for _ in range(10):
+        reader.get_all_products()
+        reader.get_all_users()
+    assert not loads
+
+    writer.add_product('K', 'A', 'd', 1.0)
+    assert [p['name'] for p in reader.get_all_products()] == ['A']
+    reader.get_all_users()
+    assert loads == {config.PRODUCTS_FILE: 1}
+
+    # O'zimizning yozuvlarimiz qayta o'qishga sabab bo'lmaydi
+    reader.add_product('K', 'B', 'd', 1.0)
+    reader.get_all_products()
+    reader.get_all_users()
+    assert loads == {config.PRODUCTS_FILE: 1, config.META_FILE: 1}
+
+
+def test_deferred_last_seen_does_not_overwrite_foreign_write(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'DATA_LOCK_ENABLED', True)
+    first, second = JSONDatabase(), JSONDatabase()
+    first.add_user(1, 'a')
+    second.add_user(1, 'a')
+    second._users_touched_at = 0.0
+
+    first.add_user(2, 'b')
+    second.flush()
+
+    assert first.get_users_count() == 2
+    assert second.get_users_count() == 2
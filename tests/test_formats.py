@@ -0,0 +1,75 @@
+"""
+database.formats: yozish va formatni avtomatik aniqlash
+"""
+
+import pytest
+
+import config
+from database import formats
+from database.models import Product
+
+DATA = [{'id': 1, 'name': "Ko'ylak 👕", 'price': 120000.0, 'tags': [1, 2], 'size': None}]
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+@pytest.mark.parametrize('fmt', ['pretty', 'compact'])
+def test_json_round_trip(monkeypatch, fmt, use_orjson):
+    if use_orjson and formats.orjson is None:
+        pytest.skip("orjson o'rnatilmagan")
+    monkeypatch.setattr(config, 'USE_ORJSON', use_orjson)
+
+    raw = formats.encode(DATA, fmt)
+
+    assert formats.detect(raw) == 'json'
+    assert formats.decode(raw) == DATA
+
+
+def test_compact_is_smaller_than_pretty():
+    assert len(formats.encode(DATA, 'compact')) < len(formats.encode(DATA, 'pretty'))
+
+
+def test_msgpack_round_trip():
+    if formats.msgpack is None:
+        pytest.skip("msgpack o'rnatilmagan")
+
+    raw = formats.encode(DATA, 'msgpack')
+
+    assert raw.startswith(formats.MSGPACK_MAGIC)
+    assert formats.detect(raw) == 'msgpack'
+    assert formats.decode(raw) == DATA
+
+
+def test_msgpack_falls_back_to_compact_without_library(monkeypatch):
+    monkeypatch.setattr(formats, 'msgpack', None)
+
+    raw = formats.encode(DATA, 'msgpack')
+
+    assert formats.detect(raw) == 'json'
+    assert formats.decode(raw) == DATA
+
+
+@pytest.mark.parametrize('fmt', ['pretty', 'compact'])
+def test_gzip_is_detected_over_inner_format(fmt):
+    raw = formats.encode(DATA, fmt, compress=True)
+
+    assert formats.detect(raw) == 'gzip'
+    assert formats.decode(raw) == DATA
+    # mtime=0: bir xil ma'lumot - bir xil baytlar
+    assert raw == formats.encode(DATA, fmt, compress=True)
+
+
+def test_records_are_written_as_plain_dicts():
+    product = Product(id=5, category='K', name='Shirt', description='d', price=7.0)
+
+    assert formats.decode(formats.encode([product], 'compact')) == [product.to_dict()]
+
+
+@pytest.mark.parametrize('raw', [b'{"id": 1', formats.GZIP_MAGIC + b'not gzip'])
+def test_corrupt_data_raises_value_error(raw):
+    with pytest.raises(ValueError):
+        formats.decode(raw)
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        formats.resolve_format('xml')
@@ -0,0 +1,76 @@
+"""
+ID hisoblagichi: o'chirilgan va arxivlangan yozuvlarning ID'lari qayta berilmaydi
+"""
+
+import json
+import os
+
+import config
+from database import create_backend
+from database.base import DEFAULT_CATEGORIES
+from database.json_db import JSONDatabase
+
+
+def add(backend, name='A'):
+    return backend.add_product(DEFAULT_CATEGORIES[0], name, 'd', 1.0)['id']
+
+
+def test_deleted_ids_are_not_reused(backend):
+    assert [add(backend) for _ in range(3)] == [1, 2, 3]
+    backend.delete_product(3)
+    backend.delete_products_bulk([2])
+
+    assert add(backend) == 4
+    created = backend.add_products_bulk([{'category': DEFAULT_CATEGORIES[0], 'name': 'B'}] * 2)
+    assert [p['id'] for p in created] == [5, 6]
+
+
+def test_sequence_survives_restart(data_dir):
+    db = JSONDatabase()
+    for _ in range(3):
+        add(db)
+    db.delete_product(3)
+    db.flush()
+
+    assert add(JSONDatabase()) == 4
+
+
+def test_missing_meta_is_recovered_from_data(data_dir):
+    db = JSONDatabase()
+    for _ in range(3):
+        add(db)
+    product = db.get_all_products()[0]
+    db.create_order(1, 'ali', product['id'], 'Ali', '+998', 'Toshkent')
+    db.flush()
+    os.remove(config.META_FILE)
+
+    reopened = JSONDatabase()
+    assert add(reopened) == 4
+    assert reopened.create_order(1, 'ali', product['id'], 'Ali', '+998', 'Toshkent')['id'] == 2
+
+
+def test_stale_meta_skips_taken_ids(data_dir):
+    db = JSONDatabase()
+    for _ in range(3):
+        add(db)
+    db.flush()
+    with open(config.META_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'sequences': {'products': 1}}, f)
+
+    assert add(JSONDatabase()) == 4
+
+
+def test_sqlite_import_keeps_sequences(data_dir):
+    db = JSONDatabase()
+    for _ in range(3):
+        add(db)
+    db.delete_product(3)
+    db.flush()
+
+    sqlite = create_backend('sqlite')
+    sqlite.import_from_json(config.DATA_DIR)
+    try:
+        # JSON dagi hisoblagich bo'yicha - o'chirilgan 3 qayta berilmaydi
+        assert add(sqlite) == 4
+    finally:
+        sqlite.close()
@@ -0,0 +1,112 @@
+"""
+Birlamchi va ikkilamchi indekslar: o'zgarishlardan keyin ham to'liq ro'yxat bilan bir xil
+"""
+
+import json
+import random
+
+import config
+from database.base import DEFAULT_CATEGORIES
+from database.json_db import JSONDatabase
+
+
+STATUSES = ('yangi', 'tasdiqlandi', 'yetkazildi', 'bekor')
+
+
+def ids(items):
+    return [item['id'] for item in items]
+
+
+def check_indexes(db):
+    """Indekslar orqali javoblar to'liq ro'yxatni filtrlash bilan bir xil"""
+    products = db.get_all_products()
+    for product in products:
+        assert db.get_product(product['id']) is product
+    for category in DEFAULT_CATEGORIES:
+        expected = [p['id'] for p in products if p['category'] == category and p['is_available']]
+        assert ids(db.get_products_by_category(category)) == expected
+
+    orders = db.get_all_orders()
+    for user_id in (1, 2, 3):
+        expected = sorted((o for o in orders if o['user_id'] == user_id),
+                          key=lambda o: (o['created_at'], o['id']), reverse=True)
+        assert ids(db.get_user_orders(user_id)) == ids(expected)
+    for status in STATUSES:
+        expected = [o['id'] for o in orders if o['status'] == status]
+        assert sorted(ids(db.get_orders_by_status(status))) == sorted(expected)
+        assert db.count_orders_by_status(status) == len(expected)
+
+
+def test_indexes_follow_mutations(data_dir):
+    rng = random.Random(7)
+    db = JSONDatabase()
+
+    for step in range(200):
+        action = rng.random()
+        products = db.get_all_products()
+        if action < 0.25 or not products:
+            db.add_product(rng.choice(DEFAULT_CATEGORIES[:3]), f'P{step}', 'd', 1.0)
+        elif action < 0.35:
+            db.update_product(rng.choice(products)['id'], category=rng.choice(DEFAULT_CATEGORIES[:3]))
+        elif action < 0.42:
+            db.toggle_product_availability(rng.choice(products)['id'])
+        elif action < 0.47:
+            db.delete_product(rng.choice(products)['id'])
+        elif action < 0.8:
+            db.create_order(rng.choice((1, 2, 3)), 'u', rng.choice(products)['id'], 'Ali', '+998', 'Toshkent')
+        elif db.get_orders_count():
+            db.update_order_status(rng.randint(1, db.get_orders_count()), rng.choice(STATUSES))
+
+    check_indexes(db)
+    db.flush()
+    check_indexes(JSONDatabase())
+
+
+def test_primary_key_lookups(data_dir):
+    db = JSONDatabase()
+    products = [db.add_product(DEFAULT_CATEGORIES[0], f'P{i}', 'd', 1.0) for i in range(5)]
+    order = db.create_order(1, 'ali', products[0]['id'], 'Ali', '+998', 'Toshkent')
+    db.add_user(1, 'ali')
+
+    # Indeks keshdagi yozuvning o'zini qaytaradi
+    for product in products:
+        assert db.get_product(product['id']) is product
+    assert db.get_order(order['id']) is order
+    assert db._users_by_id[1]['username'] == 'ali'
+
+    db.delete_product(products[2]['id'])
+    assert db.get_product(products[2]['id']) is None
+    assert db.get_product(999) is None
+    assert db.get_order(999) is None
+
+    db.flush()
+    reopened = JSONDatabase()
+    assert ids(reopened.get_all_products()) == [1, 2, 4, 5]
+    assert reopened.get_order(order['id'])['product_id'] == products[0]['id']
+
+
+def test_indexes_are_rebuilt_after_outside_write(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_CHECK_INTERVAL', 0)
+    db = JSONDatabase()
+    db.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 1.0)
+
+    with open(config.PRODUCTS_FILE, 'r', encoding='utf-8') as f:
+        products = json.load(f)
+    products.append(dict(products[0], id=3, name='C'))
+    with open(config.PRODUCTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(products, f, indent=2)
+
+    assert db.get_product(3)['name'] == 'C'
+    assert db.get_product(1)['name'] == 'A'
+
+
+def test_category_change_keeps_id_order(backend):
+    first, second = DEFAULT_CATEGORIES[0], DEFAULT_CATEGORIES[1]
+    for name, category in (('A', first), ('B', second), ('C', first)):
+        backend.add_product(category, name, 'd', 1.0)
+
+    backend.update_product(1, category=second)
+    backend.update_products_bulk([3], category=second)
+
+    assert ids(backend.get_products_by_category(second)) == [1, 2, 3]
+    assert backend.get_products_by_category(first) == []
@@ -0,0 +1,96 @@
+"""
+Buyurtmalar jurnali: qayta qo'llash (replay) va segmentlarga yig'ish (compaction)
+"""
+
+import os
+
+import config
+from database.journal import OrderJournal
+from database.json_db import JSONDatabase
+from database.segments import read_all_orders
+
+
+def make_orders(db, count):
+    """Bitta tovar va unga count ta buyurtma yaratish"""
+    product = db.add_product('K', 'Shirt', 'd', 10.0)
+    return [db.create_order(100 + i, 'u', product['id'], 'Ali', '+998', 'Toshkent') for i in range(count)]
+
+
+def statuses(db):
+    return {order['id']: order['status'] for order in db.get_all_orders()}
+
+
+def test_orders_are_journaled_and_replayed(data_dir):
+    db = JSONDatabase()
+    orders = make_orders(db, 3)
+    db.update_order_status(orders[1]['id'], 'tasdiqlandi')
+
+    # Segment yozilmagan - hammasi jurnalda
+    assert db._journal.entries == 4
+    assert read_all_orders(config.ORDERS_DIR) == []
+
+    reopened = JSONDatabase()
+    assert statuses(reopened) == {orders[0]['id']: 'yangi', orders[1]['id']: 'tasdiqlandi',
+                                  orders[2]['id']: 'yangi'}
+    assert reopened._journal.entries == 4
+
+
+def test_compaction_moves_journal_into_segments(data_dir):
+    db = JSONDatabase()
+    orders = make_orders(db, 3)
+    db.update_order_status(orders[0]['id'], 'bekor')
+    expected = statuses(db)
+
+    assert db.compact_orders() is True
+
+    assert os.path.getsize(config.ORDERS_JOURNAL_FILE) == 0
+    assert db._journal.entries == 0
+    assert {o['id']: o['status'] for o in read_all_orders(config.ORDERS_DIR)} == expected
+    assert statuses(JSONDatabase()) == expected
+    # Yig'iladigan narsa qolmadi
+    assert db.compact_orders() is False
+
+
+def test_replay_is_idempotent_over_compacted_snapshot(data_dir):
+    db = JSONDatabase()
+    orders = make_orders(db, 2)
+    db.update_order_status(orders[1]['id'], 'yetkazildi')
+    with open(config.ORDERS_JOURNAL_FILE, 'rb') as f:
+        journal = f.read()
+    db.compact_orders()
+
+    # Compaction segmentlarni yozib, jurnalni tozalashdan oldin to'xtagan holat
+    with open(config.ORDERS_JOURNAL_FILE, 'wb') as f:
+        f.write(journal)
+
+    reopened = JSONDatabase()
+    assert len(reopened.get_all_orders()) == 2
+    assert statuses(reopened) == {orders[0]['id']: 'yangi', orders[1]['id']: 'yetkazildi'}
+
+
+def test_torn_last_line_is_dropped(data_dir):
+    db = JSONDatabase()
+    orders = make_orders(db, 1)
+    with open(config.ORDERS_JOURNAL_FILE, 'ab') as f:
+        f.write(b'{"op":"status","id":')
+
+    journal = OrderJournal(config.ORDERS_JOURNAL_FILE)
+    replayed = journal.replay([])
+
+    assert [o['id'] for o in replayed] == [orders[0]['id']]
+    assert journal.entries == 1
+    with open(config.ORDERS_JOURNAL_FILE, 'rb') as f:
+        assert f.read().endswith(b'\n')
+
+
+def test_corrupt_line_is_skipped(data_dir):
+    journal = OrderJournal(config.ORDERS_JOURNAL_FILE)
+    journal.append([{'op': 'create', 'order': {'id': 1, 'status': 'yangi'}}])
+    with open(config.ORDERS_JOURNAL_FILE, 'a', encoding='utf-8') as f:
+        f.write('not json\n')
+    journal.append([{'op': 'status', 'id': 1, 'status': 'tasdiqlandi'}])
+
+    replayed = journal.replay([])
+
+    assert [(o['id'], o['status']) for o in replayed] == [(1, 'tasdiqlandi')]
+    assert journal.entries == 2
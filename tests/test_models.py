@@ -0,0 +1,77 @@
+"""
+Yozuv turlari: __slots__, dict bilan moslik va qo'shimcha kalitlarni saqlash
+"""
+
+import json
+
+import pytest
+
+import config
+from database.base import DEFAULT_CATEGORIES
+from database.json_db import JSONDatabase
+from database.models import Order, Product, User, to_plain
+
+PRODUCT = {'id': 1, 'category': 'K', 'name': 'A', 'description': 'd', 'price': 10.0,
+           'size': None, 'photo_id': None, 'is_available': True, 'created_at': '2024-01-01 00:00:00'}
+
+
+def test_records_have_no_instance_dict():
+    product = Product.from_dict(PRODUCT)
+
+    assert not hasattr(product, '__dict__')
+    with pytest.raises(AttributeError):
+        product.colour = 'qizil'
+
+
+def test_dict_compatible_access():
+    product = Product.from_dict(PRODUCT)
+
+    assert product.name == product['name'] == 'A'
+    assert product.get('size', 'M') == 'M'
+    assert product.get('missing') is None
+    assert 'price' in product and 'missing' not in product
+    with pytest.raises(KeyError):
+        product['missing']
+
+    product['price'] = 12.0
+    product.update(name='B')
+    assert product.price == 12.0 and product.name == 'B'
+    assert dict(product.items()) == product.to_dict() == product.copy()
+    assert product == dict(PRODUCT, price=12.0, name='B')
+    assert len(product) == len(Product.FIELDS)
+
+
+def test_defaults_and_round_trip():
+    order = Order(id=1, user_id=7, product_id=1)
+
+    assert order.quantity == 1
+    assert order.status == 'yangi'
+    assert order.username is None
+    assert Order.from_dict(order.to_dict()) == order
+    assert Order.from_dict(order) is order
+    assert User(user_id=1).is_blocked is False
+
+
+def test_unknown_keys_are_preserved():
+    user = User.from_dict({'user_id': 1, 'username': 'ali', 'language': 'uz'})
+
+    assert user['language'] == 'uz'
+    assert user.to_dict()['language'] == 'uz'
+    assert json.loads(json.dumps(user, default=to_plain))['language'] == 'uz'
+    with pytest.raises(TypeError):
+        to_plain(object())
+
+
+def test_extra_fields_survive_a_database_rewrite(data_dir):
+    with open(config.PRODUCTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump([dict(PRODUCT, category=DEFAULT_CATEGORIES[0], brand='X')], f)
+
+    db = JSONDatabase()
+    assert isinstance(db.get_product(1), Product)
+    db.update_product(1, price=20.0)
+    db.flush()
+
+    with open(config.PRODUCTS_FILE, 'r', encoding='utf-8') as f:
+        stored = json.load(f)[0]
+    assert stored['brand'] == 'X'
+    assert stored['price'] == 20.0
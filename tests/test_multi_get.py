@@ -0,0 +1,62 @@
+"""
+Bir nechta yozuvni bitta chaqiruvda olish: get_products va get_orders
+"""
+
+import json
+
+import config
+from database.base import DEFAULT_CATEGORIES
+from database.json_db import JSONDatabase
+
+
+def test_get_products(backend):
+    for i in range(3):
+        backend.add_product(DEFAULT_CATEGORIES[0], f'P{i}', 'd', 1.0)
+    backend.delete_product(2)
+
+    products = backend.get_products([3, 1, 2, 99, 1])
+
+    assert sorted(products) == [1, 3]
+    assert products[3]['name'] == 'P2'
+    assert backend.get_products([]) == {}
+
+
+def test_get_orders(backend):
+    product = backend.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 1.0)
+    for _ in range(3):
+        backend.create_order(1, 'ali', product['id'], 'Ali', '+998', 'Toshkent')
+
+    orders = backend.get_orders([2, 99, 3, 2])
+
+    assert sorted(orders) == [2, 3]
+    assert orders[2] == backend.get_order(2)
+    assert backend.get_orders([]) == {}
+
+
+def test_get_orders_reads_cold_and_archived_segments_once(data_dir):
+    orders = []
+    for month in ('2023-01', '2023-02', '2023-03'):
+        for day, status in ((5, 'yetkazildi'), (6, 'yangi')):
+            order_id = len(orders) + 1
+            orders.append({
+                'id': order_id, 'order_number': f'ORD-{order_id}', 'user_id': 7,
+                'username': 'u', 'product_id': 1, 'customer_name': 'Ali', 'phone': '+998',
+                'address': 'Toshkent', 'quantity': 1, 'created_at': f'{month}-{day:02d} 12:00:00',
+                'status': status,
+            })
+    with open(config.ORDERS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(orders, f)
+    assert JSONDatabase().archive_orders(older_than_days=30) == 3
+
+    db = JSONDatabase()
+    loads = []
+    original = db._load_archive
+    db._load_archive = lambda months: loads.append(list(months)) or original(months)
+
+    found = db.get_orders([1, 2, 3, 4, 6, 99])
+
+    assert sorted(found) == [1, 2, 3, 4, 6]
+    assert [found[i]['status'] for i in (1, 2, 3)] == ['yetkazildi', 'yangi', 'yetkazildi']
+    # Arxiv oylari bitta chaqiruvda yuklanadi
+    assert loads == [['2023-01', '2023-02']]
+    assert db.get_orders([1, 3]) == {1: found[1], 3: found[3]}
@@ -0,0 +1,63 @@
+"""
+Admin ro'yxatlari uchun sahifalash: tovarlar va buyurtmalar (barcha backendlarda)
+"""
+
+import json
+
+import config
+from database.base import DEFAULT_CATEGORIES
+from database.json_db import JSONDatabase
+
+
+def ids(page):
+    return [item['id'] for item in page]
+
+
+def test_products_page_by_id(backend):
+    for i in range(7):
+        backend.add_product(DEFAULT_CATEGORIES[i % 2], f'P{i}', 'd', 1.0)
+    backend.delete_product(3)
+    backend.delete_products_bulk([5])
+
+    pages = [backend.get_products_page(offset, 2) for offset in (0, 2, 4, 6)]
+
+    assert [ids(page) for page, _ in pages] == [[1, 2], [4, 6], [7], []]
+    assert {total for _, total in pages} == {5}
+
+    backend.add_products_bulk([{'category': DEFAULT_CATEGORIES[0], 'name': 'Q', 'price': 1.0}])
+    page, total = backend.get_products_page(4, 10)
+    assert ids(page) == [7, 8]
+    assert total == 6
+
+
+def test_products_page_follows_ids_not_file_order(data_dir):
+    products = [
+        {'id': product_id, 'category': DEFAULT_CATEGORIES[0], 'name': f'P{product_id}',
+         'description': '', 'price': 1.0, 'is_available': True, 'created_at': ''}
+        for product_id in (5, 2, 9, 1)
+    ]
+    with open(config.PRODUCTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(products, f)
+
+    db = JSONDatabase()
+
+    assert ids(db.get_products_page(0, 3)[0]) == [1, 2, 5]
+    assert ids(db.get_products_page(3, 3)[0]) == [9]
+    assert db.add_product(DEFAULT_CATEGORIES[0], 'Yangi', 'd', 1.0)['id'] == 10
+    assert ids(db.get_products_page(3, 3)[0]) == [9, 10]
+
+
+def test_orders_page_newest_first(backend):
+    product = backend.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 1.0)
+    for _ in range(5):
+        backend.create_order(1, 'ali', product['id'], 'Ali', '+998', 'Toshkent')
+    backend.update_order_status(2, 'bekor')
+    backend.update_order_status(4, 'bekor')
+
+    page, total = backend.get_orders_page(0, 2)
+    assert ids(page) == [5, 4]
+    assert total == 5
+    assert ids(backend.get_orders_page(4, 2)[0]) == [1]
+    assert ids(backend.get_orders_page(0, 10, status='bekor')[0]) == [4, 2]
+    assert backend.get_orders_page(0, 10, status='bekor')[1] == 2
+    assert backend.get_orders_page(10, 10) == ([], 5)
@@ -0,0 +1,93 @@
+"""
+Avtomatik post uchun tanlash: IdPool, ProductDeck va get_random_products
+"""
+
+import random
+
+import pytest
+
+import config
+from database.base import DEFAULT_CATEGORIES
+from database.sampling import IdPool, ProductDeck
+
+
+def test_id_pool_add_discard_sample():
+    pool = IdPool([1, 2, 3, 4])
+    pool.add(2)
+    pool.discard(1)
+    pool.discard(99)
+    pool.add(5)
+
+    assert len(pool) == 4
+    assert sorted(pool.ids()) == [2, 3, 4, 5]
+    assert 1 not in pool and 5 in pool
+
+    sample = pool.sample(3)
+    assert len(sample) == len(set(sample)) == 3
+    assert set(sample) <= {2, 3, 4, 5}
+    assert sorted(pool.sample(10)) == [2, 3, 4, 5]
+    assert IdPool().sample(3) == []
+
+
+def test_id_pool_positions_stay_consistent():
+    rng = random.Random(1)
+    pool, expected = IdPool(), set()
+    for _ in range(500):
+        item_id = rng.randint(1, 50)
+        if rng.random() < 0.5:
+            pool.add(item_id)
+            expected.add(item_id)
+        else:
+            pool.discard(item_id)
+            expected.discard(item_id)
+        assert sorted(pool.ids()) == sorted(expected)
+        assert all(item_id in pool for item_id in expected)
+
+
+def test_deck_covers_catalog_before_repeating():
+    available = {1, 2, 3, 4, 5}
+    deck = ProductDeck({})
+
+    first = deck.draw(2, available.__contains__, lambda: sorted(available))
+    second = deck.draw(3, available.__contains__, lambda: sorted(available))
+
+    assert sorted(first + second) == [1, 2, 3, 4, 5]
+    # Yangi aylanish - yana to'liq katalog
+    third = deck.draw(5, available.__contains__, lambda: sorted(available))
+    assert sorted(third) == [1, 2, 3, 4, 5]
+
+
+def test_deck_skips_unavailable_and_includes_new():
+    available = {1, 2, 3, 4}
+    state = {}
+    picked = ProductDeck(state).draw(1, available.__contains__, lambda: sorted(available))
+    removed = min(available - set(picked))
+    available.discard(removed)
+    available.add(9)
+    ProductDeck(state).add(9)
+
+    # Holat dict'da - yangi ProductDeck joriy aylanishni davom ettiradi
+    rest = ProductDeck(state).draw(3, available.__contains__, lambda: sorted(available))
+
+    assert removed not in rest
+    assert sorted(rest) == sorted(available - set(picked))
+
+
+@pytest.mark.parametrize('deck_mode', [False, True])
+def test_random_products_are_available_and_distinct(backend, monkeypatch, deck_mode):
+    monkeypatch.setattr(config, 'AUTO_POST_DECK_MODE', deck_mode)
+    products = [backend.add_product(DEFAULT_CATEGORIES[0], f'P{i}', 'd', 1.0) for i in range(6)]
+    backend.toggle_product_availability(products[0]['id'])
+    backend.delete_product(products[1]['id'])
+
+    seen = []
+    for _ in range(2):
+        picked = backend.get_random_products(2)
+        assert len({p['id'] for p in picked}) == 2
+        assert all(p['is_available'] for p in picked)
+        seen += [p['id'] for p in picked]
+
+    if deck_mode:
+        # Koloda bitta aylanishda takrorlamaydi
+        assert len(set(seen)) == 4
+    assert len(backend.get_random_products(10)) == 4
@@ -0,0 +1,84 @@
+"""
+Buyurtmalarning oylik segmentlari: bo'lish, manifest va diskdan qayta o'qish
+"""
+
+import json
+import os
+from datetime import datetime
+
+import config
+from database.json_db import JSONDatabase
+from database.segments import (OrderManifest, hot_months, order_month, read_all_orders,
+                               segment_path, split_by_month)
+
+MONTHS = ['2024-01', '2024-02', '2025-06']
+
+
+def legacy_orders():
+    """Eski yagona orders.json dagi buyurtmalar (har oyda ikkitadan)"""
+    orders = []
+    for month in MONTHS:
+        for day in (10, 20):
+            order_id = len(orders) + 1
+            orders.append({
+                'id': order_id, 'order_number': f'ORD-{order_id}', 'user_id': 7 if day == 10 else 8,
+                'username': 'u', 'product_id': 1, 'customer_name': 'Ali', 'phone': '+998',
+                'address': 'Toshkent', 'quantity': 1, 'created_at': f'{month}-{day} 12:00:00',
+                'status': 'yetkazildi' if day == 10 else 'yangi',
+            })
+    return orders
+
+
+def test_split_and_manifest():
+    orders = legacy_orders()
+    manifest = OrderManifest()
+    for month, month_orders in split_by_month(orders).items():
+        manifest.update(month, month_orders)
+
+    restored = OrderManifest(json.loads(json.dumps(manifest.to_dict())))
+
+    assert restored.months() == MONTHS
+    assert restored.month_for_id(3) == '2024-02'
+    assert restored.month_for_id(99) is None
+    assert restored.months_for_user(8) == MONTHS
+    assert restored.count(MONTHS, 'yetkazildi') == 3
+    assert restored.max_id() == 6
+    assert order_month(orders[0]) == '2024-01'
+
+
+def test_hot_months_cross_year_boundary():
+    assert hot_months(3, today=datetime(2026, 2, 5)) == ['2025-12', '2026-01', '2026-02']
+
+
+def test_legacy_file_round_trips_through_segments(data_dir):
+    orders = legacy_orders()
+    with open(config.ORDERS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(orders, f)
+
+    db = JSONDatabase()
+
+    # orders.json segmentlarga bo'lindi va chetga olindi
+    assert not os.path.exists(config.ORDERS_FILE)
+    assert os.path.exists(f"{config.ORDERS_FILE}.migrated")
+    for month in MONTHS:
+        assert os.path.exists(segment_path(month))
+    assert sorted(o['id'] for o in read_all_orders(config.ORDERS_DIR)) == [o['id'] for o in orders]
+
+    # Eski segmentlar faqat kerak bo'lganda yuklanadi
+    assert db.get_orders_count() == len(orders)
+    assert db.get_order(1)['created_at'] == orders[0]['created_at']
+    assert {o['id']: o['status'] for o in db.get_all_orders()} == {o['id']: o['status'] for o in orders}
+    assert sorted(o['id'] for o in db.get_user_orders(8)) == [2, 4, 6]
+
+
+def test_status_change_in_old_segment_survives_compaction(data_dir):
+    with open(config.ORDERS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(legacy_orders(), f)
+
+    db = JSONDatabase()
+    db.update_order_status(2, 'bekor')
+    db.compact_orders()
+
+    reopened = JSONDatabase()
+    assert reopened.get_order(2)['status'] == 'bekor'
+    assert reopened.count_orders_by_status('bekor') == 1
@@ -0,0 +1,79 @@
+"""
+Buyurtmadagi tovar nusxasi: tovar o'zgarsa yoki o'chirilsa ham buyurtma o'zgarmaydi
+"""
+
+import json
+
+import config
+from database import create_backend
+from database.base import DEFAULT_CATEGORIES
+from database.json_db import JSONDatabase
+
+LEGACY_ORDER = {
+    'id': 1, 'order_number': 'ORD-1', 'user_id': 7, 'username': 'u', 'product_id': 1,
+    'customer_name': 'Ali', 'phone': '+998', 'address': 'Toshkent', 'quantity': 3,
+    'created_at': '2024-05-05 12:00:00', 'status': 'yangi',
+}
+
+
+def test_snapshot_survives_product_changes(backend):
+    product = backend.add_product(DEFAULT_CATEGORIES[0], "Ko'ylak", 'd', 10.0, photo_id='ph')
+    order = backend.create_order(1, 'ali', product['id'], 'Ali', '+998', 'Toshkent', quantity=2)
+
+    assert order['product_name'] == "Ko'ylak"
+    assert order['price'] == 10.0
+    assert order['total_price'] == 20.0
+    assert order['photo_id'] == 'ph'
+
+    backend.update_product(product['id'], name='Yangi', price=99.0)
+    stored = backend.get_order(order['id'])
+    assert (stored['product_name'], stored['price'], stored['total_price']) == ("Ko'ylak", 10.0, 20.0)
+
+    backend.delete_product(product['id'])
+    assert backend.get_order(order['id'])['product_name'] == "Ko'ylak"
+    assert backend.get_user_orders(1)[0]['total_price'] == 20.0
+
+
+def test_legacy_order_is_backfilled_and_persisted(data_dir):
+    with open(config.ORDERS_FILE, 'w', encoding='utf-8') as f:
+        json.dump([LEGACY_ORDER], f)
+    db = JSONDatabase()
+    db.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 5.0)
+
+    order = db.get_order(1)
+    assert (order['product_name'], order['price'], order['total_price']) == ('A', 5.0, 15.0)
+
+    # Jurnal bo'sh bo'lsa ham to'ldirilgan segment yoziladi
+    assert db.compact_orders()
+    db.delete_product(1)
+    db.flush()
+
+    assert JSONDatabase().get_order(1)['product_name'] == 'A'
+
+
+def test_legacy_order_without_product_stays_empty(data_dir):
+    with open(config.ORDERS_FILE, 'w', encoding='utf-8') as f:
+        json.dump([LEGACY_ORDER], f)
+    db = JSONDatabase()
+
+    order = db.get_order(1)
+    assert order['product_name'] is None
+    assert not db._dirty_segments
+
+
+def test_sqlite_backfill_is_written_back(data_dir):
+    db = create_backend('sqlite')
+    try:
+        db.add_product(DEFAULT_CATEGORIES[0], 'A', 'd', 5.0)
+        columns = [key for key in LEGACY_ORDER if key != 'id']
+        with db._conn:
+            db._conn.execute(
+                f"INSERT INTO orders ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [LEGACY_ORDER[key] for key in columns]
+            )
+
+        assert db.get_orders([1])[1]['total_price'] == 15.0
+        row = db._conn.execute("SELECT product_name, total_price FROM orders WHERE id = 1").fetchone()
+        assert tuple(row) == ('A', 15.0)
+    finally:
+        db.close()
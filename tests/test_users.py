@@ -0,0 +1,81 @@
+"""
+Foydalanuvchilar: kechiktirilgan last_seen yozuvi (JSON va SQLite)
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+import config
+from database import create_backend, formats
+from database.async_db import AsyncDatabase
+
+
+def stored_last_seen(name, user_id):
+    if name == 'sqlite':
+        conn = sqlite3.connect(config.SQLITE_FILE)
+        try:
+            return conn.execute("SELECT last_seen FROM users WHERE user_id = ?", (user_id,)).fetchone()[0]
+        finally:
+            conn.close()
+
+    with open(config.USERS_FILE, 'rb') as f:
+        return {u['user_id']: u for u in formats.decode(f.read())}[user_id]['last_seen']
+
+
+def has_pending(name, backend):
+    if name == 'sqlite':
+        return bool(backend._last_seen)
+    return backend._users_touched_at is not None
+
+
+@pytest.mark.parametrize('name', ['json', 'sqlite'])
+def test_touch_is_deferred(data_dir, name):
+    backend = create_backend(name)
+    backend.add_user(1, 'ali')
+    created = stored_last_seen(name, 1)
+
+    backend.add_user(1, 'ali')
+
+    assert has_pending(name, backend)
+    assert stored_last_seen(name, 1) == created
+
+    backend.flush()
+    assert not has_pending(name, backend)
+    if name == 'sqlite':
+        backend.close()
+
+
+@pytest.mark.parametrize('name', ['json', 'sqlite'])
+def test_idle_touch_is_flushed_by_timer(data_dir, monkeypatch, name):
+    monkeypatch.setattr(config, 'LAST_SEEN_FLUSH_INTERVAL', 0.05)
+    backend = create_backend(name)
+    backend.add_user(1, 'ali')
+
+    async def main():
+        db = AsyncDatabase(backend)
+        user = await db.add_user(1, 'ali')
+        assert has_pending(name, backend)
+        # Boshqa murojaat bo'lmasa ham taymer last_seen ni yozadi
+        await asyncio.sleep(0.3)
+        assert not has_pending(name, backend)
+        await db.close()
+        return user
+
+    user = asyncio.run(main())
+
+    assert stored_last_seen(name, 1) == user['last_seen']
+    if name == 'sqlite':
+        backend.close()
+
+
+def test_sqlite_close_writes_pending_touches(data_dir):
+    backend = create_backend('sqlite')
+    backend.add_user(1, 'ali')
+    backend.add_user(1, 'ali')
+    pending = dict(backend._last_seen)
+
+    backend.close()
+
+    assert stored_last_seen('sqlite', 1) == pending[1]
@@ -0,0 +1,77 @@
+"""
+Write-behind: tez-tez o'zgarishlar bitta kechiktirilgan flushga yig'iladi
+"""
+
+import asyncio
+
+import config
+from database.base import DEFAULT_CATEGORIES
+from database.json_db import JSONDatabase
+
+
+def counting_writes(db, monkeypatch):
+    """_write_files chaqiruvlarini (yozilgan fayllar ro'yxati) yig'ish"""
+    calls = []
+    original = db._write_files
+
+    def counting(blobs):
+        calls.append(sorted(blobs))
+        return original(blobs)
+
+    monkeypatch.setattr(db, '_write_files', counting)
+    return calls
+
+
+def test_writes_are_debounced(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'WRITE_BEHIND_INTERVAL_MS', 200)
+    monkeypatch.setattr(config, 'WRITE_BEHIND_MAX_DIRTY_MS', 5000)
+    db = JSONDatabase()
+    calls = counting_writes(db, monkeypatch)
+
+    async def main():
+        db.bind_loop(asyncio.get_running_loop())
+        for i in range(5):
+            db.add_product(DEFAULT_CATEGORIES[0], f'P{i}', 'd', 1.0)
+            await asyncio.sleep(0.01)
+        # Oxirgi o'zgarishdan beri interval o'tmagan - hali yozilmagan
+        assert calls == []
+        await asyncio.sleep(0.4)
+
+    asyncio.run(main())
+
+    assert calls == [sorted([config.PRODUCTS_FILE, config.META_FILE])]
+    assert len(JSONDatabase().get_all_products()) == 5
+
+
+def test_max_dirty_bounds_the_delay(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'WRITE_BEHIND_INTERVAL_MS', 100)
+    monkeypatch.setattr(config, 'WRITE_BEHIND_MAX_DIRTY_MS', 150)
+    db = JSONDatabase()
+    calls = counting_writes(db, monkeypatch)
+
+    async def main():
+        db.bind_loop(asyncio.get_running_loop())
+        # Har 40 ms da o'zgarish - debounce o'zi hech qachon tugamaydi
+        for i in range(10):
+            db.add_product(DEFAULT_CATEGORIES[0], f'P{i}', 'd', 1.0)
+            await asyncio.sleep(0.04)
+        flushed_while_busy = len(calls)
+        await asyncio.sleep(0.3)
+        return flushed_while_busy
+
+    assert asyncio.run(main()) >= 1
+    assert len(JSONDatabase().get_all_products()) == 10
+
+
+def test_flush_writes_pending_changes_immediately(data_dir, monkeypatch):
+    monkeypatch.setattr(config, 'WRITE_BEHIND_INTERVAL_MS', 10000)
+    db = JSONDatabase()
+
+    async def main():
+        db.bind_loop(asyncio.get_running_loop())
+        db.add_category('Yangi')
+        assert 'Yangi' not in JSONDatabase().get_categories()
+        db.flush()
+        assert 'Yangi' in JSONDatabase().get_categories()
+
+    asyncio.run(main())
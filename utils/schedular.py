@@ -4,17 +4,18 @@ Avtomatik post qilish scheduler - To'liq versiya
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from aiogram import Bot
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from datetime import datetime
 import config
-from database.json_db import db
+from database.async_db import AsyncDatabase
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-async def post_random_products(bot: Bot):
+async def post_random_products(bot: Bot, db: AsyncDatabase):
     """
     Random tovarlarni kanalga va guruhga post qilish
     Bu funksiya schedulerdan avtomatik chaqiriladi
@@ -23,7 +24,7 @@ async def post_random_products(bot: Bot):
         logger.info(f"[{datetime.now()}] Avtomatik post boshlandi...")
 
         # Random tovarlarni olish
-        products = db.get_random_products(count=config.DAILY_POSTS_COUNT)
+        products = await db.get_random_products(count=config.DAILY_POSTS_COUNT)
 
         if not products:
             logger.warning(f"[{datetime.now()}] Tovarlar topilmadi!")
@@ -115,12 +116,36 @@ async def post_random_products(bot: Bot):
         logger.error(f"[{datetime.now()}] ❌ Scheduler xatolik: {e}")
 
 
-def setup_scheduler(bot: Bot) -> AsyncIOScheduler:
+async def compact_orders_journal(db: AsyncDatabase):
+    """
+    Buyurtmalar jurnalini oylik segmentlarga yig'ish
+    Bu funksiya schedulerdan davriy chaqiriladi
+    """
+    try:
+        await db.compact_orders()
+    except Exception as e:
+        logger.error(f"[{datetime.now()}] ❌ Jurnalni yig'ishda xatolik: {e}")
+
+
+async def archive_closed_orders(db: AsyncDatabase):
+    """
+    Eski yopilgan buyurtmalarni arxivga ko'chirish
+    Bu funksiya schedulerdan har kuni chaqiriladi
+    """
+    try:
+        count = await db.archive_orders()
+        logger.info(f"[{datetime.now()}] ✅ Arxivlash yakunlandi: {count} ta buyurtma")
+    except Exception as e:
+        logger.error(f"[{datetime.now()}] ❌ Buyurtmalarni arxivlashda xatolik: {e}")
+
+
+def setup_scheduler(bot: Bot, db: AsyncDatabase) -> AsyncIOScheduler:
     """
     Schedulerni sozlash va ishga tushirish
 
     Args:
         bot: Aiogram Bot obyekti
+        db: Asinxron baza
 
     Returns:
         AsyncIOScheduler: Sozlangan scheduler
@@ -142,7 +167,7 @@ def setup_scheduler(bot: Bot) -> AsyncIOScheduler:
             scheduler.add_job(
                 post_random_products,
                 trigger=CronTrigger(hour=hour, minute=minute, timezone="Asia/Tashkent"),
-                args=[bot],
+                args=[bot, db],
                 id=f"auto_post_{time_str.replace(':', '_')}",
                 replace_existing=True,
                 name=f"Avtomatik post - {time_str}"
@@ -153,6 +178,39 @@ def setup_scheduler(bot: Bot) -> AsyncIOScheduler:
         except Exception as e:
             logger.error(f"❌ Scheduler qo'shishda xatolik ({time_str}): {e}")
 
+    # Yopilgan eski buyurtmalarni har kuni arxivlash
+    if config.ORDERS_ARCHIVE_ENABLED:
+        try:
+            hour, minute = map(int, config.ORDERS_ARCHIVE_TIME.split(':'))
+
+            scheduler.add_job(
+                archive_closed_orders,
+                trigger=CronTrigger(hour=hour, minute=minute, timezone="Asia/Tashkent"),
+                args=[db],
+                id="orders_archive",
+                replace_existing=True,
+                name=f"Buyurtmalarni arxivlash - {config.ORDERS_ARCHIVE_TIME}"
+            )
+
+            logger.info(f"✅ Arxivlash qo'shildi: {config.ORDERS_ARCHIVE_TIME} (har kuni, "
+                        f"{config.ORDERS_ARCHIVE_AFTER_DAYS} kundan eski yopilgan buyurtmalar)")
+
+        except Exception as e:
+            logger.error(f"❌ Arxivlashni qo'shishda xatolik ({config.ORDERS_ARCHIVE_TIME}): {e}")
+
+    # Buyurtmalar jurnalini (va to'ldirilgan segmentlarni) davriy yig'ish.
+    # Jurnal o'chiq bo'lsa ham kerak - eski buyurtmalarga to'ldirilgan
+    # tovar nusxalari shu orqali diskka tushadi
+    scheduler.add_job(
+        compact_orders_journal,
+        trigger=IntervalTrigger(minutes=config.ORDERS_JOURNAL_COMPACT_INTERVAL),
+        args=[db],
+        id="orders_journal_compact",
+        replace_existing=True,
+        name="Buyurtmalar jurnalini yig'ish"
+    )
+    logger.info(f"✅ Jurnal compaction qo'shildi: har {config.ORDERS_JOURNAL_COMPACT_INTERVAL} daqiqada")
+
     logger.info("=" * 50)
     logger.info(f"📊 Jami {len(config.AUTO_POST_TIMES)} ta avtomatik post sozlandi")
     logger.info(f"📦 Har bir post: {config.DAILY_POSTS_COUNT} ta random tovar")